@@ -0,0 +1,76 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Measures the file completeness rules over the model and over flags."""
+
+import argparse
+import time
+
+from sbom_generator import generate_sbom
+from spdx_tools.spdx.parser.jsonlikedict.file_parser import FileParser
+from spdx_tools.spdx.validation.validation_message import SpdxElementType
+
+from sbom_check.checks import COMPLETENESS_RULES, _check_files, _file_flags
+from sbom_check.columnar import HAS_NUMPY, flag_messages
+
+
+def _seconds(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    """Prints the time of each way to evaluate the file rules."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--files",
+        type=int,
+        nargs="+",
+        default=[100_000, 1_000_000],
+        help="Numbers of files in the generated SBOMs.",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'files':>8} {'rules':>8} {'flags':>8} {'table':>8} "
+        f"{'numpy':>8} {'speedup':>8}"
+    )
+    for files in args.files:
+        file_dicts = generate_sbom(files, packages=1)["files"]
+        # one file in ten breaks the copyright rule
+        for file in file_dicts[::10]:
+            del file["copyrightText"]
+        model = [FileParser().parse_file(file) for file in file_dicts]
+        ids = [file["SPDXID"] for file in file_dicts]
+
+        rules, expected = _seconds(_check_files, model)
+        flags_time, flags = _seconds(bytearray, map(_file_flags, file_dicts))
+        table, messages = _seconds(
+            flag_messages,
+            COMPLETENESS_RULES.copy(),
+            SpdxElementType.FILE,
+            ids,
+            flags,
+            False,
+        )
+        assert messages == expected
+        numpy = float("nan")
+        if HAS_NUMPY:
+            numpy, messages = _seconds(
+                flag_messages,
+                COMPLETENESS_RULES.copy(),
+                SpdxElementType.FILE,
+                ids,
+                flags,
+                True,
+            )
+            assert messages == expected
+        print(
+            f"{files:>8} {rules:>8.3f} {flags_time:>8.3f} {table:>8.3f} "
+            f"{numpy:>8.3f} {rules / numpy:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
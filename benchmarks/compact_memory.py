@@ -0,0 +1,83 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Compares the memory held by the spdx-tools model, with and without
+flyweights, and CompactDocument.
+"""
+
+import argparse
+import gc
+import io
+import json
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from sbom_generator import generate_sbom
+from spdx_tools.spdx.parser.jsonlikedict.json_like_dict_parser import (
+    JsonLikeDictParser,
+)
+
+from sbom_check.compact import CompactDocument
+from sbom_check.flyweight import Flyweights
+from sbom_check.streaming import iter_spdx_json
+
+
+def main() -> None:
+    """Prints retained and peak memory of each model per document size."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--files",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000],
+        help="Number of files in each generated SBOM.",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'files':>8} {'model':>9} {'held MB':>9} {'peak MB':>9} "
+        f"{'time s':>7}"
+    )
+    for files in args.files:
+        encoded = json.dumps(generate_sbom(files)).encode("utf-8")
+        for name, build in (
+            ("spdx", lambda: _spdx_document(encoded)),
+            ("flyweight", lambda: _flyweight_document(encoded)),
+            ("compact", lambda: _compact_document(encoded)),
+        ):
+            held, peak, seconds = _measure(build)
+            print(
+                f"{files:>8} {name:>9} {held / 1e6:>9.1f} {peak / 1e6:>9.1f} "
+                f"{seconds:>7.2f}"
+            )
+
+
+def _spdx_document(encoded: bytes) -> Any:
+    return JsonLikeDictParser().parse(json.loads(encoded))
+
+
+def _flyweight_document(encoded: bytes) -> Any:
+    return Flyweights().parse(json.loads(encoded))
+
+
+def _compact_document(encoded: bytes) -> Any:
+    return CompactDocument.from_pairs(iter_spdx_json(io.BytesIO(encoded)))
+
+
+def _measure(build: Callable[[], Any]) -> tuple[int, int, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    document = build()
+    seconds = time.perf_counter() - start
+    gc.collect()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del document
+    return held, peak, seconds
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Compares the installed JSON backends on large synthetic SBOMs."""
+
+import argparse
+import json
+import time
+from typing import Any, Callable
+
+from sbom_generator import generate_sbom
+
+from sbom_check.json_backend import BACKENDS
+
+
+def main() -> None:
+    """Prints decode and encode timings per backend and document size."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--files",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+        help="Number of files in each generated SBOM.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'files':>10} {'MB':>8} {'backend':>8} {'loads s':>9} "
+        f"{'dumps s':>9}"
+    )
+    for files in args.files:
+        document = generate_sbom(files)
+        encoded = json.dumps(document).encode("utf-8")
+        for backend in BACKENDS.values():
+            loads = min(
+                _timed(backend.loads, encoded) for _ in range(args.repeat)
+            )
+            dumps = min(
+                _timed(backend.dumps, document) for _ in range(args.repeat)
+            )
+            print(
+                f"{files:>10} {len(encoded) / 1e6:>8.1f} {backend.name:>8} "
+                f"{loads:>9.3f} {dumps:>9.3f}"
+            )
+
+
+def _timed(function: Callable[[Any], Any], argument: Any) -> float:
+    start = time.perf_counter()
+    function(argument)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
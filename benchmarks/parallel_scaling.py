@@ -0,0 +1,63 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Measures parallel validation of one document from 1 to N workers."""
+
+import argparse
+import os
+import time
+
+from sbom_generator import generate_sbom
+
+from sbom_check.checks import _parse_spdx
+from sbom_check.parallel import DEFAULT_CHUNK_SIZE, validate_document_parallel
+from sbom_check.validation import validate_document_indexed
+
+
+def main() -> None:
+    """Prints validation time and speedup per worker count."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=100_000,
+        help="Number of files in the generated SBOM.",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Largest number of workers measured.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Number of elements validated per task.",
+    )
+    args = parser.parse_args()
+
+    document = _parse_spdx(generate_sbom(args.files))
+    start = time.perf_counter()
+    validate_document_indexed(document)
+    baseline = time.perf_counter() - start
+    print(f"{'workers':>8} {'time s':>8} {'speedup':>8}")
+    print(f"{'serial':>8} {baseline:>8.2f} {1:>8.2f}")
+    for workers in _worker_counts(args.max_workers):
+        start = time.perf_counter()
+        validate_document_parallel(document, None, workers, args.chunk_size)
+        seconds = time.perf_counter() - start
+        print(f"{workers:>8} {seconds:>8.2f} {baseline / seconds:>8.2f}")
+
+
+def _worker_counts(max_workers: int) -> list[int]:
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    return counts + [max_workers]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Synthetic SPDX 2.3 JSON documents for benchmarks."""
+
+import hashlib
+from typing import Any
+
+LICENSES = ["Apache-2.0", "BSD-3-Clause", "MIT", "BSD-3-Clause OR MIT"]
+SUPPLIERS = ["Organization: Qualcomm", "Organization: Linaro", "NOASSERTION"]
+
+
+def generate_sbom(files: int, packages: int = 100) -> dict[str, Any]:
+    """
+    Returns an SPDX document whose files are spread evenly over the packages,
+    with the repetition of license and supplier values seen in real SBOMs.
+    """
+    packages = max(1, packages)
+    document: dict[str, Any] = {
+        "spdxVersion": "SPDX-2.3",
+        "dataLicense": "CC0-1.0",
+        "SPDXID": "SPDXRef-DOCUMENT",
+        "name": "benchmark",
+        "documentNamespace": "http://spdx.org/spdxdocs/benchmark",
+        "creationInfo": {
+            "creators": ["Tool: sbom-check-benchmark"],
+            "created": "2024-01-01T00:00:00Z",
+            "licenseListVersion": "3.20",
+        },
+        "documentDescribes": ["SPDXRef-package-0"],
+        "packages": [
+            {
+                "SPDXID": f"SPDXRef-package-{index}",
+                "name": f"package-{index}",
+                "versionInfo": "1.0",
+                "downloadLocation": "NOASSERTION",
+                "filesAnalyzed": True,
+                "supplier": SUPPLIERS[index % len(SUPPLIERS)],
+                "licenseConcluded": LICENSES[index % len(LICENSES)],
+                "licenseDeclared": LICENSES[index % len(LICENSES)],
+                "copyrightText": "Copyright (c) Example",
+            }
+            for index in range(packages)
+        ],
+        "files": [],
+        "relationships": [],
+    }
+    for index in range(files):
+        content = str(index).encode()
+        document["files"].append(
+            {
+                "SPDXID": f"SPDXRef-file-{index}",
+                "fileName": f"./src/module-{index % 97}/file-{index}.c",
+                "checksums": [
+                    {
+                        "algorithm": "SHA1",
+                        "checksumValue": hashlib.sha1(content).hexdigest(),
+                    },
+                    {
+                        "algorithm": "SHA256",
+                        "checksumValue": hashlib.sha256(content).hexdigest(),
+                    },
+                ],
+                "licenseConcluded": LICENSES[index % len(LICENSES)],
+                "licenseInfoInFiles": [LICENSES[index % 3]],
+                "copyrightText": (
+                    "Copyright (c) Example" if index % 10 else "NOASSERTION"
+                ),
+            }
+        )
+        document["relationships"].append(
+            {
+                "spdxElementId": f"SPDXRef-package-{index % packages}",
+                "relationshipType": "CONTAINS",
+                "relatedSpdxElement": f"SPDXRef-file-{index}",
+            }
+        )
+    return document
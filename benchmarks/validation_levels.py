@@ -0,0 +1,50 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Measures the time to check one document at each validation level."""
+
+import argparse
+import json
+import time
+
+from sbom_generator import generate_sbom
+
+from sbom_check.checks import ModelOptions
+from sbom_check.levels import LEVELS, check_sbom_level
+
+
+def main() -> None:
+    """Prints time and share of FULL per validation level."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--files",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000],
+        help="Numbers of files in the generated SBOMs.",
+    )
+    parser.add_argument(
+        "--indexed",
+        action="store_true",
+        help="Build and validate the model with indexed validation.",
+    )
+    args = parser.parse_args()
+
+    options = ModelOptions(indexed=args.indexed)
+    print(f"{'files':>8} {'level':>13} {'time s':>8} {'of full':>8}")
+    for files in args.files:
+        spdx_json = json.dumps(generate_sbom(files))
+        seconds = {}
+        for level in LEVELS:
+            start = time.perf_counter()
+            check_sbom_level(spdx_json, level, options)
+            seconds[level] = time.perf_counter() - start
+        for level in LEVELS:
+            share = seconds[level] / seconds["full"]
+            print(
+                f"{files:>8} {level:>13} {seconds[level]:>8.3f} {share:>8.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
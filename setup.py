@@ -11,8 +11,10 @@ setup(
     author_email="quic_jporter@quicinc.com",
     url="https://github.com/quic/sbom-check",
     install_requires=["spdx-tools"],
+    extras_require={"fast": ["orjson", "numpy"]},
     package_dir={"": "src"},
     packages=find_packages("src"),
+    package_data={"sbom_check": ["license_lists/*.ids"]},
     entry_points={"console_scripts": ["sbom-check = cli.main:main"]},
     setup_requires="setuptools_scm",
     use_scm_version=True,
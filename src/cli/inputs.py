@@ -0,0 +1,106 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Recognition and decompression of SBOM input files."""
+
+import bz2
+import gzip
+import lzma
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import IO, Any, Callable, Iterator
+
+try:
+    import zstandard
+
+    HAS_ZSTANDARD = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAS_ZSTANDARD = False
+
+SPDX_EXTENSION = ".spdx.json"
+ZSTANDARD_SUFFIX = ".zst"
+
+
+def _zstandard_reader(stream: IO[bytes]) -> Any:
+    return zstandard.ZstdDecompressor().stream_reader(stream)
+
+
+DECOMPRESSORS: dict[str, Callable[[IO[bytes]], Any]] = {
+    ".gz": lambda stream: gzip.GzipFile(fileobj=stream, mode="rb"),
+    ".xz": lambda stream: lzma.LZMAFile(stream, mode="rb"),
+    ".bz2": lambda stream: bz2.BZ2File(stream, mode="rb"),
+}
+if HAS_ZSTANDARD:
+    DECOMPRESSORS[ZSTANDARD_SUFFIX] = _zstandard_reader
+
+# errors raised while reading a corrupt or truncated compressed file
+DECOMPRESSION_ERRORS: tuple[type[Exception], ...] = (
+    OSError,
+    EOFError,
+    lzma.LZMAError,
+    *((zstandard.ZstdError,) if HAS_ZSTANDARD else ()),
+)
+
+
+def compression_suffix(name: str) -> str | None:
+    """
+    Returns the compression suffix of an SPDX JSON file name ("" if it is
+    not compressed), or None if the name is not an SPDX JSON file with a
+    supported compression.
+    """
+    name = name.lower()
+    if name.endswith(SPDX_EXTENSION):
+        return ""
+    for suffix in DECOMPRESSORS:
+        if name.endswith(SPDX_EXTENSION + suffix):
+            return suffix
+    return None
+
+
+def unsupported_name_error(name: str) -> str:
+    """Returns the error reported for a file that will not be checked."""
+    if name.lower().endswith(SPDX_EXTENSION + ZSTANDARD_SUFFIX):
+        return (
+            f"File {name} is zstd compressed, which requires the zstandard "
+            "package to be installed."
+        )
+    return (
+        f"File {name} not recognized. Please ensure your files are SPDX JSON "
+        f"format and end with '{SPDX_EXTENSION}', optionally followed by one "
+        f"of {sorted(DECOMPRESSORS)}."
+    )
+
+
+def decompressed(stream: IO[bytes], suffix: str) -> Any:
+    """
+    Wraps a binary stream in a reader that decompresses it incrementally,
+    according to the compression suffix returned by compression_suffix.
+    Reading a corrupt stream raises one of DECOMPRESSION_ERRORS.
+    """
+    return DECOMPRESSORS[suffix](stream)
+
+
+def is_archive(path: Path) -> bool:
+    """Returns whether a file is a zip or (possibly compressed) tar archive."""
+    return zipfile.is_zipfile(path) or tarfile.is_tarfile(path)
+
+
+def iter_archive(path: Path) -> Iterator[tuple[str, IO[bytes]]]:
+    """
+    Yields the archive-relative path and a readable stream for each regular
+    file in a zip or tar archive, in archive order. Tar archives are opened
+    in stream mode, so that compressed tarballs are decompressed in a single
+    sequential pass; each stream is only valid until the next member.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    with archive.open(info) as zip_member:
+                        yield info.filename, zip_member
+        return
+    with tarfile.open(path, "r|*") as tarball:
+        for entry in tarball:
+            if entry.isfile() and (member := tarball.extractfile(entry)):
+                yield entry.name, member
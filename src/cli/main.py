@@ -5,28 +5,198 @@
 
 import argparse
 import csv
-import json
+import io
 import logging
+import mmap
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
 
-from sbom_check import CheckResult, check_sbom
+from cli.inputs import (
+    DECOMPRESSION_ERRORS,
+    compression_suffix,
+    decompressed,
+    is_archive,
+    iter_archive,
+    unsupported_name_error,
+)
+from sbom_check import (
+    CheckResult,
+    ModelOptions,
+    Snapshot,
+    check_sbom_incremental,
+    check_sbom_stream,
+    check_tree_coverage,
+    json_backend,
+    verify_source_tree,
+)
+from sbom_check.cache import DEFAULT_MAX_BYTES, ResultCache, cache_key
+from sbom_check.checks import COMPLETENESS_RULES
+from sbom_check.compact import check_sbom_compact
+from sbom_check.flyweight import (
+    ACTORS,
+    LICENSE_EXPRESSIONS,
+    STRINGS,
+    Flyweights,
+)
+from sbom_check.hash_cache import DEFAULT_MAX_ENTRIES, FileHashCache
+from sbom_check.levels import COMPLETENESS, FULL, LEVELS, check_sbom_level
+from sbom_check.license_memo import LicenseExpressionMemo
+from sbom_check.memo import ElementMemo
+from sbom_check.rules import RuleRegistry
+from sbom_check.sampling import (
+    DEFAULT_CONFIDENCE,
+    DEFAULT_MARGIN,
+    SampledCheckResult,
+    SamplingOptions,
+    check_sbom_sample,
+)
 
 logger = logging.getLogger(__name__)
 
-SPDX_EXTENSION = ".spdx.json"
 OUTPUT_FILENAME = "results.json"
+MEGABYTE = 1024 * 1024
+SNAPSHOT_SUFFIX = ".snapshot.json"
+
+
+@dataclass(frozen=True, slots=True)
+class CheckOptions:
+    """
+    How each SBOM found by run is checked. Element validation results are
+    shared across files through the memo, or carried over from the previous
+    run's snapshots in snapshot_dir. Files checked with the SPDX model are
+    parsed and validated as configured by model. Files are streamed only at
+    the FULL validation level. With sampling, only a sample of the packages
+    and files of each file is validated instead. With source_root, the files
+    each SBOM lists are also verified against that source tree, hashed by
+    hash_workers threads, with the digests of unchanged files taken from
+    hash_cache. With coverage, the files of the tree that each SBOM does not
+    list are reported too, except those matching the excludes patterns.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    stream: bool = False
+    completeness_only: bool = False
+    level: str = FULL
+    memo: ElementMemo | None = None
+    snapshot_dir: Path | None = None
+    compact: bool = False
+    model: ModelOptions = ModelOptions()
+    sampling: SamplingOptions | None = None
+    source_root: Path | None = None
+    hash_workers: int = 0
+    hash_cache: FileHashCache | None = None
+    coverage: bool = False
+    excludes: tuple[str, ...] = ()
+
+    @property
+    def streamed(self) -> bool:
+        """Whether files are checked element by element."""
+        return (
+            self.stream
+            or self.compact
+            or self.memo is not None
+            or self.snapshot_dir is not None
+        ) and (self.check_level == FULL and self.sampling is None)
+
+    @property
+    def check_level(self) -> str:
+        """The validation level, of which completeness_only is a shorthand."""
+        return COMPLETENESS if self.completeness_only else self.level
+
+    @property
+    def cache_config(self) -> dict[str, Any]:
+        """Options that results stored in a ResultCache depend on."""
+        return {
+            "stream": self.stream,
+            "completeness_only": self.completeness_only,
+            "level": self.level,
+            "compact": self.compact,
+            "deep": self.model.deep,
+            "rules": [
+                rule.digest for rule in self.model.rules or COMPLETENESS_RULES
+            ],
+        }
 
 
 def main() -> None:
     """
     Accepts arguments for running the validator through the CLI.
     """
+    args = _argument_parser().parse_args()
+
+    cache = None
+    if args.cache_dir:
+        cache = ResultCache(args.cache_dir, args.cache_max_mb * MEGABYTE)
+    memo = None
+    if args.element_memo_file:
+        memo = ElementMemo.load(args.element_memo_file)
+    elif args.element_memo:
+        memo = ElementMemo()
+    flyweights = Flyweights() if args.flyweights else None
+    license_memo = LicenseExpressionMemo() if args.license_memo else None
+    rules = (
+        COMPLETENESS_RULES.copy(profile=True) if args.rule_profile else None
+    )
+    with _hash_cache(args) as hash_cache:
+        results = run(
+            args.spdx_folder,
+            CheckOptions(
+                stream=args.stream,
+                completeness_only=args.completeness_only,
+                level=args.level,
+                sampling=_sampling(args),
+                memo=memo,
+                snapshot_dir=(
+                    Path(args.snapshot_dir) if args.snapshot_dir else None
+                ),
+                compact=args.compact,
+                source_root=(
+                    Path(args.source_root) if args.source_root else None
+                ),
+                hash_workers=args.hash_workers,
+                hash_cache=hash_cache,
+                coverage=args.coverage,
+                excludes=tuple(args.exclude),
+                model=ModelOptions(
+                    flyweights=flyweights,
+                    license_memo=license_memo,
+                    indexed=args.indexed,
+                    workers=args.workers,
+                    rules=rules,
+                ),
+            ),
+            cache,
+        )
+
+        if cache:
+            print(f"\nResult cache: {cache.hits} hits, {cache.misses} misses.")
+        if memo is not None:
+            print(f"\nElement memo: {memo.hits} hits, {memo.misses} misses.")
+            if args.element_memo_file:
+                memo.save(args.element_memo_file)
+        _print_sharing(flyweights, license_memo)
+        _print_rule_profile(rules)
+
+    _print_estimates(results)
+    if args.print_console:
+        _print_results(results)
+
+    if args.print_json:
+        _output_json(results)
+
+    _output_csv(results)
+
+
+def _argument_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="sbom-check.")
     parser.add_argument(
         "spdx_folder",
         metavar="spdx_json_folder",
-        help="Path to directory containing SPDX json file(s).",
+        help="Path to directory, or tar or zip archive, containing SPDX json "
+        "file(s).",
     )
     parser.add_argument(
         "--print-console",
@@ -38,47 +208,489 @@ def main() -> None:
         action="store_true",
         help="Output results to a JSON file.",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse and validate each file element by element to bound "
+        "memory use on very large SBOMs.",
+    )
+    parser.add_argument(
+        "--completeness-only",
+        action="store_true",
+        help="Only run the completeness checks, skipping SPDX model "
+        "construction and specification validation. Same as --level "
+        "completeness.",
+    )
+    parser.add_argument(
+        "--level",
+        choices=LEVELS,
+        default=FULL,
+        help="Validation level: structural checks SPDX IDs and relationship "
+        "references and completeness runs the completeness checks, both "
+        "without building the SPDX model, in a few percent of the time of "
+        "full; full adds specification validation; deep adds cross-reference "
+        "checks such as files outside any package. Files are streamed only "
+        "at the full level.",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Only validate SPDX IDs and relationships and run the "
+        "completeness checks, on a compact column-wise model of each file "
+        "that needs a fraction of the memory of the SPDX model.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory in which results are cached by file content, so that "
+        "unchanged SBOMs are not checked again.",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // MEGABYTE,
+        help="Size limit of the result cache, beyond which the least "
+        "recently used results are evicted.",
+    )
+    parser.add_argument(
+        "--element-memo",
+        action="store_true",
+        help="Check files element by element, reusing the validation results "
+        "of packages, files and snippets repeated across documents.",
+    )
+    parser.add_argument(
+        "--element-memo-file",
+        help="File from which the element memo is loaded and to which it is "
+        "saved, so that it is shared across runs. Implies --element-memo.",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        help="Directory of per-file snapshots of the previous run. Only the "
+        "elements added or changed since then are validated again, and the "
+        "snapshots are replaced with those of this run.",
+    )
+    parser.add_argument(
+        "--flyweights",
+        action="store_true",
+        help="Share one instance of each repeated string, actor and license "
+        "expression while building the SPDX model, to reduce memory use on "
+        "large SBOMs.",
+    )
+    parser.add_argument(
+        "--license-memo",
+        action="store_true",
+        help="Parse and validate each distinct license expression once per "
+        "run instead of once per occurrence.",
+    )
+    parser.add_argument(
+        "--indexed",
+        action="store_true",
+        help="Validate SPDX ID references of relationships, snippets and "
+        "annotations against hash indexes, so that validation time grows "
+        "linearly with the number of files and relationships.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes among which the elements of each file are "
+        "validated, or 0 for one per CPU. More than one implies --indexed.",
+    )
+    parser.add_argument(
+        "--rule-profile",
+        action="store_true",
+        help="Time each completeness rule and print its evaluations, "
+        "violations and run time. Rules checked without the SPDX model, with "
+        "--completeness-only, --compact or the completeness level, are not "
+        "timed.",
+    )
+    parser.add_argument(
+        "--sample-rate",
+        type=_rate,
+        help="Only validate this share of the packages and files of each "
+        "file, besides the document-level checks, and estimate the failure "
+        "rate of each rule with a confidence interval.",
+    )
+    parser.add_argument(
+        "--sample-margin",
+        type=_probability,
+        help="Like --sample-rate, sampling just enough packages and files "
+        "for failure rate estimates within this margin at the "
+        "--sample-confidence level.",
+    )
+    parser.add_argument(
+        "--sample-confidence",
+        type=_probability,
+        default=DEFAULT_CONFIDENCE,
+        help="Confidence level of the failure rate estimates of a sample.",
+    )
+    parser.add_argument(
+        "--sample-seed",
+        type=int,
+        default=0,
+        help="Seed from which the sample is drawn; equal seeds select equal "
+        "elements.",
+    )
+    parser.add_argument(
+        "--source-root",
+        help="Root of the source tree that the files of each SBOM describe. "
+        "Each file is hashed by the checksum algorithms the SBOM declares "
+        "for it, and missing files and mismatched checksums are reported.",
+    )
+    parser.add_argument(
+        "--hash-workers",
+        type=int,
+        default=0,
+        help="Number of threads hashing the files of the source tree, and "
+        "listing its directories with --coverage, or 0 for one per CPU.",
+    )
+    parser.add_argument(
+        "--hash-cache",
+        help="SQLite file in which the digests of source tree files are "
+        "kept across runs, so that files whose device, inode, size and "
+        "modification time are unchanged are not hashed again.",
+    )
+    parser.add_argument(
+        "--hash-cache-max-entries",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help="Number of files in the hash cache, beyond which the least "
+        "recently used are evicted.",
+    )
+    parser.add_argument(
+        "--coverage",
+        action="store_true",
+        help="With --source-root, also walk the source tree and report the "
+        "files in it that each SBOM does not list, with the number of "
+        "unlisted files and of listed files missing from the tree.",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Glob pattern of source tree paths, relative to --source-root, "
+        "left out of the coverage check along with their contents. May be "
+        "given more than once.",
+    )
+    return parser
 
-    results = run(args.spdx_folder)
 
-    if args.print_console:
-        _print_results(results)
+def _print_sharing(
+    flyweights: Flyweights | None, license_memo: LicenseExpressionMemo | None
+) -> None:
+    if flyweights is not None:
+        saved = flyweights.saved
+        print(
+            f"\nFlyweights: {saved[STRINGS]} strings, {saved[ACTORS]} actors "
+            f"and {saved[LICENSE_EXPRESSIONS]} license expressions shared."
+        )
+    if license_memo is not None:
+        print(
+            f"\nLicense expression memo: {license_memo.hits} hits, "
+            f"{license_memo.misses} misses ({license_memo.hit_rate:.1%})."
+        )
 
-    if args.print_json:
-        _output_json(results)
 
-    _output_csv(results)
+@contextmanager
+def _hash_cache(args: argparse.Namespace) -> Iterator[FileHashCache | None]:
+    """
+    The file hash cache the arguments configure, if any, closed on exit
+    whether or not the checks raised.
+    """
+    if not args.hash_cache:
+        yield None
+        return
+    with FileHashCache(
+        args.hash_cache, args.hash_cache_max_entries
+    ) as hash_cache:
+        yield hash_cache
+        print(
+            f"\nFile hash cache: {hash_cache.hits} hits, "
+            f"{hash_cache.misses} misses ({hash_cache.hit_rate:.1%})."
+        )
+
+
+def _rate(value: str) -> float:
+    rate = float(value)
+    if not 0 < rate <= 1:
+        raise argparse.ArgumentTypeError(f"{value} is not in (0, 1].")
+    return rate
+
+
+def _probability(value: str) -> float:
+    probability = float(value)
+    if not 0 < probability < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not in (0, 1).")
+    return probability
 
 
-def run(spdx_root: str) -> dict[str, CheckResult]:
+def _sampling(args: argparse.Namespace) -> SamplingOptions | None:
+    if args.sample_rate is None and args.sample_margin is None:
+        return None
+    return SamplingOptions(
+        rate=args.sample_rate,
+        confidence=args.sample_confidence,
+        margin=(
+            DEFAULT_MARGIN
+            if args.sample_margin is None
+            else args.sample_margin
+        ),
+        seed=args.sample_seed,
+    )
+
+
+def _print_estimates(results: dict[str, CheckResult]) -> None:
+    for filename, result in results.items():
+        if not isinstance(result, SampledCheckResult) or not result.estimates:
+            continue
+        print(f"\nEstimated failure rates of {filename}:")
+        for estimate in result.estimates:
+            print(
+                f"* {estimate.rule}: {estimate.rate:.1%} "
+                f"[{estimate.low:.1%}, {estimate.high:.1%}] "
+                f"({estimate.failures}/{estimate.sampled} of "
+                f"{estimate.population})"
+            )
+
+
+def _print_rule_profile(rules: RuleRegistry | None) -> None:
+    if rules is None:
+        return
+    print("\nCompleteness rules: evaluations, violations, seconds")
+    for rule in rules:
+        stats = rules.stats[rule.name]
+        print(
+            f"* {rule.name}: {stats.evaluations}, {stats.violations}, "
+            f"{stats.seconds:.3f}"
+        )
+
+
+def run(
+    spdx_root: str,
+    options: CheckOptions | None = None,
+    cache: ResultCache | None = None,
+) -> dict[str, CheckResult]:
     """
-    Runs the validator using the cli provided arguments
+    Runs the validator using the cli provided arguments. Results of files in
+    a directory are looked up in and added to the cache, if one is given.
     """
+    options = options or CheckOptions()
+    if options.snapshot_dir:
+        options.snapshot_dir.mkdir(parents=True, exist_ok=True)
+    if Path(spdx_root).is_file():
+        return _run_archive(Path(spdx_root), options)
     results = {}
     for file, filename_error in _get_filenames(spdx_root):
         if filename_error:
             results[file.name] = CheckResult([], [filename_error])
             # skip further processing of non-SPDX file
             continue
+        if cache and options.sampling is None and options.source_root is None:
+            # samples are not cached, as their estimates would be lost, and
+            # neither are source tree verifications, as the tree may change
+            results[file.name] = _cached_check(file, cache, options)
+            continue
         print(f"\nParsing {file}")
-        with open(file, encoding="utf8") as content:
-            json_string = content.read()
-        results[file.name] = check_sbom(json_string)
+        results[file.name] = _check_file(file, options)
+    return results
+
+
+def _cached_check(
+    file: Path, cache: ResultCache, options: CheckOptions
+) -> CheckResult:
+    key = cache_key(file, options.cache_config)
+    if result := cache.get(key):
+        logger.info("Cached result used for %s.", file)
+        return result
+    print(f"\nParsing {file}")
+    result = _check_file(file, options)
+    cache.put(key, result)
+    return result
+
+
+def _run_archive(
+    archive: Path, options: CheckOptions
+) -> dict[str, CheckResult]:
+    if not is_archive(archive):
+        return {
+            archive.name: CheckResult(
+                [], [f"File {archive} is not a directory, tar or zip archive."]
+            )
+        }
+    results = {}
+    for name, member in iter_archive(archive):
+        suffix = compression_suffix(name)
+        if suffix is None:
+            logger.info("Skipping non-SPDX archive member %s.", name)
+            continue
+        print(f"\nParsing {archive}:{name}")
+        if not suffix:
+            results[name] = _check_member(member, options, name)
+            continue
+        try:
+            results[name] = _check_member(
+                decompressed(member, suffix), options, name
+            )
+        except DECOMPRESSION_ERRORS as error:
+            results[name] = _unreadable(f"{archive}:{name}", error)
     return results
 
 
+def _check_member(
+    member: Any, options: CheckOptions, name: str
+) -> CheckResult:
+    if options.source_root is None:
+        return _check_readable(member, options, name)
+    # members are read in a single pass, so one is buffered to be read twice
+    content = io.BytesIO(member.read())
+    result = _check_readable(content, options, name)
+    if result.errors:
+        return result
+    content.seek(0)
+    result = _verified(result, content, options, options.source_root)
+    if not options.coverage:
+        return result
+    content.seek(0)
+    return _covered(result, content, options, options.source_root)
+
+
+def _check_file(file: Path, options: CheckOptions) -> CheckResult:
+    result = _check_sbom_file(file, options)
+    if options.source_root is None or result.errors:
+        return result
+    with _opened(file) as content:
+        result = _verified(result, content, options, options.source_root)
+    if not options.coverage:
+        return result
+    with _opened(file) as content:
+        return _covered(result, content, options, options.source_root)
+
+
+def _verified(
+    result: CheckResult, content: Any, options: CheckOptions, root: Path
+) -> CheckResult:
+    messages = verify_source_tree(
+        content, root, options.hash_workers, options.hash_cache
+    )
+    return replace(
+        result,
+        # pylint: disable-next=protected-access
+        _validation_messages=result._validation_messages + messages,
+    )
+
+
+def _covered(
+    result: CheckResult, content: Any, options: CheckOptions, root: Path
+) -> CheckResult:
+    coverage = check_tree_coverage(
+        content, root, options.excludes, options.hash_workers
+    )
+    print(
+        f"Source tree coverage: {coverage.tree_files} files in the tree, "
+        f"{coverage.listed_files} listed, {len(coverage.unlisted)} unlisted, "
+        f"{len(coverage.extra)} listed but missing."
+    )
+    return replace(
+        result,
+        # pylint: disable-next=protected-access
+        _validation_messages=result._validation_messages + coverage.messages(),
+    )
+
+
+@contextmanager
+def _opened(file: Path) -> Iterator[Any]:
+    if suffix := compression_suffix(file.name):
+        with open(file, "rb") as compressed:
+            yield decompressed(compressed, suffix)
+    else:
+        with _mapped(file) as mapped:
+            yield mapped
+
+
+def _check_sbom_file(file: Path, options: CheckOptions) -> CheckResult:
+    if suffix := compression_suffix(file.name):
+        try:
+            with open(file, "rb") as compressed:
+                return _check_readable(
+                    decompressed(compressed, suffix), options, file.name
+                )
+        except DECOMPRESSION_ERRORS as error:
+            return _unreadable(str(file), error)
+    if not file.stat().st_size:
+        # empty files cannot be memory-mapped and hold no document
+        return CheckResult([], [f"File {file} is empty."])
+    with _mapped(file) as content:
+        if options.streamed:
+            return _check_stream(content, options, file.name)
+        with memoryview(content) as spdx_json:
+            if options.sampling is not None:
+                return check_sbom_sample(
+                    spdx_json, options.sampling, options.model.rules
+                )
+            return check_sbom_level(
+                spdx_json, options.check_level, options.model
+            )
+
+
+def _check_readable(
+    content: Any, options: CheckOptions, name: str
+) -> CheckResult:
+    if options.streamed:
+        return _check_stream(content, options, name)
+    if options.sampling is not None:
+        return check_sbom_sample(
+            content.read(), options.sampling, options.model.rules
+        )
+    return check_sbom_level(content.read(), options.check_level, options.model)
+
+
+def _unreadable(name: str, error: Exception) -> CheckResult:
+    # corrupt compressed files fail on their own, like empty files
+    return CheckResult([], [f"File {name} could not be read: {error}"])
+
+
+def _check_stream(
+    content: Any, options: CheckOptions, name: str
+) -> CheckResult:
+    rules = options.model.rules
+    if options.compact:
+        return check_sbom_compact(content, rules=rules)
+    if options.snapshot_dir is None:
+        return check_sbom_stream(content, memo=options.memo, rules=rules)
+    path = options.snapshot_dir / f"{_flat_name(name)}{SNAPSHOT_SUFFIX}"
+    result, snapshot = check_sbom_incremental(
+        content, Snapshot.load(path), rules=rules
+    )
+    snapshot.save(path)
+    return result
+
+
+def _flat_name(name: str) -> str:
+    # archive members are keyed by their path within the archive; escaping
+    # "%" first keeps distinct paths, such as a/b and a%2Fb, distinct
+    return name.replace("%", "%25").replace("/", "%2F")
+
+
+@contextmanager
+def _mapped(file: Path) -> Iterator[mmap.mmap]:
+    """
+    Maps a file read-only, so that it is decoded straight from the shared
+    page cache instead of being copied into a Python object first.
+    """
+    with open(file, "rb") as content, mmap.mmap(
+        content.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        yield mapped
+
+
 def _get_filenames(path: str) -> Iterable[tuple[Path, str]]:
     directory = Path(path)
     for file in directory.glob("*"):
-        if file.is_file() and file.name.lower().endswith(SPDX_EXTENSION):
+        if file.is_file() and compression_suffix(file.name) is not None:
             logger.info("SPDX file %s read.", file)
             yield file, ""
         else:
-            error = (
-                f"File {file} not recognized. Please ensure your files "
-                f"are SPDX JSON format and end with '{SPDX_EXTENSION}'."
-            )
+            error = unsupported_name_error(str(file))
             logger.warning(error)
             yield file, error
 
@@ -117,8 +729,8 @@ def _print_validation_message(message: dict[str, str]) -> None:
 
 
 def _output_json(results: dict[str, CheckResult]) -> None:
-    with open(OUTPUT_FILENAME, "w", encoding="utf-8") as file:
-        json.dump(obj=_flattened_results(results), fp=file, indent=4)
+    with open(OUTPUT_FILENAME, "wb") as file:
+        file.write(json_backend.dumps(_flattened_results(results), indent=4))
 
 
 def _flattened_results(results: dict[str, Any]) -> dict[str, Any]:
@@ -126,6 +738,16 @@ def _flattened_results(results: dict[str, Any]) -> dict[str, Any]:
         filename: {
             "errors": result.errors,
             "validator_results": result.validation_messages,
+            **(
+                {
+                    "estimates": [
+                        asdict(estimate) | {"rate": estimate.rate}
+                        for estimate in result.estimates
+                    ]
+                }
+                if isinstance(result, SampledCheckResult)
+                else {}
+            ),
         }
         for filename, result in results.items()
     }
@@ -135,7 +757,7 @@ def _output_csv(results: dict[str, CheckResult]) -> None:
     for filename, check_results in results.items():
         if not check_results.is_valid:
             with open(
-                f"{filename}_exceptions.csv", "w", encoding="utf-8"
+                f"{_flat_name(filename)}_exceptions.csv", "w", encoding="utf-8"
             ) as file:
                 csvwriter = csv.writer(file)
                 csvwriter.writerows(check_results.csv_rows)
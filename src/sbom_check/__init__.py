@@ -5,4 +5,9 @@
 
 """Package namespace exports."""
 
-from sbom_check.checks import CheckResult, check_sbom
+from sbom_check.checks import CheckResult, ModelOptions, check_sbom
+from sbom_check.incremental import Snapshot, check_sbom_incremental
+from sbom_check.levels import check_sbom_level
+from sbom_check.sampling import check_sbom_sample
+from sbom_check.source_tree import check_tree_coverage, verify_source_tree
+from sbom_check.streaming import check_sbom_stream
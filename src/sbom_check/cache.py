@@ -0,0 +1,116 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Content-addressed on-disk cache of SBOM check results."""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from sbom_check import json_backend
+from sbom_check.checks import CheckResult
+from sbom_check.serialization import (
+    message_from_dict,
+    message_to_dict,
+    package_version,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+ENTRY_SUFFIX = ".json"
+# bytes of an SBOM file hashed at a time
+DIGEST_CHUNK_SIZE = 1 << 20
+
+
+def cache_key(path: str | Path, config: dict[str, Any]) -> str:
+    """
+    Returns the cache key of an SBOM file: a SHA-256 digest of its raw
+    content, the sbom-check version and the check configuration.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as content:
+        while chunk := content.read(DIGEST_CHUNK_SIZE):
+            digest.update(chunk)
+    digest.update(package_version().encode("utf-8"))
+    digest.update(json.dumps(config, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Directory of check results, one JSON file per key, capped at max_bytes
+    by evicting the least recently used entries.
+    """
+
+    def __init__(
+        self, directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    def get(self, key: str) -> CheckResult | None:
+        """Returns the stored result for a key, or None on a miss."""
+        path = self._path(key)
+        try:
+            entry = json_backend.loads(path.read_bytes())
+            result = CheckResult(
+                [message_from_dict(message) for message in entry["messages"]],
+                list(entry["errors"]),
+            )
+        except (OSError, KeyError, TypeError, ValueError):
+            # unreadable and malformed entries are overwritten by put
+            self.misses += 1
+            return None
+        # the modification time orders entries for eviction
+        now = time.time_ns()
+        os.utime(path, ns=(now, now))
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: CheckResult) -> None:
+        """Stores a result, evicting old entries to stay under max_bytes."""
+        encoded = json_backend.dumps(
+            {
+                "messages": [
+                    message_to_dict(message)
+                    # pylint: disable-next=protected-access
+                    for message in result._validation_messages
+                ],
+                "errors": result.errors,
+            }
+        )
+        path = self._path(key)
+        if path.exists():
+            self._size -= path.stat().st_size
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(encoded)
+        os.replace(temporary, path)
+        self._size += len(encoded)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(
+            (entry.stat().st_mtime_ns, entry) for entry in self._entries()
+        )
+        for _, entry in entries:
+            if self._size <= self.max_bytes:
+                break
+            self._size -= entry.stat().st_size
+            entry.unlink()
+            logger.info("Evicted cached result %s.", entry.stem)
+
+    def _entries(self) -> list[Path]:
+        return list(self.directory.glob(f"*{ENTRY_SUFFIX}"))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
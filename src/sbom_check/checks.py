@@ -3,10 +3,12 @@
 
 """SBOM Check library."""
 
-import json
 import logging
+import re
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import Any
+from itertools import chain
+from typing import Any, Sequence
 
 from license_expression import LicenseExpression
 from spdx_tools.spdx.model.document import CreationInfo, Document
@@ -15,9 +17,13 @@ from spdx_tools.spdx.model.package import Package
 from spdx_tools.spdx.model.relationship import Relationship, RelationshipType
 from spdx_tools.spdx.model.spdx_no_assertion import SpdxNoAssertion
 from spdx_tools.spdx.parser.error import SPDXParsingError
+from spdx_tools.spdx.parser.jsonlikedict.dict_parsing_functions import (
+    json_str_to_enum_name,
+)
 from spdx_tools.spdx.parser.jsonlikedict.json_like_dict_parser import (
     JsonLikeDictParser,
 )
+from spdx_tools.spdx.validation.checksum_validator import algorithm_length
 from spdx_tools.spdx.validation.document_validator import (
     SpdxElementType,
     ValidationContext,
@@ -25,10 +31,54 @@ from spdx_tools.spdx.validation.document_validator import (
     validate_full_spdx_document,
 )
 
+from sbom_check import json_backend
+from sbom_check.columnar import (
+    DOCUMENT_LICENSE_LIST_VERSION,
+    DOCUMENT_NAME,
+    DOCUMENT_VERSION,
+    FILE_CHECKSUMS,
+    FILE_COPYRIGHT,
+    FILE_LICENSE_CONCLUDED,
+    FILE_LICENSE_INFO,
+    FILE_NAME,
+    PACKAGE_COPYRIGHT,
+    PACKAGE_FILES_ANALYZED,
+    PACKAGE_LICENSES,
+    PACKAGE_SUPPLIER,
+    flag_messages,
+)
+from sbom_check.deep import check_deep
+from sbom_check.duplicates import (
+    duplicate_messages,
+    file_identity,
+    file_identity_dict,
+    package_identity,
+    package_identity_dict,
+)
+from sbom_check.flyweight import Flyweights
+from sbom_check.graph import RelationshipGraph
+from sbom_check.license_memo import LicenseExpressionMemo
+from sbom_check.parallel import DEFAULT_CHUNK_SIZE, validate_document_parallel
+from sbom_check.rules import COMPLETENESS_EXCEPTION, Rule, RuleRegistry
+from sbom_check.validation import validate_document_indexed
+from sbom_check.verification_code import (
+    CONTAINS,
+    FileSha1s,
+    PackageCode,
+    containment_index,
+    package_code,
+    verification_code_messages,
+)
+
 logger = logging.getLogger(__name__)
 
-COMPLETENESS_EXCEPTION = "\n*** completeness exception ***\n"
 SPDX_VERSIONS = ["SPDX-2.3"]
+NO_ASSERTION_OR_NONE = ("NOASSERTION", "NONE")
+# the checksum values of each algorithm by name, as spdx-tools validates them
+CHECKSUM_VALUES = {
+    algorithm.name: re.compile(f"[0-9a-f]{{{length}}}")
+    for algorithm, length in algorithm_length.items()
+}
 
 # CSV header fields
 SPDX_ID = "spdx_id"
@@ -89,14 +139,70 @@ def _validation_message_to_dict(message: ValidationMessage) -> dict[str, str]:
     }
 
 
-def check_sbom(spdx_json: str) -> CheckResult:
+@dataclass(frozen=True, slots=True)
+class ModelOptions:
+    """
+    How check_sbom builds and validates the SPDX model. With flyweights,
+    repeated values share a single instance in the model. With license_memo,
+    each distinct license expression is parsed and validated once across all
+    documents checked with the memo. With indexed, SPDX ID references are
+    validated against hash indexes of the document's elements (see
+    validate_document_indexed), which keeps documents with many files and
+    relationships linear. With more than one worker, indexed validation is
+    split into chunks of chunk_size elements validated in parallel (see
+    validate_document_parallel). With rules, completeness is checked against
+    that RuleRegistry instead of a copy of COMPLETENESS_RULES, on this and
+    every other checking path, and its statistics add up across documents.
+    With deep, the cross-reference checks of sbom_check.deep run after the
+    completeness checks.
+    """
+
+    flyweights: Flyweights | None = None
+    license_memo: LicenseExpressionMemo | None = None
+    indexed: bool = False
+    workers: int = 1
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    rules: RuleRegistry | None = None
+    deep: bool = False
+
+    def validate(self, document: Document) -> list[ValidationMessage]:
+        """Validates a parsed document against the SPDX specification."""
+        with (
+            self.license_memo.installed()
+            if self.license_memo is not None
+            else nullcontext()
+        ):
+            if self.workers != 1:
+                return validate_document_parallel(
+                    document,
+                    workers=self.workers,
+                    chunk_size=self.chunk_size,
+                )
+            if self.indexed:
+                return validate_document_indexed(document)
+            return validate_full_spdx_document(document)
+
+
+def check_sbom(
+    spdx_json: json_backend.JsonInput,
+    completeness_only: bool = False,
+    options: ModelOptions | None = None,
+) -> CheckResult:
     """
-    Validates provided SPDX JSON string for adherence to official specification
-    and for completeness.
+    Validates provided SPDX JSON string or UTF-8 buffer for adherence to
+    official specification and for completeness. With completeness_only, only
+    the completeness checks are run, directly on the decoded JSON and without
+    building the SPDX model; of options, only rules then applies.
     """
-    spdx_dict = json.loads(spdx_json)
+    options = options or ModelOptions()
+    spdx_dict = json_backend.loads(spdx_json)
+    if completeness_only:
+        validation_messages = check_completeness_dict(spdx_dict, options.rules)
+        logger.info("Completed configured completeness SDPX Validation.")
+        return CheckResult(validation_messages, [])
+
     try:
-        spdx_document = _parse_spdx(spdx_dict)
+        spdx_document = _parse_spdx(spdx_dict, options)
     except SPDXParsingError as error:
         logger.warning("Failed to parse the provided JSON.")
         error_messages = error.get_messages()  # type: ignore[no-untyped-call]
@@ -104,29 +210,190 @@ def check_sbom(spdx_json: str) -> CheckResult:
 
     logger.info("JSON parsed. Beginning validation.")
 
-    validation_messages = validate_full_spdx_document(spdx_document)
+    validation_messages = options.validate(spdx_document)
     logger.info("Completed standard SDPX Validation.")
 
-    validation_messages += check_completeness(spdx_document)
+    graph = RelationshipGraph(spdx_document.relationships)
+    validation_messages += check_completeness(
+        spdx_document, options.rules, graph
+    )
     logger.info("Completed configured completeness SDPX Validation.")
 
+    if options.deep:
+        validation_messages += check_deep(spdx_document, graph)
+        logger.info("Completed deep cross-reference checks.")
+
     return CheckResult(validation_messages, [])
 
 
-def _parse_spdx(spdx_dict: dict[str, Any]) -> Document:
+def _parse_spdx(
+    spdx_dict: dict[str, Any], options: ModelOptions | None = None
+) -> Document:
     """Converts dictionary into SPDX Document for verification."""
-    return JsonLikeDictParser().parse(json_like_dict=spdx_dict)  # type: ignore
+    options = options or ModelOptions()
+    parser = JsonLikeDictParser()  # type: ignore
+    if options.indexed or options.workers != 1:
+        _index_existing_relationships(parser.relationship_parser)
+    if options.license_memo is not None:
+        options.license_memo.install(parser)
+    if options.flyweights is not None:
+        return options.flyweights.parse(spdx_dict, parser)
+    return parser.parse(json_like_dict=spdx_dict)
+
+
+def _index_existing_relationships(relationship_parser: Any) -> None:
+    """
+    Makes a RelationshipParser look the relationships it derives from
+    documentDescribes and hasFiles up in a RelationshipGraph of the existing
+    ones, instead of comparing them with each existing relationship in turn.
+    """
+    # the graph of the list of existing relationships last looked in
+    indexed: list[Any] = [None, RelationshipGraph()]
+
+    def check_if_relationship_exists(
+        relationship: Relationship, existing_relationships: list[Relationship]
+    ) -> bool:
+        # DESCRIBES and CONTAINS relationships are derived, which the graph
+        # indexes along with their inverses, DESCRIBED_BY and CONTAINED_BY
+        if indexed[0] is not existing_relationships:
+            indexed[:] = [
+                existing_relationships,
+                RelationshipGraph(existing_relationships),
+            ]
+        return relationship in indexed[1]
+
+    setattr(
+        relationship_parser,
+        "check_if_relationship_exists",
+        check_if_relationship_exists,
+    )
+
+
+# completeness requirements on each element, in the order they are reported,
+# with the flags they are checked by on decoded JSON
+COMPLETENESS_RULES = RuleRegistry(
+    [
+        Rule(
+            "spdx-version",
+            SpdxElementType.CREATION_INFO,
+            ("spdx_version",),
+            lambda spdx_version: spdx_version in SPDX_VERSIONS,
+            "The Document uses an invalid version. Valid versions include: "
+            f"{SPDX_VERSIONS}.",
+            (DOCUMENT_VERSION, 0),
+        ),
+        Rule(
+            "document-name",
+            SpdxElementType.CREATION_INFO,
+            ("name",),
+            bool,
+            "The Document has no name.",
+            (DOCUMENT_NAME, 0),
+        ),
+        Rule(
+            "license-list-version",
+            SpdxElementType.CREATION_INFO,
+            ("license_list_version",),
+            bool,
+            "The Document does not have a license list version.",
+            (DOCUMENT_LICENSE_LIST_VERSION, 0),
+        ),
+        Rule(
+            "package-supplier",
+            SpdxElementType.PACKAGE,
+            ("supplier",),
+            lambda supplier: bool(supplier)
+            and not isinstance(supplier, SpdxNoAssertion),
+            "This package has no supplier populated.",
+            (PACKAGE_SUPPLIER, 0),
+        ),
+        Rule(
+            "package-files-analyzed",
+            SpdxElementType.PACKAGE,
+            ("files_analyzed",),
+            bool,
+            "The files have not been analyzed for this package.",
+            (PACKAGE_FILES_ANALYZED, 0),
+        ),
+        Rule(
+            "package-copyright",
+            SpdxElementType.PACKAGE,
+            ("license_concluded", "license_declared", "copyright_text"),
+            lambda concluded, declared, copyright_text: bool(copyright_text)
+            or not _has_licenses(concluded, declared),
+            "This package has declared licenses but no copyright text "
+            "populated.",
+            (PACKAGE_LICENSES | PACKAGE_COPYRIGHT, PACKAGE_LICENSES),
+        ),
+        Rule(
+            "file-name",
+            SpdxElementType.FILE,
+            ("name",),
+            bool,
+            "This file has no name.",
+            (FILE_NAME, 0),
+        ),
+        Rule(
+            "file-license-info",
+            SpdxElementType.FILE,
+            ("license_concluded", "license_info_in_file"),
+            lambda concluded, license_info: bool(license_info)
+            or not isinstance(concluded, LicenseExpression),
+            "This file has a concluded license but license_info_in_file is "
+            "not populated.",
+            (
+                FILE_LICENSE_CONCLUDED | FILE_LICENSE_INFO,
+                FILE_LICENSE_CONCLUDED,
+            ),
+        ),
+        Rule(
+            "file-copyright",
+            SpdxElementType.FILE,
+            ("license_concluded", "copyright_text"),
+            lambda concluded, copyright_text: bool(copyright_text)
+            or not isinstance(concluded, LicenseExpression),
+            "This file has a concluded license but no copyright text.",
+            (FILE_LICENSE_CONCLUDED | FILE_COPYRIGHT, FILE_LICENSE_CONCLUDED),
+        ),
+        # checked on the model by specification validation, which reports
+        # each malformed checksum
+        Rule(
+            "file-checksum-format",
+            SpdxElementType.FILE,
+            ("checksums",),
+            None,
+            "This file has a checksum value that is not the lowercase "
+            "hexadecimal digest length of its algorithm.",
+            (FILE_CHECKSUMS, 0),
+        ),
+    ]
+)
 
 
-def check_completeness(document: Document) -> list[ValidationMessage]:
+def _rules(rules: RuleRegistry | None) -> RuleRegistry:
+    # checks without a registry count statistics on a copy of the defaults
+    return COMPLETENESS_RULES.copy() if rules is None else rules
+
+
+def check_completeness(
+    document: Document,
+    rules: RuleRegistry | None = None,
+    graph: RelationshipGraph | None = None,
+) -> list[ValidationMessage]:
     """
     Runs completeness check to catch issues that the standard SPDX validator
-    doesn't recognize.
+    doesn't recognize. The per-element requirements are the rules of a
+    RuleRegistry, COMPLETENESS_RULES by default, each evaluated in a single
+    pass over the creation info, the packages and the files. Repeated SPDX
+    IDs, packages and files and packages whose verification code does not
+    match their files are reported as well. The graph of the document's
+    relationships is built if not given.
     """
+    rules = _rules(rules)
     messages = []
 
     # check document's creation_info values
-    messages += _check_creation_info(document.creation_info)
+    messages += _check_creation_info(document.creation_info, rules)
 
     # check that document includes at least one package
     if has_packages_msg := _check_has_packages(document):
@@ -134,11 +401,26 @@ def check_completeness(document: Document) -> list[ValidationMessage]:
         return messages
 
     # check the document's primary package
-    if primary_package_msg := _check_primary_package(document):
+    graph = graph or RelationshipGraph(document.relationships)
+    if primary_package_msg := _check_primary_package(document, graph):
         messages.append(primary_package_msg)
 
     # check the document's dependency packages
-    messages += _check_packages(document.packages)
+    messages += _check_packages(document.packages, rules)
+
+    # check the packages' verification codes against their files
+    messages += _check_verification_codes(document, graph)
+
+    # check for repeated SPDX IDs, packages and files
+    messages += duplicate_messages(
+        document.creation_info.spdx_id,
+        (
+            (package.spdx_id, package_identity(package))
+            for package in document.packages
+        ),
+        ((file.spdx_id, file_identity(file)) for file in document.files),
+        (snippet.spdx_id for snippet in document.snippets),
+    )
 
     # check that the document includes at least one file
     if has_files_msg := _check_has_files(document):
@@ -146,65 +428,52 @@ def check_completeness(document: Document) -> list[ValidationMessage]:
         return messages
 
     # check the document's files
-    messages += _check_files(document.files)
+    messages += _check_files(document.files, rules)
 
     return messages
 
 
 def _check_creation_info(
-    creation_info: CreationInfo,
+    creation_info: CreationInfo, rules: RuleRegistry | None = None
 ) -> list[ValidationMessage]:
-    messages = []
-    # check that the SPDX version is what we are expecting
-    if creation_info.spdx_version not in SPDX_VERSIONS:
-        messages.append(
-            _create_custom_validation_message(
-                message="The Document uses an invalid version. Valid "
-                f"versions include: {SPDX_VERSIONS}.",
-                element_type=SpdxElementType.CREATION_INFO,
-            )
-        )
-    # check the SPDX document has a name value
-    if not creation_info.name:
-        messages.append(
-            _create_custom_validation_message(
-                message="The Document has no name.",
-                element_type=SpdxElementType.CREATION_INFO,
-            )
-        )
-    # check that the SPDX document has a license list version
-    if not creation_info.license_list_version:
-        messages.append(
-            _create_custom_validation_message(
-                message="The Document does not have a license list version.",
-                element_type=SpdxElementType.CREATION_INFO,
-            )
-        )
-    return messages
+    return _rules(rules).check(
+        SpdxElementType.CREATION_INFO, [creation_info], id_field=None
+    )
 
 
 def _check_has_packages(document: Document) -> ValidationMessage | None:
     # check that the document contains at least one package
     if not document.packages:
-        return _create_custom_validation_message(
-            message="The Document contains no packages.",
-            element_type=SpdxElementType.DOCUMENT,
-        )
+        return no_packages_message()
     return None
 
 
-def _check_primary_package(document: Document) -> ValidationMessage | None:
+def no_packages_message() -> ValidationMessage:
+    """The message of a document without packages."""
+    return _create_custom_validation_message(
+        message="The Document contains no packages.",
+        element_type=SpdxElementType.DOCUMENT,
+    )
+
+
+def _check_primary_package(
+    document: Document, graph: RelationshipGraph
+) -> ValidationMessage | None:
     primary_package_id = document.packages[0].spdx_id
     document_id = document.creation_info.spdx_id
     expected_describes_relationship = Relationship(
         document_id, RelationshipType.DESCRIBES, primary_package_id
     )
-    actual_describes_relationships = [
-        relationship
-        for relationship in document.relationships
-        if relationship.relationship_type == RelationshipType.DESCRIBES
-    ]
+    return _describes_message(
+        expected_describes_relationship,
+        graph.relationships(RelationshipType.DESCRIBES),
+    )
 
+
+def _describes_message(
+    expected_describes_relationship: object,
+    actual_describes_relationships: Sequence[object],
+) -> ValidationMessage | None:
     # check that there is only one describes relationship in the document
     if len(actual_describes_relationships) != 1:
         return _create_custom_validation_message(
@@ -229,42 +498,30 @@ def _check_primary_package(document: Document) -> ValidationMessage | None:
     return None
 
 
-def _check_packages(packages: list[Package]) -> list[ValidationMessage]:
-    messages = []
-    for package in packages:
-        # check that a supplier is provided for the package
-        if not package.supplier or isinstance(
-            package.supplier, SpdxNoAssertion
-        ):
-            messages.append(
-                _create_custom_validation_message(
-                    message="This package has no supplier populated.",
-                    element_type=SpdxElementType.PACKAGE,
-                    spdx_id=package.spdx_id,
-                )
-            )
-        # check that the package's files have been analyzed
-        if not package.files_analyzed:
-            messages.append(
-                _create_custom_validation_message(
-                    message="The files have not been analyzed for this "
-                    "package.",
-                    element_type=SpdxElementType.PACKAGE,
-                    spdx_id=package.spdx_id,
-                )
-            )
-        # check that at least one package license has been provided
-        if _has_licenses(package.license_concluded, package.license_declared):
-            if not package.copyright_text:
-                messages.append(
-                    _create_custom_validation_message(
-                        message="This package has declared licenses but no "
-                        "copyright text populated.",
-                        element_type=SpdxElementType.PACKAGE,
-                        spdx_id=package.spdx_id,
-                    )
-                )
-    return messages
+def _check_packages(
+    packages: list[Package], rules: RuleRegistry | None = None
+) -> list[ValidationMessage]:
+    return _rules(rules).check(SpdxElementType.PACKAGE, packages)
+
+
+def _check_verification_codes(
+    document: Document, graph: RelationshipGraph
+) -> list[ValidationMessage]:
+    codes = [
+        code
+        for package in document.packages
+        if (code := package_code(package)) is not None
+    ]
+    if not codes:
+        return []
+    files = FileSha1s()
+    for file in document.files:
+        files.add_file(file)
+    return verification_code_messages(
+        codes,
+        lambda spdx_id: graph.successors(RelationshipType.CONTAINS, spdx_id),
+        files,
+    )
 
 
 def _has_licenses(license_concluded: Any, license_declared: Any) -> bool:
@@ -279,53 +536,22 @@ def _has_licenses(license_concluded: Any, license_declared: Any) -> bool:
 def _check_has_files(document: Document) -> ValidationMessage | None:
     # check that the document contains at least one file
     if not document.files:
-        return _create_custom_validation_message(
-            message="The Document contains no files.",
-            element_type=SpdxElementType.DOCUMENT,
-        )
+        return no_files_message()
     return None
 
 
-def _check_files(files: list[File]) -> list[ValidationMessage]:
-    messages = []
-    for file in files:
-        # check if each file has a name
-        if not file.name:
-            messages.append(
-                _create_custom_validation_message(
-                    message="This file has no name.",
-                    element_type=SpdxElementType.FILE,
-                    spdx_id=file.spdx_id,
-                )
-            )
-
-        # remaining checks only relevant if file has concluded license
-        if not isinstance(file.license_concluded, LicenseExpression):
-            continue
-
-        # check if license_info_in_file is populated
-        if not file.license_info_in_file:
-            messages.append(
-                _create_custom_validation_message(
-                    message="This file has a concluded license but "
-                    "license_info_in_file is not populated.",
-                    element_type=SpdxElementType.FILE,
-                    spdx_id=file.spdx_id,
-                )
-            )
+def no_files_message() -> ValidationMessage:
+    """The message of a document without files."""
+    return _create_custom_validation_message(
+        message="The Document contains no files.",
+        element_type=SpdxElementType.DOCUMENT,
+    )
 
-        # check if file has copyright_text populated
-        if not file.copyright_text:
-            messages.append(
-                _create_custom_validation_message(
-                    message="This file has a concluded license but "
-                    "no copyright text.",
-                    element_type=SpdxElementType.FILE,
-                    spdx_id=file.spdx_id,
-                )
-            )
 
-    return messages
+def _check_files(
+    files: list[File], rules: RuleRegistry | None = None
+) -> list[ValidationMessage]:
+    return _rules(rules).check(SpdxElementType.FILE, files)
 
 
 def _create_custom_validation_message(
@@ -336,3 +562,335 @@ def _create_custom_validation_message(
 ) -> ValidationMessage:
     context = ValidationContext(spdx_id, None, element_type, element)
     return ValidationMessage(COMPLETENESS_EXCEPTION + message, context)
+
+
+def check_completeness_dict(
+    spdx_dict: dict[str, Any], rules: RuleRegistry | None = None
+) -> list[ValidationMessage]:
+    """
+    Runs the same completeness checks as check_completeness on the output of
+    json.loads, without building an spdx-tools Document first. Values that
+    would fail to parse into the model are not reported here. Every rule of
+    the registry needs a flag, or ValueError is raised.
+    """
+    rules = _rules(rules)
+    messages = []
+
+    # check document's creation_info values
+    messages += check_creation_info_dict(spdx_dict, rules)
+
+    # check that document includes at least one package
+    packages = spdx_dict.get("packages") or []
+    if not packages:
+        messages.append(no_packages_message())
+        return messages
+
+    # check the document's primary package
+    if primary_package_msg := check_primary_package_dict(spdx_dict):
+        messages.append(primary_package_msg)
+
+    # check the document's dependency packages
+    messages += _check_packages_dict(packages, rules)
+
+    # check the packages' verification codes against their files
+    messages += check_verification_codes_dict(spdx_dict)
+
+    # check for repeated SPDX IDs, packages and files
+    messages += check_duplicates_dict(spdx_dict)
+
+    # check that the document includes at least one file
+    files = spdx_dict.get("files") or []
+    if not files:
+        messages.append(no_files_message())
+        return messages
+
+    # check the document's files
+    messages += _check_files_dict(files, rules)
+
+    return messages
+
+
+def check_creation_info_dict(
+    spdx_dict: dict[str, Any], rules: RuleRegistry | None = None
+) -> list[ValidationMessage]:
+    """Checks the creation info rules on a document's JSON object."""
+    return flag_messages(
+        _rules(rules),
+        SpdxElementType.CREATION_INFO,
+        [""],
+        bytes([_creation_info_flags(spdx_dict)]),
+        vectorized=False,
+    )
+
+
+def _creation_info_flags(spdx_dict: dict[str, Any]) -> int:
+    """Returns the DOCUMENT_* flags of a document's JSON object."""
+    flags = 0
+    if spdx_dict.get("spdxVersion") in SPDX_VERSIONS:
+        flags |= DOCUMENT_VERSION
+    if spdx_dict.get("name"):
+        flags |= DOCUMENT_NAME
+    if (spdx_dict.get("creationInfo") or {}).get("licenseListVersion"):
+        flags |= DOCUMENT_LICENSE_LIST_VERSION
+    return flags
+
+
+def check_primary_package_dict(
+    spdx_dict: dict[str, Any]
+) -> ValidationMessage | None:
+    """
+    Checks that a JSON document with packages describes its first package,
+    and only that.
+    """
+    primary_package_id = spdx_dict["packages"][0].get("SPDXID")
+    document_id = spdx_dict.get("SPDXID")
+    return _describes_message(
+        (
+            document_id,
+            RelationshipType.DESCRIBES.name,
+            primary_package_id,
+            None,
+        ),
+        _describes_relationships(spdx_dict, document_id),
+    )
+
+
+def _describes_relationships(
+    spdx_dict: dict[str, Any], document_id: Any
+) -> list[tuple[Any, str, Any, Any]]:
+    """
+    Returns the DESCRIBES relationships as (source, type, target, comment)
+    tuples, including those spdx-tools derives from documentDescribes.
+    """
+    relationships = [
+        (
+            relationship.get("spdxElementId"),
+            _relationship_type(relationship),
+            relationship.get("relatedSpdxElement"),
+            relationship.get("comment"),
+        )
+        for relationship in spdx_dict.get("relationships") or []
+    ]
+    existing = {relationship[:3] for relationship in relationships}
+    describes = [
+        relationship
+        for relationship in relationships
+        if relationship[1] == RelationshipType.DESCRIBES.name
+    ]
+    for spdx_id in dict.fromkeys(spdx_dict.get("documentDescribes") or []):
+        if (
+            document_id,
+            RelationshipType.DESCRIBES.name,
+            spdx_id,
+        ) not in existing and (
+            spdx_id,
+            RelationshipType.DESCRIBED_BY.name,
+            document_id,
+        ) not in existing:
+            describes.append(
+                (document_id, RelationshipType.DESCRIBES.name, spdx_id, None)
+            )
+    return describes
+
+
+def _relationship_type(relationship: dict[str, Any]) -> str:
+    relationship_type = relationship.get("relationshipType")
+    if not isinstance(relationship_type, str):
+        return ""
+    return relationship_type.replace("-", "_").upper()
+
+
+def check_duplicates_dict(
+    spdx_dict: dict[str, Any]
+) -> list[ValidationMessage]:
+    """Reports repeated SPDX IDs, packages and files of a JSON document."""
+    elements = {
+        collection: [
+            element
+            for element in spdx_dict.get(collection) or []
+            if isinstance(element, dict)
+        ]
+        for collection in ("packages", "files", "snippets")
+    }
+    return duplicate_messages(
+        spdx_dict.get("SPDXID") or "",
+        (
+            (package.get("SPDXID") or "", package_identity_dict(package))
+            for package in elements["packages"]
+        ),
+        (
+            (file.get("SPDXID") or "", file_identity_dict(file))
+            for file in elements["files"]
+        ),
+        (snippet.get("SPDXID") or "" for snippet in elements["snippets"]),
+    )
+
+
+def check_verification_codes_dict(
+    spdx_dict: dict[str, Any]
+) -> list[ValidationMessage]:
+    """
+    Reports the packages of a JSON document whose verification code does
+    not match their files.
+    """
+    packages = [
+        package
+        for package in spdx_dict.get("packages") or []
+        if isinstance(package, dict)
+    ]
+    codes = [
+        code
+        for package in packages
+        if (code := _package_code_dict(package)) is not None
+    ]
+    if not codes:
+        return []
+    files = FileSha1s()
+    for file in spdx_dict.get("files") or []:
+        if isinstance(file, dict):
+            files.add_dict(file)
+    contained = containment_index(
+        chain(
+            (
+                (
+                    relationship.get("spdxElementId"),
+                    _relationship_type(relationship),
+                    relationship.get("relatedSpdxElement"),
+                    None,
+                )
+                for relationship in spdx_dict.get("relationships") or []
+                if isinstance(relationship, dict)
+            ),
+            (
+                (package.get("SPDXID"), CONTAINS, file_id, None)
+                for package in packages
+                for file_id in package.get("hasFiles") or []
+            ),
+        )
+    )
+    return verification_code_messages(
+        codes, lambda spdx_id: contained.get(spdx_id, []), files
+    )
+
+
+def _package_code_dict(package: dict[str, Any]) -> PackageCode | None:
+    """The verification code of a package's JSON object, if it has one."""
+    code = package.get("packageVerificationCode")
+    if (
+        not _files_analyzed(package.get("filesAnalyzed"))
+        or not isinstance(code, dict)
+        or not isinstance(code.get("packageVerificationCodeValue"), str)
+    ):
+        return None
+    return PackageCode(
+        package.get("SPDXID") or "",
+        code["packageVerificationCodeValue"],
+        tuple(
+            file_name
+            for file_name in code.get("packageVerificationCodeExcludedFiles")
+            or []
+            if isinstance(file_name, str)
+        ),
+    )
+
+
+def _check_packages_dict(
+    packages: list[dict[str, Any]], rules: RuleRegistry | None = None
+) -> list[ValidationMessage]:
+    return flag_messages(
+        _rules(rules),
+        SpdxElementType.PACKAGE,
+        [package.get("SPDXID") or "" for package in packages],
+        bytearray(_package_flags(package) for package in packages),
+    )
+
+
+def _package_flags(package: dict[str, Any]) -> int:
+    """Returns the PACKAGE_* flags of a package's JSON object."""
+    flags = 0
+    if package.get("supplier") not in (None, "", "NOASSERTION"):
+        flags |= PACKAGE_SUPPLIER
+    if _files_analyzed(package.get("filesAnalyzed")):
+        flags |= PACKAGE_FILES_ANALYZED
+    if _has_licenses_dict(
+        package.get("licenseConcluded"), package.get("licenseDeclared")
+    ):
+        flags |= PACKAGE_LICENSES
+    if package.get("copyrightText"):
+        flags |= PACKAGE_COPYRIGHT
+    return flags
+
+
+def _files_analyzed(files_analyzed: Any) -> bool:
+    # filesAnalyzed defaults to true; XML-converted documents use strings
+    if isinstance(files_analyzed, str):
+        return files_analyzed.lower() != "false"
+    return files_analyzed is None or bool(files_analyzed)
+
+
+def _has_licenses_dict(license_concluded: Any, license_declared: Any) -> bool:
+    return any(
+        [
+            _is_license_expression(license_concluded),
+            _is_license_expression(license_declared),
+        ]
+    )
+
+
+def _is_license_expression(license_expression: Any) -> bool:
+    return (
+        isinstance(license_expression, str)
+        and bool(license_expression)
+        and license_expression.upper() not in NO_ASSERTION_OR_NONE
+    )
+
+
+def _check_files_dict(
+    files: list[dict[str, Any]], rules: RuleRegistry | None = None
+) -> list[ValidationMessage]:
+    return flag_messages(
+        _rules(rules),
+        SpdxElementType.FILE,
+        [file.get("SPDXID") or "" for file in files],
+        bytearray(_file_flags(file) for file in files),
+    )
+
+
+def _file_flags(file: dict[str, Any]) -> int:
+    """Returns the FILE_* flags of a file's JSON object."""
+    flags = 0
+    if file.get("fileName"):
+        flags |= FILE_NAME
+    if _is_license_expression(file.get("licenseConcluded")):
+        flags |= FILE_LICENSE_CONCLUDED
+    if file.get("licenseInfoInFiles"):
+        flags |= FILE_LICENSE_INFO
+    if file.get("copyrightText"):
+        flags |= FILE_COPYRIGHT
+    if _checksums_well_formed(file.get("checksums")):
+        flags |= FILE_CHECKSUMS
+    return flags
+
+
+def _checksums_well_formed(checksums: Any) -> bool:
+    """
+    Whether each checksum of a known algorithm has a value of the hex digits
+    spdx-tools validates it to have.
+    """
+    for checksum in checksums if isinstance(checksums, list) else []:
+        if not isinstance(checksum, dict):
+            continue
+        algorithm = checksum.get("algorithm")
+        value = checksum.get("checksumValue")
+        pattern = CHECKSUM_VALUES.get(
+            json_str_to_enum_name(algorithm)
+            if isinstance(algorithm, str)
+            else None
+        )
+        if (
+            pattern is not None
+            and isinstance(value, str)
+            and not pattern.fullmatch(value)
+        ):
+            return False
+    return True
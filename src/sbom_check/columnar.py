@@ -0,0 +1,99 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Completeness rules evaluated over columns of per-element flags."""
+
+import functools
+from typing import Iterable, Sequence
+
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationMessage,
+)
+
+from sbom_check.rules import RuleRegistry, completeness_message
+
+try:
+    import numpy
+
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAS_NUMPY = False
+
+# completeness-relevant properties of raw JSON documents, packages and files
+DOCUMENT_VERSION = 1
+DOCUMENT_NAME = 2
+DOCUMENT_LICENSE_LIST_VERSION = 4
+PACKAGE_SUPPLIER = 1
+PACKAGE_FILES_ANALYZED = 2
+PACKAGE_LICENSES = 4
+PACKAGE_COPYRIGHT = 8
+FILE_NAME = 1
+FILE_LICENSE_CONCLUDED = 2
+FILE_LICENSE_INFO = 4
+FILE_COPYRIGHT = 8
+FILE_CHECKSUMS = 16
+
+
+def flag_messages(
+    rules: RuleRegistry,
+    element_type: SpdxElementType,
+    spdx_ids: Sequence[str],
+    flags: bytes | bytearray,
+    vectorized: bool = HAS_NUMPY,
+) -> list[ValidationMessage]:
+    """
+    Completeness messages of a column of elements of one type, given their
+    SPDX IDs and one byte of flags each, for the rules of the registry in
+    element and then rule order. Every rule of the type needs a flag, and
+    its evaluations and violations are added to the registry's stats.
+    Vectorized, which needs NumPy, every rule is one comparison over the
+    whole column and only the elements that break a rule are visited in
+    Python. Otherwise, the rules each element breaks are looked up by its
+    flag byte.
+    """
+    type_rules = rules.flag_rules(element_type)
+    pairs = _broken_pairs([flag for _, flag in type_rules], flags, vectorized)
+    messages = []
+    for element, index in pairs:
+        rule = type_rules[index][0]
+        rules.stats[rule.name].violations += 1
+        messages.append(
+            completeness_message(rule.message, element_type, spdx_ids[element])
+        )
+    for rule, _ in type_rules:
+        rules.stats[rule.name].evaluations += len(spdx_ids)
+    return messages
+
+
+def _broken_pairs(
+    rule_flags: list[tuple[int, int]],
+    flags: bytes | bytearray,
+    vectorized: bool,
+) -> Iterable[tuple[int, int]]:
+    """(element, rule) index pairs of the rules each element breaks."""
+    if vectorized:
+        column = numpy.frombuffer(flags, dtype=numpy.uint8)
+        masks = numpy.array([mask for mask, _ in rule_flags], numpy.uint8)
+        values = numpy.array([value for _, value in rule_flags], numpy.uint8)
+        elements, broken = numpy.nonzero(column[:, None] & masks == values)
+        return zip(elements.tolist(), broken.tolist())
+    table = _broken(tuple(rule_flags))
+    return (
+        (element, index)
+        for element, byte in enumerate(flags)
+        for index in table[byte]
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _broken(rule_flags: tuple[tuple[int, int], ...]) -> list[tuple[int, ...]]:
+    """The indexes of the rules each of the 256 possible flag bytes breaks."""
+    return [
+        tuple(
+            index
+            for index, (mask, value) in enumerate(rule_flags)
+            if flags & mask == value
+        )
+        for flags in range(256)
+    ]
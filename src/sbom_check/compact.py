@@ -0,0 +1,363 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Compact columnar model of an SPDX document for the lighter checks."""
+
+import logging
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from spdx_tools.spdx.model.relationship import RelationshipType
+from spdx_tools.spdx.parser.error import SPDXParsingError
+from spdx_tools.spdx.parser.jsonlikedict.creation_info_parser import (
+    CreationInfoParser,
+)
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationContext,
+    ValidationMessage,
+)
+
+from sbom_check.checks import (
+    COMPLETENESS_RULES,
+    CheckResult,
+    _describes_message,
+    _file_flags,
+    _package_code_dict,
+    _package_flags,
+    _relationship_type,
+    check_creation_info_dict,
+    no_files_message,
+    no_packages_message,
+)
+from sbom_check.columnar import flag_messages
+from sbom_check.duplicates import (
+    digest_pairs,
+    duplicate_messages,
+    file_identity_dict,
+    package_identity_dict,
+)
+from sbom_check.rules import RuleRegistry
+from sbom_check.streaming import (
+    CHUNK_SIZE,
+    FILES,
+    PACKAGES,
+    RELATIONSHIPS,
+    SNIPPETS,
+    STREAMED_COLLECTIONS,
+    Readable,
+    iter_spdx_json,
+)
+from sbom_check.validation import (
+    SpdxIdIndex,
+    document_messages,
+    document_skeleton,
+    validate_reference,
+)
+from sbom_check.verification_code import (
+    FileSha1s,
+    PackageCode,
+    containment_index,
+    verification_code_messages,
+)
+
+logger = logging.getLogger(__name__)
+
+DESCRIBES = RelationshipType.DESCRIBES.name
+DESCRIBED_BY = RelationshipType.DESCRIBED_BY.name
+CONTAINS = RelationshipType.CONTAINS.name
+SPDX_2_2_ONLY_RELATIONSHIPS = (
+    "SPECIFICATION_FOR",
+    "REQUIREMENT_DESCRIPTION_FOR",
+)
+NO_ELEMENT = ("NONE", "NOASSERTION")
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
+class CompactDocument:
+    """
+    An SPDX document reduced to what the completeness checks and SPDX ID
+    and relationship validation need. Packages, files and relationships are
+    stored column-wise: interned SPDX IDs plus one byte of completeness flags
+    per element (see columnar.PACKAGE_* and columnar.FILE_*) and the packed
+    digests that duplicates are detected by, instead of one model object per
+    element and property. The declared package verification codes and the
+    file SHA1s they are recomputed from are kept as well.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    header: dict[str, Any] = field(default_factory=dict)
+    package_ids: list[str] = field(default_factory=list)
+    package_flags: bytearray = field(default_factory=bytearray)
+    package_identities: bytearray = field(default_factory=bytearray)
+    file_ids: list[str] = field(default_factory=list)
+    file_flags: bytearray = field(default_factory=bytearray)
+    file_identities: bytearray = field(default_factory=bytearray)
+    snippet_ids: list[str] = field(default_factory=list)
+    relationship_sources: list[Any] = field(default_factory=list)
+    relationship_types: list[str] = field(default_factory=list)
+    relationship_targets: list[Any] = field(default_factory=list)
+    relationship_comments: dict[int, Any] = field(default_factory=dict)
+    package_files: list[tuple[str, Any]] = field(default_factory=list)
+    package_codes: list[PackageCode] = field(default_factory=list)
+    file_sha1s: FileSha1s = field(default_factory=FileSha1s)
+
+    def add(self, key: str, value: Any) -> None:
+        """Adds a top-level member or collection element, as streamed."""
+        if key == PACKAGES and isinstance(value, dict):
+            spdx_id = _intern(value.get("SPDXID") or "")
+            self.package_ids.append(spdx_id)
+            self.package_flags.append(_package_flags(value))
+            self.package_identities += package_identity_dict(value)
+            if (code := _package_code_dict(value)) is not None:
+                self.package_codes.append(code)
+            for file_id in dict.fromkeys(value.get("hasFiles") or []):
+                self.package_files.append((spdx_id, _intern(file_id)))
+        elif key == FILES and isinstance(value, dict):
+            self.file_ids.append(_intern(value.get("SPDXID") or ""))
+            self.file_flags.append(_file_flags(value))
+            self.file_identities += file_identity_dict(value)
+            self.file_sha1s.add_dict(value)
+        elif key == SNIPPETS and isinstance(value, dict):
+            self.snippet_ids.append(_intern(value.get("SPDXID") or ""))
+        elif key == RELATIONSHIPS and isinstance(value, dict):
+            self.add_relationship(
+                value.get("spdxElementId"),
+                _relationship_type(value),
+                value.get("relatedSpdxElement"),
+                value.get("comment"),
+            )
+        else:
+            self.header[key] = value
+
+    def add_relationship(
+        self, source: Any, relationship_type: str, target: Any, comment: Any
+    ) -> None:
+        """Appends a relationship to the relationship columns."""
+        if comment is not None:
+            self.relationship_comments[len(self.relationship_types)] = comment
+        self.relationship_sources.append(_intern(source))
+        self.relationship_types.append(sys.intern(relationship_type))
+        self.relationship_targets.append(_intern(target))
+
+    def relationships(self) -> Iterable[tuple[Any, str, Any, Any]]:
+        """Yields (source, type, target, comment) tuples."""
+        for index, relationship in enumerate(
+            zip(
+                self.relationship_sources,
+                self.relationship_types,
+                self.relationship_targets,
+            )
+        ):
+            yield *relationship, self.relationship_comments.get(index)
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[tuple[str, Any]]) -> "CompactDocument":
+        """
+        Builds the model from (key, value) pairs as yielded by
+        iter_spdx_json, adding the relationships that spdx-tools derives
+        from documentDescribes and hasFiles.
+        """
+        document = cls()
+        for key, value in pairs:
+            document.add(key, value)
+        document._add_generated_relationships()
+        return document
+
+    @classmethod
+    def from_dict(cls, spdx_dict: dict[str, Any]) -> "CompactDocument":
+        """Builds the model from an already decoded SPDX JSON document."""
+        return cls.from_pairs(
+            (key, element)
+            for key, value in spdx_dict.items()
+            for element in (
+                value
+                if key in STREAMED_COLLECTIONS and isinstance(value, list)
+                else [value]
+            )
+        )
+
+    def _add_generated_relationships(self) -> None:
+        document_id = self.header.get("SPDXID")
+        existing = set(
+            zip(
+                self.relationship_sources,
+                self.relationship_types,
+                self.relationship_targets,
+            )
+        )
+        for spdx_id in dict.fromkeys(
+            self.header.get("documentDescribes") or []
+        ):
+            if (document_id, DESCRIBES, spdx_id) not in existing and (
+                spdx_id,
+                DESCRIBED_BY,
+                document_id,
+            ) not in existing:
+                self.add_relationship(document_id, DESCRIBES, spdx_id, None)
+        for package_id, file_id in self.package_files:
+            if (package_id, CONTAINS, file_id) not in existing:
+                self.add_relationship(package_id, CONTAINS, file_id, None)
+        self.package_files = []
+
+
+def check_sbom_compact(
+    stream: Readable,
+    chunk_size: int = CHUNK_SIZE,
+    rules: RuleRegistry | None = None,
+) -> CheckResult:
+    """
+    Runs SPDX ID and relationship validation and the completeness checks on
+    a CompactDocument streamed from an SPDX JSON document. The remaining
+    specification checks of check_sbom are not run, and values that would
+    fail to parse into the spdx-tools model are not reported. Completeness
+    is checked against rules as in check_completeness_dict.
+    """
+    document = CompactDocument.from_pairs(iter_spdx_json(stream, chunk_size))
+    messages = validate_references(document)
+    logger.info("Completed SPDX ID and relationship validation.")
+    messages += check_completeness_compact(document, rules)
+    logger.info("Completed configured completeness SDPX Validation.")
+    return CheckResult(messages, [])
+
+
+def validate_references(document: CompactDocument) -> list[ValidationMessage]:
+    """
+    Validates the SPDX IDs referenced by relationships, that the document
+    describes something and that SPDX IDs are unique.
+    """
+    header = document.header
+    document_id = header.get("SPDXID")
+    if not isinstance(document_id, str):
+        document_id = ""
+    index = SpdxIdIndex(document_id)
+    for ids, element_type in (
+        (document.file_ids, SpdxElementType.FILE),
+        (document.package_ids, SpdxElementType.PACKAGE),
+        (document.snippet_ids, SpdxElementType.SNIPPET),
+    ):
+        for spdx_id in ids:
+            index.add(spdx_id, element_type)
+
+    messages = _validate_relationships(document, index)
+    single_package = (
+        len(document.package_ids) == 1
+        and not document.file_ids
+        and not document.snippet_ids
+    )
+    describes_document = any(
+        (relationship_type, source) == (DESCRIBES, document_id)
+        or (relationship_type, target) == (DESCRIBED_BY, document_id)
+        for source, relationship_type, target, _ in document.relationships()
+    )
+    return messages + document_messages(
+        document_id, single_package or describes_document, index
+    )
+
+
+def _validate_relationships(
+    document: CompactDocument, index: SpdxIdIndex
+) -> list[ValidationMessage]:
+    spdx_version = document.header.get("spdxVersion")
+    skeleton = document_skeleton(
+        spdx_version if isinstance(spdx_version, str) else "",
+        index.document_id,
+        external_document_refs(document.header),
+    )
+    messages = []
+    context = ValidationContext(element_type=SpdxElementType.RELATIONSHIP)
+    for source, relationship_type, target, _ in document.relationships():
+        spdx_ids = [source] if target in NO_ELEMENT else [source, target]
+        for spdx_id in spdx_ids:
+            messages += [
+                ValidationMessage(message, context)
+                for message in validate_reference(
+                    str(spdx_id), skeleton, index
+                )
+            ]
+        if (
+            spdx_version == "SPDX-2.2"
+            and relationship_type in SPDX_2_2_ONLY_RELATIONSHIPS
+        ):
+            messages.append(
+                ValidationMessage(
+                    f"{RelationshipType[relationship_type]} is not supported "
+                    "in SPDX-2.2",
+                    context,
+                )
+            )
+    return messages
+
+
+def external_document_refs(header: dict[str, Any]) -> list[Any]:
+    """Parses the external document references that parse, if any."""
+    try:
+        parser = CreationInfoParser()  # type: ignore
+        refs = parser.parse_external_document_refs(
+            header.get("externalDocumentRefs") or []
+        )
+    except (SPDXParsingError, TypeError, ValueError):
+        return []
+    return [ref for ref in refs if ref]
+
+
+def check_completeness_compact(
+    document: CompactDocument, rules: RuleRegistry | None = None
+) -> list[ValidationMessage]:
+    """Runs the same completeness checks as check_completeness_dict."""
+    rules = rules or COMPLETENESS_RULES.copy()
+    messages = check_creation_info_dict(document.header, rules)
+
+    if not document.package_ids:
+        messages.append(no_packages_message())
+        return messages
+
+    document_id = document.header.get("SPDXID")
+    if primary_package_msg := _describes_message(
+        (document_id, DESCRIBES, document.package_ids[0] or None, None),
+        [
+            relationship
+            for relationship in document.relationships()
+            if relationship[1] == DESCRIBES
+        ],
+    ):
+        messages.append(primary_package_msg)
+
+    messages += flag_messages(
+        rules,
+        SpdxElementType.PACKAGE,
+        document.package_ids,
+        document.package_flags,
+    )
+
+    contained = containment_index(document.relationships())
+    messages += verification_code_messages(
+        document.package_codes,
+        lambda spdx_id: contained.get(spdx_id, []),
+        document.file_sha1s,
+    )
+
+    messages += duplicate_messages(
+        document_id or "",
+        digest_pairs(document.package_ids, document.package_identities),
+        digest_pairs(document.file_ids, document.file_identities),
+        document.snippet_ids,
+    )
+
+    if not document.file_ids:
+        messages.append(no_files_message())
+        return messages
+
+    messages += flag_messages(
+        rules,
+        SpdxElementType.FILE,
+        document.file_ids,
+        document.file_flags,
+    )
+    return messages
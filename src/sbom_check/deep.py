@@ -0,0 +1,236 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Cross-reference checks run at the deep validation level."""
+
+from typing import Any, Callable, Iterator
+
+from license_expression import LicenseExpression, LicenseWithExceptionSymbol
+from spdx_tools.spdx.model.document import Document
+from spdx_tools.spdx.model.relationship import RelationshipType
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationMessage,
+)
+
+from sbom_check.graph import RelationshipGraph
+from sbom_check.license_list import (
+    LicenseList,
+    listed_versions,
+    nearest_license_list,
+    version_key,
+)
+from sbom_check.rules import completeness_message
+
+DeepCheck = Callable[[Document, RelationshipGraph], list[ValidationMessage]]
+
+
+def check_orphan_files(
+    document: Document, graph: RelationshipGraph
+) -> list[ValidationMessage]:
+    """
+    Reports the files that no package of the document contains, through a
+    CONTAINS or CONTAINED_BY relationship or hasFiles.
+    """
+    if not document.packages:
+        # already reported as a document without packages
+        return []
+    contained = {
+        target
+        for package in document.packages
+        for target in graph.successors(
+            RelationshipType.CONTAINS, package.spdx_id
+        )
+    }
+    return [
+        completeness_message(
+            "This file is not contained in any package.",
+            SpdxElementType.FILE,
+            file.spdx_id,
+        )
+        for file in document.files
+        if file.spdx_id not in contained
+    ]
+
+
+def check_unreachable_elements(
+    document: Document, graph: RelationshipGraph
+) -> list[ValidationMessage]:
+    """
+    Reports the packages and files that no chain of relationships, in
+    either direction, connects to an element the document DESCRIBES.
+    """
+    document_id = document.creation_info.spdx_id
+    roots = graph.successors(RelationshipType.DESCRIBES, document_id)
+    if not roots:
+        # already reported by the DESCRIBES completeness check
+        return []
+    connected = graph.connected(roots)
+    return [
+        completeness_message(
+            f"This {name} is not connected to the described elements by any "
+            "relationship.",
+            element_type,
+            element.spdx_id,
+        )
+        for name, element_type, elements in (
+            ("package", SpdxElementType.PACKAGE, document.packages),
+            ("file", SpdxElementType.FILE, document.files),
+        )
+        for element in elements
+        if element.spdx_id not in connected
+    ]
+
+
+def check_dependency_cycles(
+    _: Document, graph: RelationshipGraph
+) -> list[ValidationMessage]:
+    """Reports cycles of DEPENDS_ON and DEPENDENCY_OF relationships."""
+    return [
+        completeness_message(
+            "These elements depend on each other in a cycle: "
+            f"{', '.join(cycle)}.",
+            SpdxElementType.RELATIONSHIP,
+            cycle[0],
+        )
+        for cycle in graph.cycles(RelationshipType.DEPENDS_ON)
+    ]
+
+
+def check_license_list(
+    document: Document, _: RelationshipGraph
+) -> list[ValidationMessage]:
+    """
+    Reports the license and exception IDs that are not in the SPDX license
+    list version the document declares but were added in a later version,
+    per the tables bundled in sbom_check.license_list, or that were only in
+    earlier versions. A version without
+    a table is checked against the newest bundled version before it, for
+    IDs added after the declared version. IDs that no bundled version has,
+    such as LicenseRefs, are left to specification validation. IDs are
+    looked up in the tables only, and each distinct expression once.
+    """
+    version = document.creation_info.license_list_version
+    if not version:
+        # already reported by the license-list-version completeness rule
+        return []
+    declared = str(version)
+    table = nearest_license_list(declared)
+    if table is None:
+        return [
+            completeness_message(
+                f"The document declares version {declared} of the SPDX "
+                "license list, which is older than every bundled version, "
+                "so its license IDs are not checked against it.",
+                SpdxElementType.DOCUMENT,
+                document.creation_info.spdx_id,
+            )
+        ]
+    unlisted: dict[str, list[tuple[str, str]]] = {}
+    messages = []
+    for element_type, spdx_id, expressions in _license_expressions(document):
+        for expression in expressions:
+            if not isinstance(expression, LicenseExpression):
+                continue
+            key = str(expression)
+            if key not in unlisted:
+                unlisted[key] = _unlisted_ids(expression, table, declared)
+            messages += [
+                completeness_message(
+                    f"{license_id} is not in version {declared} of the SPDX "
+                    f"license list that the document declares, but {listed}.",
+                    element_type,
+                    spdx_id,
+                )
+                for license_id, listed in unlisted[key]
+            ]
+    return messages
+
+
+def _license_expressions(
+    document: Document,
+) -> Iterator[tuple[SpdxElementType, str, list[Any]]]:
+    for package in document.packages:
+        yield SpdxElementType.PACKAGE, package.spdx_id, [
+            package.license_concluded,
+            package.license_declared,
+            *package.license_info_from_files,
+        ]
+    for file in document.files:
+        yield SpdxElementType.FILE, file.spdx_id, [
+            file.license_concluded,
+            *file.license_info_in_file,
+        ]
+    for snippet in document.snippets:
+        yield SpdxElementType.SNIPPET, snippet.spdx_id, [
+            snippet.license_concluded,
+            *snippet.license_info_in_snippet,
+        ]
+
+
+def _unlisted_ids(
+    expression: LicenseExpression, table: LicenseList, declared: str
+) -> list[tuple[str, str]]:
+    """
+    The IDs of an expression that the table lacks, with the first bundled
+    version that has them if it is later than the declared version, or else
+    the last. When the table is of a version before the declared one, IDs
+    first listed after the table's version but no later than the declared
+    one may be in the declared list and are skipped.
+    """
+    unlisted = []
+    for symbol in expression.get_symbols():
+        if isinstance(symbol, LicenseWithExceptionSymbol):
+            ids = [
+                (symbol.license_symbol.key, False),
+                (symbol.exception_symbol.key, True),
+            ]
+        else:
+            ids = [(symbol.key, False)]
+        for license_id, exception in ids:
+            if "LicenseRef-" in license_id or (
+                table.is_exception(license_id)
+                if exception
+                else table.is_license(license_id)
+            ):
+                continue
+            listed = listed_versions(license_id, exception)
+            if not listed or (
+                version_key(table.version)
+                < version_key(listed[0])
+                <= version_key(declared)
+            ):
+                continue
+            if version_key(listed[0]) > version_key(declared):
+                unlisted.append(
+                    (license_id, f"was added in version {listed[0]}")
+                )
+            else:
+                unlisted.append(
+                    (license_id, f"was last in version {listed[-1]}")
+                )
+    return list(dict.fromkeys(unlisted))
+
+
+# checks run after check_completeness at the deep level, in order
+DEEP_CHECKS: list[DeepCheck] = [
+    check_orphan_files,
+    check_unreachable_elements,
+    check_dependency_cycles,
+    check_license_list,
+]
+
+
+def check_deep(
+    document: Document, graph: RelationshipGraph | None = None
+) -> list[ValidationMessage]:
+    """
+    Runs DEEP_CHECKS on a parsed document and the graph of its
+    relationships, which is built if not given.
+    """
+    if graph is None:
+        graph = RelationshipGraph(document.relationships)
+    messages = []
+    for check in DEEP_CHECKS:
+        messages += check(document, graph)
+    return messages
@@ -0,0 +1,181 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Detection of repeated SPDX IDs, packages and files."""
+
+import hashlib
+from typing import Any, Iterable, Sequence
+
+from spdx_tools.spdx.model.file import File
+from spdx_tools.spdx.model.package import Package
+from spdx_tools.spdx.parser.jsonlikedict.dict_parsing_functions import (
+    json_str_to_enum_name,
+)
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationMessage,
+)
+
+from sbom_check.paths import normalized_path
+from sbom_check.rules import completeness_message
+
+DIGEST_SIZE = 8
+# digest of a file without checksums, which is never a duplicate
+NO_DIGEST = bytes(DIGEST_SIZE)
+PURL = "purl"
+
+
+def digest(*parts: Any) -> bytes:
+    """
+    Compact digest of a key. With 64 bits, a false duplicate among millions
+    of keys is about as likely as one in a million documents.
+    """
+    return hashlib.blake2b(
+        repr(parts).encode("utf-8"), digest_size=DIGEST_SIZE
+    ).digest()
+
+
+def package_identity(package: Package) -> bytes:
+    """Digest of the name, version and first purl of a package."""
+    purl = next(
+        (
+            ref.locator
+            for ref in package.external_references
+            if ref.reference_type == PURL
+        ),
+        None,
+    )
+    return digest(package.name, package.version, purl)
+
+
+def package_identity_dict(package: dict[str, Any]) -> bytes:
+    """package_identity of a package as decoded from JSON."""
+    purl = next(
+        (
+            ref.get("referenceLocator")
+            for ref in package.get("externalRefs") or []
+            if isinstance(ref, dict) and ref.get("referenceType") == PURL
+        ),
+        None,
+    )
+    return digest(package.get("name"), package.get("versionInfo"), purl)
+
+
+def file_identity(file: File) -> bytes:
+    """
+    Digest of the normalized name and the checksums of a file, or NO_DIGEST
+    without checksums. Equal contents under different names, such as empty
+    files or a license repeated across directories, are distinct files.
+    """
+    return _file_digest(
+        file.name,
+        (
+            (checksum.algorithm.name, checksum.value)
+            for checksum in file.checksums
+        ),
+    )
+
+
+def file_identity_dict(file: dict[str, Any]) -> bytes:
+    """file_identity of a file as decoded from JSON."""
+    return _file_digest(
+        file.get("fileName"),
+        (
+            (
+                json_str_to_enum_name(checksum.get("algorithm") or ""),
+                checksum.get("checksumValue"),
+            )
+            for checksum in file.get("checksums") or []
+            if isinstance(checksum, dict)
+        ),
+    )
+
+
+def _file_digest(
+    file_name: Any, checksums: Iterable[tuple[str, Any]]
+) -> bytes:
+    pairs = sorted(
+        (algorithm, value.lower())
+        for algorithm, value in checksums
+        if isinstance(value, str)
+    )
+    if not pairs:
+        return NO_DIGEST
+    if isinstance(file_name, str):
+        # names outside the tree are compared as written
+        file_name = normalized_path(file_name) or file_name
+    return digest(file_name, *pairs)
+
+
+def duplicate_messages(
+    document_id: str,
+    packages: Iterable[tuple[str, bytes]],
+    files: Iterable[tuple[str, bytes]],
+    snippet_ids: Iterable[str],
+) -> list[ValidationMessage]:
+    """
+    Reports, in one pass over (SPDX ID, digest) pairs of the packages and
+    files and the snippet IDs, every element whose SPDX ID is already used,
+    package with the identity digest of an earlier one and file with the
+    identity digest of an earlier one. Only the digests and first IDs are
+    held.
+    """
+    spdx_ids = {document_id}
+    identities: dict[bytes, str] = {}
+    contents: dict[bytes, str] = {}
+    messages = []
+    for element_type, elements, first_ids in (
+        (SpdxElementType.PACKAGE, packages, identities),
+        (SpdxElementType.FILE, files, contents),
+        (
+            SpdxElementType.SNIPPET,
+            ((spdx_id, NO_DIGEST) for spdx_id in snippet_ids),
+            {},
+        ),
+    ):
+        for spdx_id, element_digest in elements:
+            if spdx_id in spdx_ids:
+                messages.append(
+                    completeness_message(
+                        "This SPDX ID is already used by another element.",
+                        element_type,
+                        spdx_id,
+                    )
+                )
+            spdx_ids.add(spdx_id)
+            if element_digest == NO_DIGEST:
+                continue
+            first_id = first_ids.get(element_digest)
+            if first_id is None:
+                first_ids[element_digest] = spdx_id
+            else:
+                messages.append(
+                    _duplicate_message(element_type, spdx_id, first_id)
+                )
+    return messages
+
+
+def digest_pairs(
+    spdx_ids: Sequence[str], digests: bytes | bytearray
+) -> Iterable[tuple[str, bytes]]:
+    """(SPDX ID, digest) pairs of an ID column and a packed digest column."""
+    for index, spdx_id in enumerate(spdx_ids):
+        start = index * DIGEST_SIZE
+        end = start + DIGEST_SIZE
+        yield spdx_id, bytes(digests[start:end])
+
+
+def _duplicate_message(
+    element_type: SpdxElementType, spdx_id: str, first_id: str
+) -> ValidationMessage:
+    if element_type == SpdxElementType.PACKAGE:
+        return completeness_message(
+            f"This package has the same name, version and purl as {first_id}.",
+            element_type,
+            spdx_id,
+        )
+    return completeness_message(
+        f"This file has the same name and checksums as {first_id}.",
+        element_type,
+        spdx_id,
+    )
@@ -0,0 +1,113 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Shared instances of repeated values while an SPDX document is built."""
+
+from collections import Counter
+from typing import Any, Callable
+
+from spdx_tools.spdx.model.document import Document
+from spdx_tools.spdx.parser.jsonlikedict.json_like_dict_parser import (
+    JsonLikeDictParser,
+)
+
+STRINGS = "strings"
+ACTORS = "actors"
+LICENSE_EXPRESSIONS = "license expressions"
+
+# values that are unique per element, which interning would only slow down
+UNIQUE_KEYS = frozenset(("checksumValue", "fileName", "extractedText"))
+
+
+class Flyweights:
+    """
+    Tables of equal strings, actors and license expressions of the document
+    being parsed, so that each distinct value is allocated once. The number
+    of allocations saved accumulates across documents in saved.
+    """
+
+    def __init__(self) -> None:
+        self.saved: Counter[str] = Counter()
+        self._strings: dict[str, str] = {}
+        self._actors: dict[str, Any] = {}
+        self._license_expressions: dict[str, Any] = {}
+
+    def parse(self, spdx_dict: dict[str, Any], parser: Any = None) -> Document:
+        """
+        Parses decoded SPDX JSON into a Document, sharing one instance of
+        each repeated value; repeated strings of spdx_dict are replaced in
+        place. The tables are emptied afterwards, so that they
+        do not keep values of past documents alive. The actor and license
+        expression parsing of a given JsonLikeDictParser is wrapped.
+        """
+        try:
+            if parser is None:
+                parser = JsonLikeDictParser()  # type: ignore
+            for actor_parser in (
+                parser.creation_info_parser.actor_parser,
+                parser.package_parser.actor_parser,
+                parser.annotation_parser.actor_parser,
+            ):
+                setattr(
+                    actor_parser,
+                    "parse_actor",
+                    self._flyweight(
+                        self._actors, ACTORS, actor_parser.parse_actor
+                    ),
+                )
+            for expression_parser in (
+                parser.package_parser.license_expression_parser,
+                parser.file_parser.license_expression_parser,
+                parser.snippet_parser.license_expression_parser,
+            ):
+                setattr(
+                    expression_parser,
+                    "parse_license_expression",
+                    self._flyweight(
+                        self._license_expressions,
+                        LICENSE_EXPRESSIONS,
+                        expression_parser.parse_license_expression,
+                    ),
+                )
+            document: Document = parser.parse(self.intern(spdx_dict))
+            return document
+        finally:
+            self._strings.clear()
+            self._actors.clear()
+            self._license_expressions.clear()
+
+    def intern(self, value: Any) -> Any:
+        """
+        Replaces every repeated string of a decoded JSON value by its first
+        occurrence, in place, so that no second copy of the document is
+        built, and returns the value.
+        """
+        if isinstance(value, str):
+            interned = self._strings.get(value)
+            if interned is None:
+                self._strings[value] = value
+                return value
+            self.saved[STRINGS] += 1
+            return interned
+        if isinstance(value, list):
+            for index, item in enumerate(value):
+                value[index] = self.intern(item)
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if key not in UNIQUE_KEYS:
+                    value[key] = self.intern(item)
+        return value
+
+    def _flyweight(
+        self, table: dict[str, Any], kind: str, parse: Callable[[Any], Any]
+    ) -> Callable[[Any], Any]:
+        def parse_shared(value: Any) -> Any:
+            if not isinstance(value, str):
+                return parse(value)
+            if value in table:
+                self.saved[kind] += 1
+                return table[value]
+            parsed = table[value] = parse(value)
+            return parsed
+
+        return parse_shared
@@ -0,0 +1,180 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Index of the relationships of a document as a graph of SPDX IDs."""
+
+from collections import defaultdict, deque
+from typing import Iterable, Iterator
+
+from spdx_tools.spdx.model.relationship import Relationship, RelationshipType
+
+# relationship types whose edges point the other way, with their counterpart
+INVERSES = {
+    RelationshipType.CONTAINED_BY: RelationshipType.CONTAINS,
+    RelationshipType.DESCRIBED_BY: RelationshipType.DESCRIBES,
+    RelationshipType.DEPENDENCY_OF: RelationshipType.DEPENDS_ON,
+}
+
+
+class RelationshipGraph:
+    """
+    Relationships grouped by type, with adjacency lists of the SPDX IDs
+    they connect, built in one pass. Edges of the INVERSES types are also
+    indexed reversed under their counterpart, so that, for example, a file
+    CONTAINED_BY a package is a successor of the package under CONTAINS.
+    Relationships to NONE or NOASSERTION are not edges.
+    """
+
+    def __init__(self, relationships: Iterable[Relationship] = ()) -> None:
+        self._relationships: defaultdict[
+            RelationshipType, list[Relationship]
+        ] = defaultdict(list)
+        self._successors: defaultdict[
+            RelationshipType, defaultdict[str, list[str]]
+        ] = defaultdict(lambda: defaultdict(list))
+        self._neighbors: defaultdict[str, list[str]] = defaultdict(list)
+        self._edges: set[tuple[RelationshipType, str, str]] = set()
+        for relationship in relationships:
+            self.add(relationship)
+
+    def __contains__(self, relationship: object) -> bool:
+        """
+        Whether the graph has the edge of a relationship, which may have
+        been added as its inverse the other way round.
+        """
+        edge = (
+            _edge(relationship)
+            if isinstance(relationship, Relationship)
+            else None
+        )
+        return edge is not None and edge in self._edges
+
+    def add(self, relationship: Relationship) -> None:
+        """Adds a relationship to the index."""
+        self._relationships[relationship.relationship_type].append(
+            relationship
+        )
+        edge = _edge(relationship)
+        if edge is None:
+            return
+        relationship_type, source, target = edge
+        self._edges.add(edge)
+        self._successors[relationship_type][source].append(target)
+        self._neighbors[source].append(target)
+        self._neighbors[target].append(source)
+
+    def relationships(
+        self, relationship_type: RelationshipType
+    ) -> list[Relationship]:
+        """The relationships of a type, in document order."""
+        return self._relationships.get(relationship_type, [])
+
+    def successors(
+        self, relationship_type: RelationshipType, spdx_id: str
+    ) -> list[str]:
+        """
+        The SPDX IDs an element points to by a relationship type, or by its
+        inverse the other way round.
+        """
+        successors = self._successors.get(relationship_type)
+        return successors.get(spdx_id, []) if successors else []
+
+    def edges(
+        self, relationship_type: RelationshipType
+    ) -> Iterator[tuple[str, str]]:
+        """(source, target) pairs of a relationship type and its inverse."""
+        for source, targets in self._successors.get(
+            relationship_type, {}
+        ).items():
+            for target in targets:
+                yield source, target
+
+    def connected(self, roots: Iterable[str]) -> set[str]:
+        """
+        SPDX IDs connected to any of roots by relationships of any type and
+        direction, roots included.
+        """
+        seen = set(roots)
+        queue = deque(seen)
+        while queue:
+            for neighbor in self._neighbors.get(queue.popleft(), []):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        return seen
+
+    def cycles(self, relationship_type: RelationshipType) -> list[list[str]]:
+        """
+        Strongly connected components of more than one element, or with an
+        edge to itself, among the edges of a relationship type, found by an
+        iterative Tarjan's algorithm.
+        """
+        successors: dict[str, list[str]] = self._successors.get(
+            relationship_type, {}
+        )
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        components = []
+        for root in list(successors):
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(successors.get(root, [])))]
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is None:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        components.append(
+                            _pop_component(stack, on_stack, node)
+                        )
+                elif child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors.get(child, []))))
+                elif child in on_stack:
+                    low[node] = min(low[node], index[child])
+        return [
+            component
+            for component in components
+            if len(component) > 1
+            or component[0] in successors.get(component[0], [])
+        ]
+
+
+def _edge(
+    relationship: Relationship,
+) -> tuple[RelationshipType, str, str] | None:
+    """
+    The (type, source, target) edge of a relationship, with INVERSES types
+    turned round, or None for a relationship to NONE or NOASSERTION.
+    """
+    relationship_type = relationship.relationship_type
+    source = relationship.spdx_element_id
+    target = relationship.related_spdx_element_id
+    if not isinstance(target, str):
+        return None
+    if relationship_type in INVERSES:
+        return INVERSES[relationship_type], target, source
+    return relationship_type, source, target
+
+
+def _pop_component(
+    stack: list[str], on_stack: set[str], root: str
+) -> list[str]:
+    component = []
+    while True:
+        node = stack.pop()
+        on_stack.discard(node)
+        component.append(node)
+        if node == root:
+            return component[::-1]
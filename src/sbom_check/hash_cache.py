@@ -0,0 +1,156 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Persistent cache of the digests of source tree files."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+DEFAULT_MAX_ENTRIES = 2_000_000
+# pending writes buffered before they are flushed to the database
+FLUSH_SIZE = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    used INTEGER NOT NULL,
+    digests TEXT NOT NULL,
+    PRIMARY KEY (device, inode)
+) WITHOUT ROWID
+"""
+
+
+class FileHashCache:
+    """
+    SQLite database of the hex digests computed for files, keyed by the
+    device and inode of each file and valid only while its size and
+    mtime_ns are unchanged. Entries are stamped with the run that last used
+    them, and beyond max_entries the least recently used are evicted when
+    the cache is closed. Safe to share among hashing threads.
+    """
+
+    def __init__(
+        self, path: str | Path, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._run = time.time_ns()
+        self._lock = threading.Lock()
+        # pending writes by device and inode, which lookups see before the
+        # database
+        self._writes: dict[tuple[int, int], tuple[Any, ...]] = {}
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(_SCHEMA)
+
+    def __enter__(self) -> "FileHashCache":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(
+        self, stat: os.stat_result, algorithms: Iterable[str]
+    ) -> dict[str, str] | None:
+        """
+        The digests by algorithms of the file stat describes, or None if
+        any of them is not cached for its current size and mtime_ns.
+        """
+        with self._lock:
+            row = self._row(stat.st_dev, stat.st_ino)
+            digests = _valid_digests(row, stat)
+            if digests is None or not all(
+                algorithm in digests for algorithm in algorithms
+            ):
+                self.misses += 1
+                return None
+            self.hits += 1
+            # rewritten to stamp it with this run
+            self._write(stat, row[2])
+            return digests
+
+    def put(self, stat: os.stat_result, digests: dict[str, str]) -> None:
+        """
+        Stores the digests of the file stat describes, added to those of
+        other algorithms cached for its current size and mtime_ns.
+        """
+        with self._lock:
+            cached = _valid_digests(self._row(stat.st_dev, stat.st_ino), stat)
+            self._write(
+                stat, json.dumps((cached or {}) | digests, sort_keys=True)
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._flush()
+            count: int = self._connection.execute(
+                "SELECT COUNT(*) FROM digests"
+            ).fetchone()[0]
+            return count
+
+    def close(self) -> None:
+        """Writes pending entries, evicts beyond max_entries and closes."""
+        with self._lock:
+            self._flush()
+            self._connection.execute(
+                "DELETE FROM digests WHERE (device, inode) IN ("
+                "SELECT device, inode FROM digests ORDER BY used DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._connection.commit()
+            self._connection.close()
+
+    def _row(self, device: int, inode: int) -> Any:
+        if (device, inode) in self._writes:
+            _, _, size, mtime_ns, _, digests = self._writes[device, inode]
+            return size, mtime_ns, digests
+        return self._connection.execute(
+            "SELECT size, mtime_ns, digests FROM digests "
+            "WHERE device = ? AND inode = ?",
+            (device, inode),
+        ).fetchone()
+
+    def _write(self, stat: os.stat_result, digests: str) -> None:
+        self._writes[stat.st_dev, stat.st_ino] = (
+            stat.st_dev,
+            stat.st_ino,
+            stat.st_size,
+            stat.st_mtime_ns,
+            self._run,
+            digests,
+        )
+        if len(self._writes) >= FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        # stale entries of a file, whose metadata changed, are replaced
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?)",
+            self._writes.values(),
+        )
+        self._connection.commit()
+        self._writes = {}
+
+
+def _valid_digests(
+    row: tuple[int, int, str] | None, stat: os.stat_result
+) -> dict[str, str] | None:
+    if row is None or row[:2] != (stat.st_size, stat.st_mtime_ns):
+        return None
+    digests: dict[str, str] = json.loads(row[2])
+    return digests
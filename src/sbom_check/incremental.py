@@ -0,0 +1,97 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Incremental re-validation of a new version of an SBOM."""
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sbom_check.checks import CheckResult
+from sbom_check.memo import MemoEntry, load_entries, save_entries
+from sbom_check.rules import RuleRegistry
+from sbom_check.streaming import CHUNK_SIZE, Readable, check_sbom_stream
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Snapshot:
+    """
+    Per-element results of a checked SBOM, keyed by SPDX ID, with the
+    fingerprint of the element content they were computed for.
+    """
+
+    entries: dict[str, tuple[str, MemoEntry]] = field(default_factory=dict)
+
+    def save(self, path: str | Path) -> None:
+        """Writes the snapshot to a file."""
+        save_entries(path, self.entries.values())
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Snapshot":
+        """
+        Reads a snapshot saved by the same sbom-check version. A missing,
+        unreadable or outdated file results in an empty snapshot.
+        """
+        return cls(
+            {entry.spdx_id: (key, entry) for key, entry in load_entries(path)}
+        )
+
+
+@dataclass(slots=True)
+class _SnapshotDiff:
+    """Element results looked up in a previous snapshot by SPDX ID."""
+
+    previous: Snapshot
+    current: Snapshot = field(default_factory=Snapshot)
+    unchanged: int = 0
+    changed: int = 0
+    added: int = 0
+
+    def get(self, key: str, spdx_id: str) -> MemoEntry | None:
+        """Returns the previous entry if the element is unchanged."""
+        previous = self.previous.entries.get(spdx_id)
+        if previous is None:
+            self.added += 1
+            return None
+        if previous[0] != key:
+            self.changed += 1
+            return None
+        self.unchanged += 1
+        self.current.entries[spdx_id] = previous
+        return previous[1]
+
+    def put(self, key: str, entry: MemoEntry) -> None:
+        """Records the entry of an added or changed element."""
+        self.current.entries[entry.spdx_id] = key, entry
+
+
+def check_sbom_incremental(
+    stream: Readable,
+    previous: Snapshot | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    rules: RuleRegistry | None = None,
+) -> tuple[CheckResult, Snapshot]:
+    """
+    Checks an SPDX JSON document like check_sbom_stream, re-running the
+    per-element checks only for packages, files and snippets that were added
+    or changed since the previous snapshot. Document-wide checks, such as
+    relationship integrity and the primary package, run on every call.
+
+    Returns the result and the snapshot to pass when checking the next
+    version of the document. Without a previous snapshot every element is
+    checked. Completeness is checked against rules, as in check_sbom_stream.
+    """
+    diff = _SnapshotDiff(previous or Snapshot())
+    result = check_sbom_stream(stream, chunk_size, diff, rules)
+    removed = len(diff.previous.entries.keys() - diff.current.entries.keys())
+    logger.info(
+        "Incremental check: %d unchanged, %d changed, %d added and %d "
+        "removed elements.",
+        diff.unchanged,
+        diff.changed,
+        diff.added,
+        removed,
+    )
+    return result, diff.current
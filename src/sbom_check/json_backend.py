@@ -0,0 +1,87 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""JSON decoding and encoding backends."""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAS_ORJSON = False
+
+JsonInput = str | bytes | bytearray | memoryview
+
+STDLIB = "json"
+ORJSON = "orjson"
+
+
+@dataclass(frozen=True, slots=True)
+class JsonBackend:
+    """A JSON implementation used to decode SBOMs and encode results."""
+
+    name: str
+    loads: Callable[[JsonInput], Any]
+    dumps: Callable[[Any, int], bytes]
+
+
+def _stdlib_loads(data: JsonInput) -> Any:
+    if isinstance(data, memoryview):
+        # decoded straight from the buffer, such as a memory map, like
+        # json.loads decodes bytes, instead of copying it into bytes first
+        encoding = json.detect_encoding(data[:4].tobytes())
+        return json.loads(str(data, encoding, "surrogatepass"))
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any, indent: int = 2) -> bytes:
+    # non-ASCII characters are escaped, as json.dump does by default
+    return json.dumps(obj, indent=indent).encode("ascii")
+
+
+def _orjson_dumps(obj: Any, indent: int = 2) -> bytes:
+    if indent == 2:
+        # pylint: disable-next=no-member
+        encoded: bytes = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        if encoded.isascii():
+            return encoded
+    # orjson only indents by two spaces and never escapes non-ASCII characters
+    return _stdlib_dumps(obj, indent)
+
+
+BACKENDS = {STDLIB: JsonBackend(STDLIB, _stdlib_loads, _stdlib_dumps)}
+if HAS_ORJSON:
+    # pylint: disable-next=no-member
+    BACKENDS[ORJSON] = JsonBackend(ORJSON, orjson.loads, _orjson_dumps)
+
+
+def get_backend(name: str | None = None) -> JsonBackend:
+    """
+    Returns the named backend, or the fastest installed one if no name is
+    given. orjson is used when installed; stdlib json is the fallback.
+    """
+    if name is None:
+        return BACKENDS.get(ORJSON, BACKENDS[STDLIB])
+    if name not in BACKENDS:
+        raise ValueError(
+            f"JSON backend {name!r} is not available. Installed backends: "
+            f"{sorted(BACKENDS)}."
+        )
+    return BACKENDS[name]
+
+
+def loads(data: JsonInput) -> Any:
+    """Decodes JSON text or UTF-8 bytes with the default backend."""
+    return get_backend().loads(data)
+
+
+def dumps(obj: Any, indent: int = 2) -> bytes:
+    """
+    Encodes an object as JSON indented by indent spaces, with non-ASCII
+    characters escaped, with the default backend.
+    """
+    return get_backend().dumps(obj, indent)
@@ -0,0 +1,60 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Validation levels, from quick structural checks to deep validation."""
+
+import logging
+from dataclasses import replace
+
+from sbom_check import json_backend
+from sbom_check.checks import CheckResult, ModelOptions, check_sbom
+from sbom_check.compact import CompactDocument, validate_references
+
+logger = logging.getLogger(__name__)
+
+# SPDX ID uniqueness, relationship references and DESCRIBES, on the decoded
+# JSON without building the spdx-tools model; linear, a few percent of FULL
+STRUCTURAL = "structural"
+# the completeness checks on the decoded JSON without building the
+# spdx-tools model; linear, a few percent of FULL
+COMPLETENESS = "completeness"
+# specification validation of the spdx-tools model plus the completeness
+# checks, as check_sbom; dominated by model construction and validation
+FULL = "full"
+# FULL plus the cross-reference checks of sbom_check.deep; adds linear
+# passes over the relationships and elements
+DEEP = "deep"
+
+LEVELS = (STRUCTURAL, COMPLETENESS, FULL, DEEP)
+
+
+def check_sbom_level(
+    spdx_json: json_backend.JsonInput,
+    level: str = FULL,
+    options: ModelOptions | None = None,
+) -> CheckResult:
+    """
+    Checks SPDX JSON at one of LEVELS. The STRUCTURAL and COMPLETENESS
+    levels skip the spdx-tools model and are meant for quick pre-merge
+    checks, FULL and DEEP for release gates. options apply to FULL and
+    DEEP, the levels that build the model, and their rules to the
+    COMPLETENESS level as well.
+    """
+    if level not in LEVELS:
+        raise ValueError(
+            f"Unknown validation level {level}, use one of {LEVELS}."
+        )
+    if level == COMPLETENESS:
+        return check_sbom(spdx_json, completeness_only=True, options=options)
+    if level == FULL:
+        return check_sbom(spdx_json, options=options)
+    if level == DEEP:
+        return check_sbom(
+            spdx_json, options=replace(options or ModelOptions(), deep=True)
+        )
+    spdx_dict = json_backend.loads(spdx_json)
+    if not isinstance(spdx_dict, dict):
+        return CheckResult([], ["The document is not a JSON object."])
+    messages = validate_references(CompactDocument.from_dict(spdx_dict))
+    logger.info("Completed SPDX ID and relationship validation.")
+    return CheckResult(messages, [])
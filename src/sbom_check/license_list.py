@@ -0,0 +1,184 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Precompiled license and exception ID tables of SPDX license lists."""
+
+import argparse
+import functools
+import json
+import mmap
+from pathlib import Path
+from typing import Iterable
+
+# bundled tables, one per license list version, named <version>.ids
+DATA_DIRECTORY = Path(__file__).parent / "license_lists"
+SUFFIX = ".ids"
+MAGIC = b"sbom-check license list 1\n"
+
+LICENSE = b"L"
+EXCEPTION = b"E"
+
+
+class LicenseList:
+    """
+    The license and exception IDs of one SPDX license list version. The
+    table is memory-mapped from a file written by compile_license_list, a
+    header line followed by fixed-width records of a lowercase ID, a kind
+    byte and a newline, sorted by ID. IDs are found by binary search over
+    the records, so nothing is parsed or built when a table is loaded.
+    """
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as file:
+            self._table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        header_start = len(MAGIC)
+        if self._table[:header_start] != MAGIC:
+            raise ValueError(f"{path} is not a license list table.")
+        header_end = self._table.find(b"\n", header_start) + 1
+        version, width = self._table[header_start:header_end].split()
+        self.version = version.decode("ascii")
+        self._start = header_end
+        self._width = int(width)
+        self._count = (len(self._table) - header_end) // self._width
+
+    def __len__(self) -> int:
+        return self._count
+
+    def is_license(self, license_id: str) -> bool:
+        """Whether license_id is a license of the list, ignoring case."""
+        return self._kind(license_id) == LICENSE
+
+    def is_exception(self, license_id: str) -> bool:
+        """Whether license_id is a license exception of the list."""
+        return self._kind(license_id) == EXCEPTION
+
+    def _kind(self, license_id: str) -> bytes | None:
+        key = license_id.lower().encode("ascii", "replace")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            start = self._start + middle * self._width
+            kind = start + self._width - 2
+            record = self._table[start:kind].rstrip(b" ")
+            if record == key:
+                return bytes([self._table[kind]])
+            if record < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def versions() -> frozenset[str]:
+    """The license list versions with a bundled table."""
+    return frozenset(path.stem for path in DATA_DIRECTORY.glob(f"*{SUFFIX}"))
+
+
+def version_key(version: str) -> tuple[int, ...]:
+    """Sort key of a license list version such as 3.23."""
+    return tuple(
+        int(part) if part.isdigit() else -1 for part in version.split(".")
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def listed_versions(license_id: str, exception: bool = False) -> list[str]:
+    """
+    The bundled versions whose list has license_id, as an exception or as
+    a license, oldest first.
+    """
+    tables = (license_list(version) for version in versions())
+    return sorted(
+        (
+            table.version
+            for table in tables
+            if table is not None
+            and (
+                table.is_exception(license_id)
+                if exception
+                else table.is_license(license_id)
+            )
+        ),
+        key=version_key,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def license_list(version: str) -> LicenseList | None:
+    """
+    The bundled table of a license list version, mapped on first use, or
+    None if that version is not bundled.
+    """
+    if version not in versions():
+        return None
+    return LicenseList(DATA_DIRECTORY / f"{version}{SUFFIX}")
+
+
+def nearest_license_list(version: str) -> LicenseList | None:
+    """
+    The bundled table of a license list version or, if that version is not
+    bundled, of the newest bundled version before it. None if no bundled
+    version is as old.
+    """
+    older = [
+        bundled
+        for bundled in versions()
+        if version_key(bundled) <= version_key(version)
+    ]
+    if not older:
+        return None
+    return license_list(max(older, key=version_key))
+
+
+def compile_license_list(
+    version: str,
+    licenses: Iterable[str],
+    exceptions: Iterable[str],
+    directory: Path = DATA_DIRECTORY,
+) -> Path:
+    """Writes the table of a license list version, as read by LicenseList."""
+    kinds = {license_id.lower(): LICENSE for license_id in licenses}
+    kinds.update((license_id.lower(), EXCEPTION) for license_id in exceptions)
+    # at least one space between the ID and its kind
+    width = max(map(len, kinds), default=0) + 3
+    path = directory / f"{version}{SUFFIX}"
+    with open(path, "wb") as file:
+        file.write(MAGIC + f"{version} {width}\n".encode("ascii"))
+        for key in sorted(kinds):
+            file.write(
+                key.encode("ascii").ljust(width - 2) + kinds[key] + b"\n"
+            )
+    return path
+
+
+def main() -> None:
+    """
+    Compiles the table of the licenses.json and exceptions.json of an
+    spdx/license-list-data release.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("licenses", type=Path, help="Path to licenses.json.")
+    parser.add_argument(
+        "exceptions", type=Path, help="Path to exceptions.json."
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=DATA_DIRECTORY,
+        help="Directory the table is written to.",
+    )
+    args = parser.parse_args()
+    licenses = json.loads(args.licenses.read_text(encoding="utf-8"))
+    exceptions = json.loads(args.exceptions.read_text(encoding="utf-8"))
+    path = compile_license_list(
+        licenses["licenseListVersion"],
+        (entry["licenseId"] for entry in licenses["licenses"]),
+        (entry["licenseExceptionId"] for entry in exceptions["exceptions"]),
+        args.output_dir,
+    )
+    print(path)
+
+
+if __name__ == "__main__":
+    main()
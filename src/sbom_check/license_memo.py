@@ -0,0 +1,270 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""License expressions parsed and validated once per distinct string."""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from license_expression import ExpressionError, ExpressionParseError
+from spdx_tools.common.spdx_licensing import spdx_licensing
+from spdx_tools.spdx.model.document import Document
+from spdx_tools.spdx.model.spdx_no_assertion import SpdxNoAssertion
+from spdx_tools.spdx.model.spdx_none import SpdxNone
+from spdx_tools.spdx.parser.jsonlikedict.license_expression_parser import (
+    LicenseExpressionParser,
+)
+from spdx_tools.spdx.validation import (
+    file_validator,
+    package_validator,
+    snippet_validator,
+)
+from spdx_tools.spdx.validation.spdx_id_validators import (
+    is_external_doc_ref_present_in_document,
+)
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationContext,
+    ValidationMessage,
+)
+
+from sbom_check import validation
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+# validators that look up validate_license_expression(s) globally
+VALIDATOR_MODULES = (
+    package_validator,
+    file_validator,
+    snippet_validator,
+    validation,
+)
+VALIDATORS = ("validate_license_expression", "validate_license_expressions")
+
+# the memo installed in each thread, and the modules already wrapped
+_ACTIVE = threading.local()
+_WRAP_LOCK = threading.Lock()
+_WRAPPED: set[str] = set()
+
+
+@dataclass(slots=True)
+class _LicenseEntry:
+    """What is known about one license expression string."""
+
+    parsed: Any = None
+    # the invalid symbols and the strict parsing error, which do not depend
+    # on the document the expression is in
+    invalid_symbols: tuple[str, ...] | None = None
+    parse_error: str | None = None
+
+
+class LicenseExpressionMemo:
+    """
+    Least recently used mapping of license expression strings to their
+    parsed expression and validation result, shared by all documents checked
+    with it. Stands in for the license expression parser of spdx-tools and
+    for its validate_license_expression(s) while installed in a thread.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, _LicenseEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the memo."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def parse(self, license_expression: Any) -> Any:
+        """Parses a license expression like LicenseExpressionParser."""
+        if not isinstance(license_expression, str):
+            return LicenseExpressionParser.parse_license_expression(
+                license_expression
+            )
+        entry = self._entry(license_expression)
+        if entry.parsed is not None:
+            self.hits += 1
+            return entry.parsed
+        self.misses += 1
+        entry.parsed = LicenseExpressionParser.parse_license_expression(
+            license_expression
+        )
+        return entry.parsed
+
+    def validate_license_expressions(
+        self,
+        license_expressions: list[Any],
+        document: Document,
+        parent_id: str,
+    ) -> list[ValidationMessage]:
+        """Validates like validate_license_expressions of spdx-tools."""
+        context = ValidationContext(
+            parent_id=parent_id,
+            element_type=SpdxElementType.LICENSE_EXPRESSION,
+            full_element=license_expressions,
+        )
+        messages = []
+        for license_expression in license_expressions:
+            messages += self.validate_license_expression(
+                license_expression, document, parent_id, context
+            )
+        return messages
+
+    def validate_license_expression(
+        self,
+        license_expression: Any,
+        document: Document,
+        parent_id: str,
+        context: ValidationContext | None = None,
+    ) -> list[ValidationMessage]:
+        """Validates like validate_license_expression of spdx-tools."""
+        if license_expression in [SpdxNoAssertion(), SpdxNone(), None]:
+            return []
+        if not context:
+            context = ValidationContext(
+                parent_id=parent_id,
+                element_type=SpdxElementType.LICENSE_EXPRESSION,
+                full_element=license_expression,
+            )
+        expression = str(license_expression)
+        entry = self._validated(expression, license_expression)
+        license_ref_ids = [
+            license_ref.license_id
+            for license_ref in document.extracted_licensing_info
+        ]
+        messages = [
+            ValidationMessage(message, context)
+            for token in entry.invalid_symbols or ()
+            for message in _invalid_symbol_messages(
+                token, expression, document, license_ref_ids
+            )
+        ]
+        if entry.parse_error:
+            messages.append(ValidationMessage(entry.parse_error, context))
+        return messages
+
+    def install(self, parser: Any) -> None:
+        """Makes a JsonLikeDictParser parse license expressions by the memo."""
+        for expression_parser in (
+            parser.package_parser.license_expression_parser,
+            parser.file_parser.license_expression_parser,
+            parser.snippet_parser.license_expression_parser,
+        ):
+            setattr(expression_parser, "parse_license_expression", self.parse)
+
+    @contextmanager
+    def installed(self) -> Iterator["LicenseExpressionMemo"]:
+        """
+        Makes validate_full_spdx_document and validate_document_indexed
+        validate license expressions through the memo in this thread until
+        the context is left. The validators of spdx-tools are wrapped once
+        per process; other threads, and this one outside the context, keep
+        validating without a memo. Workers forked inside the context
+        validate through their own copy of the memo.
+        """
+        _wrap_validators()
+        previous = getattr(_ACTIVE, "memo", None)
+        _ACTIVE.memo = self
+        try:
+            yield self
+        finally:
+            _ACTIVE.memo = previous
+
+    def _validated(
+        self, expression: str, license_expression: Any
+    ) -> _LicenseEntry:
+        entry = self._entry(expression)
+        if entry.invalid_symbols is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry.invalid_symbols = tuple(
+            spdx_licensing.validate(license_expression).invalid_symbols
+        )
+        try:
+            spdx_licensing.parse(expression, validate=True, strict=True)
+        except ExpressionParseError as error:
+            entry.parse_error = (
+                f"{error}. for license_expression: {license_expression}"
+            )
+        except ExpressionError:
+            # reported through the invalid symbols
+            pass
+        return entry
+
+    def _entry(self, expression: str) -> _LicenseEntry:
+        entry = self._entries.get(expression)
+        if entry is None:
+            entry = self._entries[expression] = _LicenseEntry()
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(expression)
+        return entry
+
+
+def _wrap_validators() -> None:
+    with _WRAP_LOCK:
+        for module in VALIDATOR_MODULES:
+            if module.__name__ in _WRAPPED:
+                continue
+            for name in VALIDATORS:
+                setattr(module, name, _dispatch(name, getattr(module, name)))
+            _WRAPPED.add(module.__name__)
+
+
+def _dispatch(name: str, validate: Callable[..., Any]) -> Callable[..., Any]:
+    """Calls a validator of the thread's installed memo, if any."""
+
+    def dispatch(*args: Any, **kwargs: Any) -> Any:
+        memo = getattr(_ACTIVE, "memo", None)
+        if memo is None:
+            return validate(*args, **kwargs)
+        return getattr(memo, name)(*args, **kwargs)
+
+    return dispatch
+
+
+def _invalid_symbol_messages(
+    token: str,
+    expression: str,
+    document: Document,
+    license_ref_ids: list[str | None],
+) -> list[str]:
+    if ":" not in token:
+        if token in license_ref_ids:
+            return []
+        return [
+            f"Unrecognized license reference: {token}. license_expression "
+            "must only use IDs from the license list or extracted licensing "
+            f"info, but is: {expression}"
+        ]
+    split_token = token.split(":")
+    if len(split_token) != 2:
+        return [
+            f"Too many colons in license reference: {token}. A license "
+            "reference must only contain a single colon to separate an "
+            "external document reference from the license reference."
+        ]
+    messages = []
+    if not split_token[1].startswith("LicenseRef-"):
+        messages.append(
+            'A license reference must start with "LicenseRef-", but is: '
+            f"{split_token[1]} in external license reference {token}."
+        )
+    if not is_external_doc_ref_present_in_document(split_token[0], document):
+        messages.append(
+            "Did not find the external document reference "
+            f'"{split_token[0]}" in the SPDX document. From the external '
+            f"license reference {token}."
+        )
+    return messages
@@ -0,0 +1,206 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Validation results of SPDX elements, reused across documents."""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Iterable, Protocol
+
+from spdx_tools.spdx.validation.validation_message import ValidationMessage
+
+from sbom_check import json_backend
+from sbom_check.serialization import (
+    message_from_dict,
+    message_to_dict,
+    package_version,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+# members that are not part of an element's own validation
+UNFINGERPRINTED_KEYS = ("SPDXID", "annotations")
+
+
+@dataclass(frozen=True, slots=True)
+class MemoEntry:
+    """Per-element messages of a package, file or snippet."""
+
+    spdx_id: str
+    messages: tuple[ValidationMessage, ...]
+    completeness: tuple[ValidationMessage, ...] = ()
+    files_analyzed: bool = True
+
+    def rebound(self, spdx_id: str) -> "MemoEntry":
+        """Returns the entry with its messages moved to another SPDX ID."""
+        if spdx_id == self.spdx_id:
+            return self
+        return MemoEntry(
+            spdx_id,
+            _rebound(self.messages, self.spdx_id, spdx_id),
+            _rebound(self.completeness, self.spdx_id, spdx_id),
+            self.files_analyzed,
+        )
+
+
+def _rebound(
+    messages: Iterable[ValidationMessage], old_id: str, new_id: str
+) -> tuple[ValidationMessage, ...]:
+    def rebind(value: str | None) -> str | None:
+        return new_id if value == old_id else value
+
+    return tuple(
+        ValidationMessage(
+            message.validation_message,
+            replace(
+                message.context,
+                spdx_id=rebind(message.context.spdx_id),
+                parent_id=rebind(message.context.parent_id),
+            ),
+        )
+        for message in messages
+    )
+
+
+def fingerprint(scope: bytes, collection: str, element: dict[str, Any]) -> str:
+    """
+    Returns the memo key of a JSON element: a digest of its collection, its
+    content without SPDX ID and annotations, and the scope, which covers the
+    document header values that element validation depends on.
+    """
+    digest = hashlib.blake2b(scope, digest_size=16)
+    digest.update(collection.encode("utf-8"))
+    digest.update(
+        json.dumps(
+            {
+                key: value
+                for key, value in element.items()
+                if key not in UNFINGERPRINTED_KEYS
+            },
+            sort_keys=True,
+        ).encode("utf-8")
+    )
+    return digest.hexdigest()
+
+
+class ElementResults(Protocol):
+    """Store of element results consulted by the streaming check."""
+
+    def get(self, key: str, spdx_id: str) -> MemoEntry | None:
+        """Returns the entry of an element with a fingerprint and SPDX ID."""
+
+    def put(self, key: str, entry: MemoEntry) -> None:
+        """Records the entry of a newly validated element."""
+
+
+class ElementMemo:
+    """
+    Least recently used mapping of element fingerprints to their validation
+    messages, shared by all documents checked with it.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, MemoEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, spdx_id: str) -> MemoEntry | None:
+        """Returns the entry stored for a key, rebound to an SPDX ID."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.rebound(spdx_id)
+
+    def put(self, key: str, entry: MemoEntry) -> None:
+        """
+        Stores an entry unless its messages mention its SPDX ID, which could
+        not be rebound for other elements.
+        """
+        if any(
+            entry.spdx_id in message.validation_message
+            for message in entry.messages + entry.completeness
+        ):
+            return
+        self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self, path: str | Path) -> None:
+        """Writes the entries to a file, for use by later runs."""
+        save_entries(path, self._entries.items())
+
+    @classmethod
+    def load(
+        cls, path: str | Path, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> "ElementMemo":
+        """
+        Reads entries saved by a run of the same sbom-check version. A
+        missing, unreadable or outdated file results in an empty memo.
+        """
+        memo = cls(max_entries)
+        memo._entries.update(load_entries(path)[-max_entries:])
+        return memo
+
+
+def save_entries(
+    path: str | Path, entries: Iterable[tuple[str, MemoEntry]]
+) -> None:
+    """Writes keyed entries to a JSON file."""
+    Path(path).write_bytes(
+        json_backend.dumps(
+            {
+                "version": package_version(),
+                "entries": [
+                    [
+                        key,
+                        entry.spdx_id,
+                        [message_to_dict(m) for m in entry.messages],
+                        [message_to_dict(m) for m in entry.completeness],
+                        entry.files_analyzed,
+                    ]
+                    for key, entry in entries
+                ],
+            }
+        )
+    )
+
+
+def load_entries(path: str | Path) -> list[tuple[str, MemoEntry]]:
+    """
+    Reads keyed entries written by save_entries with the same sbom-check
+    version, or none if the file is missing, unreadable or outdated.
+    """
+    try:
+        saved = json_backend.loads(Path(path).read_bytes())
+    except (OSError, ValueError):
+        return []
+    if saved.get("version") != package_version():
+        logger.info("Ignoring element results of another sbom-check version.")
+        return []
+    return [
+        (
+            key,
+            MemoEntry(
+                spdx_id,
+                tuple(message_from_dict(message) for message in messages),
+                tuple(message_from_dict(message) for message in completeness),
+                files_analyzed,
+            ),
+        )
+        for key, spdx_id, messages, completeness, files_analyzed in saved[
+            "entries"
+        ]
+    ]
@@ -0,0 +1,127 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Validation of one parsed SPDX document across several processes."""
+
+import logging
+import multiprocessing
+import os
+from dataclasses import replace
+from typing import Any
+
+from spdx_tools.spdx.model.document import Document
+from spdx_tools.spdx.validation.validation_message import ValidationMessage
+
+from sbom_check.validation import (
+    ELEMENT_COLLECTIONS,
+    IndexedValidation,
+    version_messages,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# (collection, start, stop) of a range of elements
+Chunk = tuple[str, int, int]
+# messages of each element in a chunk, with the context's full_element
+# replaced by True when it is the element itself
+ChunkMessages = list[list[tuple[ValidationMessage, bool]]]
+
+# the document being validated, inherited by forked workers
+_FORKED: list[IndexedValidation] = []
+
+
+def validate_document_parallel(
+    document: Document,
+    spdx_version: str | None = None,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[ValidationMessage]:
+    """
+    Validates a parsed document like validate_document_indexed, with the
+    elements split into chunks of chunk_size that are validated by a pool of
+    workers (os.cpu_count() by default). Workers are forked after the SPDX ID
+    index is built and read the document copy-on-write; only the chunk
+    bounds and the resulting messages are passed between processes. The
+    messages are in the same order as with a single process.
+    """
+    if messages := version_messages(document, spdx_version):
+        return messages
+    validation = IndexedValidation.prepare(document, spdx_version)
+    chunks = [
+        (collection, start, start + chunk_size)
+        for collection in ELEMENT_COLLECTIONS
+        for start in range(
+            0, len(getattr(document, collection)), max(chunk_size, 1)
+        )
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) < 2:
+        results = [_validate_chunk(chunk, validation) for chunk in chunks]
+    elif "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("Validating in one process, as fork is unavailable.")
+        results = [_validate_chunk(chunk, validation) for chunk in chunks]
+    else:
+        _FORKED.append(validation)
+        try:
+            with multiprocessing.get_context("fork").Pool(
+                min(workers, len(chunks))
+            ) as pool:
+                results = pool.map(_validate_forked, chunks, chunksize=1)
+        finally:
+            _FORKED.clear()
+
+    messages = validation.opening_messages()
+    for (collection, start, _), chunk_messages in zip(chunks, results):
+        elements = getattr(document, collection)
+        for offset, element_messages in enumerate(chunk_messages):
+            messages += [
+                _reattached(message, elements[start + offset], is_element)
+                for message, is_element in element_messages
+            ]
+    return messages + validation.closing_messages()
+
+
+def _validate_forked(chunk: Chunk) -> ChunkMessages:
+    return _validate_chunk(chunk, _FORKED[0])
+
+
+def _validate_chunk(
+    chunk: Chunk, validation: IndexedValidation
+) -> ChunkMessages:
+    collection, start, stop = chunk
+    elements = getattr(validation.document, collection)
+    return [
+        [_detached(message, element) for message in element_messages]
+        for element, element_messages in zip(
+            elements[start:stop],
+            validation.validate_elements(collection, start, stop),
+        )
+    ]
+
+
+def _detached(
+    message: ValidationMessage, element: Any
+) -> tuple[ValidationMessage, bool]:
+    # the parent process has the element already, so it is not sent back
+    if message.context.full_element is not element:
+        return message, False
+    return (
+        ValidationMessage(
+            message.validation_message,
+            replace(message.context, full_element=None),
+        ),
+        True,
+    )
+
+
+def _reattached(
+    message: ValidationMessage, element: Any, is_element: bool
+) -> ValidationMessage:
+    if not is_element or message.context.full_element is element:
+        return message
+    return ValidationMessage(
+        message.validation_message,
+        replace(message.context, full_element=element),
+    )
@@ -0,0 +1,17 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Normalization of the fileNames of SBOMs."""
+
+import posixpath
+
+
+def normalized_path(file_name: str) -> str | None:
+    """
+    The POSIX path of a fileName relative to the root of the tree it
+    describes, or None if it points outside of it.
+    """
+    path = posixpath.normpath(file_name.replace("\\", "/").lstrip("/"))
+    if path == ".." or path.startswith("../"):
+        return None
+    return path
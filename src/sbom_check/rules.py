@@ -0,0 +1,288 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Registry of completeness rules, evaluated in one pass per collection."""
+
+import hashlib
+import time
+from dataclasses import dataclass
+from operator import attrgetter, itemgetter
+from types import CodeType
+from typing import Any, Callable, Iterable, Iterator
+
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationContext,
+    ValidationMessage,
+)
+
+COMPLETENESS_EXCEPTION = "\n*** completeness exception ***\n"
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    """
+    A completeness requirement on elements of one type. The predicate is
+    called with the values of fields, attributes of the spdx-tools model
+    element, and returns whether the element complies. Otherwise message is
+    reported for the element. With flag, a (mask, value) pair of the flags
+    of sbom_check.columnar, the rule can also be checked on decoded JSON,
+    without the model: an element whose flags masked by mask equal value
+    breaks it. A rule without a predicate is only checked on decoded JSON,
+    for a requirement that specification validation checks on the model.
+    """
+
+    name: str
+    element_type: SpdxElementType
+    fields: tuple[str, ...]
+    predicate: Callable[..., bool] | None
+    message: str
+    flag: tuple[int, int] | None = None
+
+    @property
+    def digest(self) -> str:
+        """
+        A digest of the rule's definition, including the bytecode of its
+        predicate, which changes whenever the rule does.
+        """
+        code = getattr(self.predicate, "__code__", None)
+        return hashlib.sha256(
+            repr(
+                (
+                    self.name,
+                    self.element_type.name,
+                    self.fields,
+                    (
+                        _code_key(code)
+                        if code
+                        else getattr(self.predicate, "__qualname__", None)
+                    ),
+                    self.message,
+                    self.flag,
+                )
+            ).encode("utf-8")
+        ).hexdigest()
+
+
+def _code_key(code: CodeType) -> tuple[Any, ...]:
+    # the repr of nested code objects includes their address
+    return (
+        code.co_code,
+        code.co_names,
+        tuple(
+            _code_key(const) if isinstance(const, CodeType) else repr(const)
+            for const in code.co_consts
+        ),
+    )
+
+
+@dataclass(slots=True)
+class RuleStats:
+    """Evaluations, violations and, when profiled, run time of a rule."""
+
+    evaluations: int = 0
+    violations: int = 0
+    seconds: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledRule:
+    rule: Rule
+    predicate: Callable[..., bool]
+    select: Callable[[tuple[Any, ...]], tuple[Any, ...]]
+    stats: RuleStats
+
+
+class RuleRegistry:
+    """
+    Ordered completeness rules. The rules of an element type are compiled
+    into a single traversal of the elements, which reads every field that
+    any of them needs once per element and then evaluates each rule in
+    registration order. Per-rule statistics accumulate in stats; with
+    profile, each rule's run time is measured as well.
+    """
+
+    def __init__(
+        self, rules: Iterable[Rule] = (), profile: bool = False
+    ) -> None:
+        self.profile = profile
+        self.stats: dict[str, RuleStats] = {}
+        self._rules: list[Rule] = []
+        self._compiled: dict[
+            SpdxElementType,
+            tuple[Callable[[Any], tuple[Any, ...]], list[_CompiledRule]],
+        ] = {}
+        for rule in rules:
+            self.add(rule)
+
+    def __iter__(self) -> Iterator[Rule]:
+        return iter(self._rules)
+
+    def add(self, rule: Rule) -> None:
+        """Appends a rule; names must be unique."""
+        if any(existing.name == rule.name for existing in self._rules):
+            raise ValueError(
+                f"A rule named {rule.name} is already registered."
+            )
+        self._rules.append(rule)
+        self.stats[rule.name] = RuleStats()
+        self._compiled.pop(rule.element_type, None)
+
+    def remove(self, name: str) -> None:
+        """Removes the rule with a name."""
+        rule = next((rule for rule in self._rules if rule.name == name), None)
+        if rule is None:
+            raise KeyError(name)
+        self._rules.remove(rule)
+        del self.stats[name]
+        self._compiled.pop(rule.element_type, None)
+
+    def copy(self, profile: bool | None = None) -> "RuleRegistry":
+        """Returns a registry with the same rules and fresh statistics."""
+        return RuleRegistry(
+            self._rules, self.profile if profile is None else profile
+        )
+
+    def flag_rules(
+        self, element_type: SpdxElementType
+    ) -> list[tuple[Rule, tuple[int, int]]]:
+        """
+        The rules of an element type with their flags. Raises ValueError if
+        one of them has no flag, as it cannot be checked without the model.
+        """
+        rules = []
+        for rule in self._rules:
+            if rule.element_type != element_type:
+                continue
+            if rule.flag is None:
+                raise ValueError(
+                    f"The rule {rule.name} can only be checked on the SPDX "
+                    "model."
+                )
+            rules.append((rule, rule.flag))
+        return rules
+
+    def check(
+        self,
+        element_type: SpdxElementType,
+        elements: Iterable[Any],
+        id_field: str | None = "spdx_id",
+    ) -> list[ValidationMessage]:
+        """
+        Evaluates the rules of an element type on each element, reporting
+        violations with the element's id_field as SPDX ID.
+        """
+        read, rules = self._compile(element_type)
+        if not rules:
+            return []
+        if self.profile:
+            return self._check_profiled(element_type, elements, id_field)
+        messages = []
+        count = 0
+        for element in elements:
+            count += 1
+            values = read(element)
+            for compiled in rules:
+                if not compiled.predicate(*compiled.select(values)):
+                    compiled.stats.violations += 1
+                    messages.append(
+                        _message(
+                            compiled.rule, element, element_type, id_field
+                        )
+                    )
+        for compiled in rules:
+            compiled.stats.evaluations += count
+        return messages
+
+    def _check_profiled(
+        self,
+        element_type: SpdxElementType,
+        elements: Iterable[Any],
+        id_field: str | None,
+    ) -> list[ValidationMessage]:
+        read, rules = self._compile(element_type)
+        messages = []
+        for element in elements:
+            values = read(element)
+            for compiled in rules:
+                start = time.perf_counter()
+                complies = compiled.predicate(*compiled.select(values))
+                compiled.stats.seconds += time.perf_counter() - start
+                compiled.stats.evaluations += 1
+                if not complies:
+                    compiled.stats.violations += 1
+                    messages.append(
+                        _message(
+                            compiled.rule, element, element_type, id_field
+                        )
+                    )
+        return messages
+
+    def _compile(
+        self, element_type: SpdxElementType
+    ) -> tuple[Callable[[Any], tuple[Any, ...]], list[_CompiledRule]]:
+        if element_type in self._compiled:
+            return self._compiled[element_type]
+        # rules without a predicate are only checked on decoded JSON
+        rules = [
+            (rule, rule.predicate)
+            for rule in self._rules
+            if rule.element_type == element_type and rule.predicate is not None
+        ]
+        fields = list(
+            dict.fromkeys(field for rule, _ in rules for field in rule.fields)
+        )
+        compiled = (
+            _tuple_getter(attrgetter, fields),
+            [
+                _CompiledRule(
+                    rule,
+                    predicate,
+                    _tuple_getter(
+                        itemgetter,
+                        [fields.index(field) for field in rule.fields],
+                    ),
+                    self.stats[rule.name],
+                )
+                for rule, predicate in rules
+            ],
+        )
+        self._compiled[element_type] = compiled
+        return compiled
+
+
+def completeness_message(
+    message: str,
+    element_type: SpdxElementType | None = None,
+    spdx_id: str = "",
+) -> ValidationMessage:
+    """A ValidationMessage marked as a completeness exception."""
+    return ValidationMessage(
+        COMPLETENESS_EXCEPTION + message,
+        ValidationContext(spdx_id, None, element_type, None),
+    )
+
+
+def _message(
+    rule: Rule,
+    element: Any,
+    element_type: SpdxElementType,
+    id_field: str | None,
+) -> ValidationMessage:
+    return completeness_message(
+        rule.message,
+        element_type,
+        getattr(element, id_field) if id_field else "",
+    )
+
+
+def _tuple_getter(
+    getter: Callable[..., Callable[[Any], Any]], keys: list[Any]
+) -> Callable[[Any], tuple[Any, ...]]:
+    # attrgetter and itemgetter return a bare value for a single key
+    if len(keys) > 1:
+        return getter(*keys)
+    if keys:
+        get = getter(keys[0])
+        return lambda item: (get(item),)
+    return lambda _: ()
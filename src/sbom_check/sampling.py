@@ -0,0 +1,323 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Validation of a random sample of the packages and files of a document."""
+
+import logging
+import math
+import random
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Any, Callable
+
+from spdx_tools.spdx.model.document import Document
+from spdx_tools.spdx.parser.error import SPDXParsingError
+from spdx_tools.spdx.parser.jsonlikedict.json_like_dict_parser import (
+    JsonLikeDictParser,
+)
+from spdx_tools.spdx.validation.file_validator import (
+    validate_file_within_document,
+)
+from spdx_tools.spdx.validation.package_validator import (
+    validate_package_within_document,
+)
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationMessage,
+)
+
+from sbom_check import json_backend
+from sbom_check.checks import (
+    COMPLETENESS_RULES,
+    SPDX_VERSIONS,
+    CheckResult,
+    check_creation_info_dict,
+    check_duplicates_dict,
+    check_primary_package_dict,
+    check_verification_codes_dict,
+    no_files_message,
+    no_packages_message,
+)
+from sbom_check.compact import external_document_refs
+from sbom_check.rules import RuleRegistry
+from sbom_check.streaming import (
+    FILES,
+    PACKAGES,
+    extracted_licensing_infos,
+)
+from sbom_check.validation import document_skeleton
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_MARGIN = 0.01
+
+# pseudo-rules counting the sampled elements that fail spec validation
+PACKAGE_SPECIFICATION = "package-specification"
+FILE_SPECIFICATION = "file-specification"
+
+
+@dataclass(frozen=True, slots=True)
+class SamplingOptions:
+    """
+    Which packages and files check_sbom_sample validates. With rate, that
+    share of each collection is sampled. Otherwise the sample is just large
+    enough for failure rate estimates within margin of the true rate at the
+    confidence level. The same seed selects the same elements. ValueError
+    is raised for a rate outside (0, 1] or a confidence level or margin
+    outside (0, 1).
+    """
+
+    rate: float | None = None
+    confidence: float = DEFAULT_CONFIDENCE
+    margin: float = DEFAULT_MARGIN
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.rate is not None and not 0 < self.rate <= 1:
+            raise ValueError(f"The sample rate {self.rate} is not in (0, 1].")
+        if not 0 < self.confidence < 1:
+            raise ValueError(
+                f"The confidence level {self.confidence} is not in (0, 1)."
+            )
+        if not 0 < self.margin < 1:
+            raise ValueError(f"The margin {self.margin} is not in (0, 1).")
+
+    def sample_size(self, population: int) -> int:
+        """Number of elements sampled from a collection of population."""
+        if self.rate is not None:
+            return min(population, math.ceil(self.rate * population))
+        # worst case p = 0.5, with the finite population correction
+        unbounded = (_z_score(self.confidence) / self.margin) ** 2 / 4
+        size = unbounded / (1 + (unbounded - 1) / max(population, 1))
+        return min(population, math.ceil(size))
+
+    def sample(self, population: int) -> list[int]:
+        """Ascending indexes of the sampled elements."""
+        return sorted(
+            random.Random(self.seed).sample(
+                range(population), self.sample_size(population)
+            )
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class FailureEstimate:
+    """
+    Estimated share of a collection's elements that fail a rule, with the
+    Wilson score interval at the sampling confidence level. The interval is
+    exact when the whole collection was sampled.
+    """
+
+    rule: str
+    population: int
+    sampled: int
+    failures: int
+    low: float
+    high: float
+
+    @property
+    def rate(self) -> float:
+        """Share of the sampled elements that failed the rule."""
+        return self.failures / self.sampled if self.sampled else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class SampledCheckResult(CheckResult):
+    """CheckResult of a sample, with failure estimates per rule."""
+
+    estimates: list[FailureEstimate]
+
+
+def check_sbom_sample(
+    spdx_json: json_backend.JsonInput,
+    sampling: SamplingOptions | None = None,
+    rules: RuleRegistry | None = None,
+) -> SampledCheckResult:
+    """
+    Runs the document-level completeness checks on SPDX JSON, including
+    duplicate detection over all elements, then parses and validates only a
+    reproducible random sample of its packages and files, against the
+    specification and the completeness rules. Only the
+    sampled elements are built into the spdx-tools model, and references
+    between elements are not validated. The result estimates the failure
+    rate of each rule of rules, COMPLETENESS_RULES by default, over the
+    whole document.
+    """
+    sampling = sampling or SamplingOptions()
+    rules = rules or COMPLETENESS_RULES.copy()
+    spdx_dict = json_backend.loads(spdx_json)
+    if not isinstance(spdx_dict, dict):
+        return SampledCheckResult(
+            [], ["The document is not a JSON object."], []
+        )
+    completeness = check_creation_info_dict(spdx_dict, rules)
+    if not spdx_dict.get(PACKAGES):
+        completeness.append(no_packages_message())
+        return SampledCheckResult(completeness, [], [])
+    if primary_package_msg := check_primary_package_dict(spdx_dict):
+        completeness.append(primary_package_msg)
+
+    sample = _Sample(spdx_dict, sampling, rules)
+    sample.validate(spdx_dict[PACKAGES], PACKAGES, SpdxElementType.PACKAGE)
+    # verification codes and duplicates are checked in the whole document,
+    # as they span elements
+    sample.completeness += check_verification_codes_dict(spdx_dict)
+    sample.completeness += check_duplicates_dict(spdx_dict)
+    if spdx_dict.get(FILES):
+        sample.validate(spdx_dict[FILES], FILES, SpdxElementType.FILE)
+    else:
+        sample.completeness.append(no_files_message())
+    logger.info("Completed validation of the sampled elements.")
+    if sample.errors:
+        return SampledCheckResult([], sample.errors, [])
+    return SampledCheckResult(
+        sample.messages + completeness + sample.completeness,
+        [],
+        sample.estimates,
+    )
+
+
+class _Sample:
+    """Validation state of the sampled elements of one document."""
+
+    def __init__(
+        self,
+        spdx_dict: dict[str, Any],
+        sampling: SamplingOptions,
+        rules: RuleRegistry,
+    ) -> None:
+        self.sampling = sampling
+        self.skeleton = _skeleton(
+            spdx_dict, spdx_dict.get("spdxVersion", SPDX_VERSIONS[0])
+        )
+        self.rules = rules
+        self.messages: list[ValidationMessage] = []
+        self.completeness: list[ValidationMessage] = []
+        self.errors: list[str] = []
+        self.estimates: list[FailureEstimate] = []
+
+    def validate(
+        self,
+        elements: list[Any],
+        collection: str,
+        element_type: SpdxElementType,
+    ) -> None:
+        """
+        Validates the sampled elements of a collection and estimates the
+        failure rates of its rules.
+        """
+        _, validate, specification = _SAMPLED[collection]
+        parsed = self.parse(elements, collection)
+        failures = 0
+        for element in parsed:
+            messages = validate(
+                element,
+                self.skeleton.creation_info.spdx_version,
+                self.skeleton,
+            )
+            failures += bool(messages)
+            self.messages += messages
+        # the registry's statistics may add up across documents
+        before = {
+            name: (stats.evaluations, stats.violations)
+            for name, stats in self.rules.stats.items()
+        }
+        self.completeness += self.rules.check(element_type, parsed)
+
+        self._estimate(specification, len(elements), len(parsed), failures)
+        for rule in self.rules:
+            stats = self.rules.stats[rule.name]
+            if rule.element_type == element_type:
+                self._estimate(
+                    rule.name,
+                    len(elements),
+                    stats.evaluations - before[rule.name][0],
+                    stats.violations - before[rule.name][1],
+                )
+
+    def parse(self, elements: list[Any], collection: str) -> list[Any]:
+        """Parses the sampled elements of a collection into the model."""
+        parse = _SAMPLED[collection][0]
+        parser = JsonLikeDictParser()  # type: ignore
+        parsed = []
+        for index in self.sampling.sample(len(elements)):
+            try:
+                parsed.append(parse(parser, elements[index]))
+            except SPDXParsingError as error:
+                self.errors += error.get_messages()  # type: ignore
+            except (TypeError, ValueError) as error:
+                self.errors.append(error.args[0])
+        return parsed
+
+    def _estimate(
+        self, rule: str, population: int, sampled: int, failures: int
+    ) -> None:
+        self.estimates.append(
+            FailureEstimate(
+                rule,
+                population,
+                sampled,
+                failures,
+                *_interval(
+                    failures, sampled, population, self.sampling.confidence
+                ),
+            )
+        )
+
+
+_SAMPLED: dict[
+    str,
+    tuple[
+        Callable[[Any, Any], Any],
+        Callable[[Any, str, Document], list[ValidationMessage]],
+        str,
+    ],
+] = {
+    PACKAGES: (
+        lambda parser, package: parser.package_parser.parse_package(package),
+        validate_package_within_document,
+        PACKAGE_SPECIFICATION,
+    ),
+    FILES: (
+        lambda parser, file: parser.file_parser.parse_file(file),
+        validate_file_within_document,
+        FILE_SPECIFICATION,
+    ),
+}
+
+
+def _skeleton(spdx_dict: dict[str, Any], spdx_version: str) -> Document:
+    spdx_id = spdx_dict.get("SPDXID")
+    return document_skeleton(
+        spdx_version,
+        spdx_id if isinstance(spdx_id, str) else None,
+        external_document_refs(spdx_dict),
+        extracted_licensing_infos(
+            spdx_dict.get("hasExtractedLicensingInfos") or []
+        ),
+    )
+
+
+def _z_score(confidence: float) -> float:
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def _interval(
+    failures: int, sampled: int, population: int, confidence: float
+) -> tuple[float, float]:
+    if not sampled:
+        return 0.0, 1.0
+    rate = failures / sampled
+    if sampled >= population:
+        return rate, rate
+    z_score = _z_score(confidence)
+    z_squared = z_score**2
+    denominator = 1 + z_squared / sampled
+    center = (rate + z_squared / (2 * sampled)) / denominator
+    half_width = (
+        z_score
+        * math.sqrt(rate * (1 - rate) / sampled + z_squared / (4 * sampled**2))
+        / denominator
+    )
+    return max(0.0, center - half_width), min(1.0, center + half_width)
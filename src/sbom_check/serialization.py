@@ -0,0 +1,71 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""JSON representation of validation messages stored between runs."""
+
+import hashlib
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationContext,
+    ValidationMessage,
+)
+
+
+@lru_cache(maxsize=None)
+def package_version() -> str:
+    """
+    The installed sbom-check version and a digest of the sources and data of
+    the sbom_check package, which stored results are only reused with. The
+    digest tells code changes apart in a source checkout, where the version
+    is unknown or unchanged.
+    """
+    try:
+        installed = version("sbom-check")
+    except PackageNotFoundError:
+        installed = "unknown"
+    return f"{installed}+{_source_digest()}"
+
+
+def _source_digest() -> str:
+    digest = hashlib.sha256()
+    package = Path(__file__).parent
+    for path in sorted(package.rglob("*")):
+        relative = path.relative_to(package)
+        if "__pycache__" in relative.parts or not path.is_file():
+            continue
+        digest.update(relative.as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def message_to_dict(message: ValidationMessage) -> dict[str, Any]:
+    """A JSON-compatible dict of a message, without its full element."""
+    context = message.context
+    return {
+        "message": message.validation_message,
+        "spdx_id": context.spdx_id,
+        "parent_id": context.parent_id,
+        "element_type": (
+            context.element_type.name if context.element_type else None
+        ),
+    }
+
+
+def message_from_dict(message: dict[str, Any]) -> ValidationMessage:
+    """The message of a dict returned by message_to_dict."""
+    element_type = message["element_type"]
+    return ValidationMessage(
+        message["message"],
+        ValidationContext(
+            spdx_id=message["spdx_id"],
+            parent_id=message["parent_id"],
+            element_type=(
+                SpdxElementType[element_type] if element_type else None
+            ),
+        ),
+    )
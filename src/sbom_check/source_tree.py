@@ -0,0 +1,356 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Verification of the files of an SBOM against a source tree."""
+
+import fnmatch
+import hashlib
+import logging
+import mmap
+import os
+import re
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Collection, Iterable, Iterator
+
+from spdx_tools.spdx.parser.jsonlikedict.dict_parsing_functions import (
+    json_str_to_enum_name,
+)
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationMessage,
+)
+
+from sbom_check.hash_cache import FileHashCache
+from sbom_check.paths import normalized_path
+from sbom_check.rules import completeness_message
+from sbom_check.streaming import FILES, Readable, iter_spdx_json
+
+logger = logging.getLogger(__name__)
+
+# bytes hashed at a time by every algorithm of a file
+HASH_CHUNK_SIZE = 1 << 20
+# files queued per worker, which bounds memory on trees of millions of files
+QUEUED_PER_WORKER = 64
+
+# constructors of the SPDX checksum algorithms that hashlib provides
+ALGORITHMS: dict[str, Callable[[], Any]] = {
+    "SHA1": hashlib.sha1,
+    "SHA224": hashlib.sha224,
+    "SHA256": hashlib.sha256,
+    "SHA384": hashlib.sha384,
+    "SHA512": hashlib.sha512,
+    "SHA3_256": hashlib.sha3_256,
+    "SHA3_384": hashlib.sha3_384,
+    "SHA3_512": hashlib.sha3_512,
+    "BLAKE2B_256": lambda: hashlib.blake2b(digest_size=32),
+    "BLAKE2B_384": lambda: hashlib.blake2b(digest_size=48),
+    "BLAKE2B_512": hashlib.blake2b,
+    "MD5": hashlib.md5,
+}
+
+
+# matches the relative POSIX paths that an exclusion pattern matches
+Matcher = Callable[[str], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class TreeCoverage:
+    """
+    How the files of a source tree and of an SBOM cover each other: the
+    paths of the tree that the SBOM does not list, sorted, and the paths the
+    SBOM lists that are not in the tree, in document order, with the SPDX
+    IDs of their files.
+    """
+
+    tree_files: int
+    listed_files: int
+    unlisted: list[str]
+    extra: dict[str, str]
+
+    def messages(self) -> list[ValidationMessage]:
+        """
+        Reports the unlisted files. Extra files are missing from the tree,
+        which verify_source_tree reports for files with checksums.
+        """
+        return [
+            completeness_message(
+                f"The source tree file {path} is not listed in the document.",
+                SpdxElementType.DOCUMENT,
+            )
+            for path in self.unlisted
+        ]
+
+
+@dataclass(frozen=True, slots=True)
+class _ListedFile:
+    """A file of an SBOM, with the checksums that can be verified."""
+
+    spdx_id: str
+    file_name: str
+    checksums: dict[str, str]
+
+
+def verify_source_tree(
+    stream: Readable,
+    root: Path,
+    workers: int = 0,
+    cache: FileHashCache | None = None,
+) -> list[ValidationMessage]:
+    """
+    Verifies the files of an SPDX JSON document, read incrementally, against
+    the source tree at root. Each file with a checksum of an algorithm in
+    ALGORITHMS is hashed by all of them in a single read of its memory map,
+    in a pool of workers threads (os.cpu_count() by default). Files that are
+    missing, unreadable or outside root, and checksums that do not match,
+    are reported in document order. Only a bounded number of files is held
+    at a time. With a cache, files whose digests it holds are not read.
+    """
+    return verify_files(
+        (value for key, value in iter_spdx_json(stream) if key == FILES),
+        root,
+        workers,
+        cache,
+    )
+
+
+def verify_files(
+    files: Iterable[Any],
+    root: Path,
+    workers: int = 0,
+    cache: FileHashCache | None = None,
+) -> list[ValidationMessage]:
+    """verify_source_tree of files as decoded from JSON."""
+    workers = workers or os.cpu_count() or 1
+    messages = []
+    pending: deque[tuple[_ListedFile, Future[list[str]]]] = deque()
+    with ThreadPoolExecutor(workers) as executor:
+        for file in _listed_files(files):
+            pending.append((file, executor.submit(_verify, root, file, cache)))
+            if len(pending) >= workers * QUEUED_PER_WORKER:
+                messages += _collect(*pending.popleft())
+        while pending:
+            messages += _collect(*pending.popleft())
+    logger.info("Completed source tree verification.")
+    return messages
+
+
+def check_tree_coverage(
+    stream: Readable,
+    root: Path,
+    excludes: Iterable[str] = (),
+    workers: int = 0,
+) -> TreeCoverage:
+    """
+    Compares the files of an SPDX JSON document, read incrementally, with
+    the files found under root by walk_tree. The normalized paths of the
+    fileNames are held in a hash set, against which each file of the tree
+    is looked up once. Paths matching any of the fnmatch excludes, or under
+    a directory that does, are left out on both sides.
+    """
+    matcher = compile_excludes(excludes)
+    listed: dict[str, str] = {}
+    for key, value in iter_spdx_json(stream):
+        if (
+            key == FILES
+            and isinstance(value, dict)
+            and isinstance(value.get("fileName"), str)
+            and (path := normalized_path(value["fileName"])) is not None
+            and not _excluded(path, matcher)
+        ):
+            listed.setdefault(path, value.get("SPDXID") or "")
+    tree_files = 0
+    unlisted = []
+    found = set()
+    for path in walk_tree(root, matcher, workers):
+        tree_files += 1
+        if path in listed:
+            found.add(path)
+        else:
+            unlisted.append(path)
+    logger.info("Completed source tree coverage check.")
+    return TreeCoverage(
+        tree_files,
+        len(listed),
+        sorted(unlisted),
+        {
+            path: spdx_id
+            for path, spdx_id in listed.items()
+            if path not in found
+        },
+    )
+
+
+def compile_excludes(patterns: Iterable[str]) -> Matcher | None:
+    """
+    A single regular expression matching any of the fnmatch patterns, or
+    None without any, so that a path is matched once against all of them.
+    """
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile(
+        "|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns)
+    ).match
+
+
+def walk_tree(
+    root: Path, matcher: Matcher | None = None, workers: int = 0
+) -> Iterator[str]:
+    """
+    The relative POSIX paths of the files under root, in no particular
+    order. Each directory is listed by one os.scandir call, in a pool of
+    workers threads (os.cpu_count() by default) that lists directories as
+    they are found. Entries whose path the matcher matches are skipped,
+    with their contents. Symbolic links are not followed.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(workers) as executor:
+        pending = {executor.submit(_scan, root, "", matcher)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, directories = future.result()
+                yield from files
+                pending.update(
+                    executor.submit(_scan, root, directory, matcher)
+                    for directory in directories
+                )
+
+
+def hash_file(
+    path: Path,
+    algorithms: Collection[str],
+    cache: FileHashCache | None = None,
+) -> dict[str, str]:
+    """
+    Hex digests of a file by each of algorithms, in a single read, or from
+    the cache while the file is unchanged.
+    """
+    with open(path, "rb") as file:
+        stat = os.fstat(file.fileno())
+        if (
+            cache is not None
+            and (cached := cache.get(stat, algorithms)) is not None
+        ):
+            return cached
+        digests = _hash(file, stat.st_size, algorithms)
+    if cache is not None:
+        cache.put(stat, digests)
+    return digests
+
+
+def _hash(file: Any, size: int, algorithms: Iterable[str]) -> dict[str, str]:
+    hashes = {algorithm: ALGORITHMS[algorithm]() for algorithm in algorithms}
+    if size:
+        with mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped, memoryview(mapped) as content:
+            for start in range(0, len(content), HASH_CHUNK_SIZE):
+                end = start + HASH_CHUNK_SIZE
+                with content[start:end] as chunk:
+                    for hash_object in hashes.values():
+                        hash_object.update(chunk)
+    return {
+        algorithm: hash_object.hexdigest()
+        for algorithm, hash_object in hashes.items()
+    }
+
+
+def _scan(
+    root: Path, directory: str, matcher: Matcher | None
+) -> tuple[list[str], list[str]]:
+    files = []
+    directories = []
+    try:
+        with os.scandir(root / directory) as entries:
+            for entry in entries:
+                path = f"{directory}/{entry.name}" if directory else entry.name
+                if matcher is not None and matcher(path):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(path)
+                else:
+                    files.append(path)
+    except OSError as error:
+        logger.warning(
+            "Could not list %s: %s.", root / directory, error.strerror
+        )
+    return files, directories
+
+
+def _excluded(path: str, matcher: Matcher | None) -> bool:
+    """Whether the matcher matches a path or any of its directories."""
+    if matcher is None:
+        return False
+    end = len(path)
+    while end > 0:
+        if matcher(path[:end]):
+            return True
+        end = path.rfind("/", 0, end)
+    return False
+
+
+def _listed_files(files: Iterable[Any]) -> Iterable[_ListedFile]:
+    for file in files:
+        if not isinstance(file, dict) or not isinstance(
+            file.get("fileName"), str
+        ):
+            continue
+        if checksums := _checksums(file):
+            yield _ListedFile(
+                file.get("SPDXID") or "", file["fileName"], checksums
+            )
+
+
+def _checksums(file: dict[str, Any]) -> dict[str, str]:
+    """The checksums of a file by algorithms in ALGORITHMS."""
+    checksums = {}
+    for checksum in file.get("checksums") or []:
+        if not isinstance(checksum, dict):
+            continue
+        algorithm = json_str_to_enum_name(str(checksum.get("algorithm")))
+        value = checksum.get("checksumValue")
+        if algorithm in ALGORITHMS and isinstance(value, str):
+            checksums[algorithm] = value.lower()
+    return checksums
+
+
+def _verify(
+    root: Path, file: _ListedFile, cache: FileHashCache | None
+) -> list[str]:
+    path = normalized_path(file.file_name)
+    if path is None:
+        return ["This file's name points outside the source tree."]
+    try:
+        digests = hash_file(root / path, file.checksums, cache)
+    except FileNotFoundError:
+        return ["This file is not in the source tree."]
+    except OSError as error:
+        return [
+            "This file could not be read from the source tree: "
+            f"{error.strerror}."
+        ]
+    return [
+        f"This file's {algorithm} checksum does not match the source tree, "
+        f"where it is {digests[algorithm]}."
+        for algorithm, value in file.checksums.items()
+        if digests[algorithm] != value
+    ]
+
+
+def _collect(
+    file: _ListedFile, future: Future[list[str]]
+) -> list[ValidationMessage]:
+    return [_message(file, message) for message in future.result()]
+
+
+def _message(file: _ListedFile, message: str) -> ValidationMessage:
+    return completeness_message(message, SpdxElementType.FILE, file.spdx_id)
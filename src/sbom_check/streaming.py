@@ -0,0 +1,818 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Streaming SBOM check for SPDX JSON documents too large to load whole."""
+
+import codecs
+import json
+import logging
+import re
+from dataclasses import replace
+from typing import Any, Callable, Iterator, Protocol
+
+from spdx_tools.common.typing.constructor_type_errors import (
+    ConstructorTypeErrors,
+)
+from spdx_tools.spdx.model.annotation import Annotation
+from spdx_tools.spdx.model.document import Document
+from spdx_tools.spdx.model.relationship import Relationship, RelationshipType
+from spdx_tools.spdx.parser.error import SPDXParsingError
+from spdx_tools.spdx.parser.jsonlikedict.annotation_parser import (
+    AnnotationParser,
+)
+from spdx_tools.spdx.parser.jsonlikedict.creation_info_parser import (
+    CreationInfoParser,
+)
+from spdx_tools.spdx.parser.jsonlikedict.dict_parsing_functions import (
+    parse_list_of_elements,
+)
+from spdx_tools.spdx.parser.jsonlikedict.extracted_licensing_info_parser import (  # noqa: E501 pylint: disable=line-too-long
+    ExtractedLicensingInfoParser,
+)
+from spdx_tools.spdx.parser.jsonlikedict.file_parser import FileParser
+from spdx_tools.spdx.parser.jsonlikedict.package_parser import PackageParser
+from spdx_tools.spdx.parser.jsonlikedict.relationship_parser import (
+    RelationshipParser,
+)
+from spdx_tools.spdx.parser.jsonlikedict.snippet_parser import SnippetParser
+from spdx_tools.spdx.validation.creation_info_validator import (
+    validate_creation_info,
+)
+from spdx_tools.spdx.validation.extracted_licensing_info_validator import (
+    validate_extracted_licensing_infos,
+)
+from spdx_tools.spdx.validation.file_validator import (
+    validate_file_within_document,
+)
+from spdx_tools.spdx.validation.license_expression_validator import (
+    validate_license_expression,
+    validate_license_expressions,
+)
+from spdx_tools.spdx.validation.package_validator import (
+    validate_package_within_document,
+)
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationContext,
+    ValidationMessage,
+)
+
+from sbom_check.checks import (
+    COMPLETENESS_RULES,
+    SPDX_VERSIONS,
+    CheckResult,
+    _check_creation_info,
+    _check_files,
+    _check_packages,
+    _create_custom_validation_message,
+    _describes_message,
+    _package_code_dict,
+    no_files_message,
+    no_packages_message,
+)
+from sbom_check.duplicates import (
+    digest_pairs,
+    duplicate_messages,
+    file_identity_dict,
+    package_identity_dict,
+)
+from sbom_check.memo import ElementResults, MemoEntry, fingerprint
+from sbom_check.rules import RuleRegistry
+from sbom_check.validation import (
+    SpdxIdIndex,
+    detach,
+    document_messages,
+    document_skeleton,
+    files_analyzed_message,
+    missing_snippet_file_message,
+    validate_annotation_element,
+    validate_relationship_element,
+    validate_snippet_element,
+)
+from sbom_check.verification_code import (
+    CONTAINS,
+    FileSha1s,
+    PackageCode,
+    containment_index,
+    verification_code_messages,
+)
+
+logger = logging.getLogger(__name__)
+
+PACKAGES = "packages"
+FILES = "files"
+SNIPPETS = "snippets"
+RELATIONSHIPS = "relationships"
+STREAMED_COLLECTIONS = (PACKAGES, FILES, SNIPPETS, RELATIONSHIPS)
+
+# header keys that license expression validation depends on, with the
+# messages reported while they are unknown
+_LATE_HEADER_MESSAGES = {
+    "hasExtractedLicensingInfos": "Unrecognized license reference",
+    "externalDocumentRefs": "Did not find the external document reference",
+}
+
+CHUNK_SIZE = 1 << 16
+
+_NON_WHITESPACE = re.compile(r"\S")
+
+_parse_extracted_licensing_info = (
+    ExtractedLicensingInfoParser.parse_extracted_licensing_info
+)
+
+
+def extracted_licensing_infos(values: list[Any]) -> list[Any]:
+    """Parses the extracted licenses that parse, skipping the others."""
+    extracted_licensing_info = []
+    for extracted in values:
+        try:
+            extracted_licensing_info.append(
+                _parse_extracted_licensing_info(extracted)
+            )
+        except (SPDXParsingError, TypeError, ValueError):
+            continue
+    return extracted_licensing_info
+
+
+class Readable(Protocol):  # pylint: disable=too-few-public-methods
+    """A text or binary file object, or any other object with read(size)."""
+
+    def read(self, size: int, /) -> Any:
+        """Returns at most size characters or bytes; empty at the end."""
+
+
+class _JsonTokens:
+    """Incremental JSON reader that decodes one value at a time."""
+
+    def __init__(self, stream: Readable, chunk_size: int) -> None:
+        self._read: Callable[[int], Any] = stream.read
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int) -> None:
+        chunk = self._read(size)
+        if isinstance(chunk, str):
+            text = chunk
+        else:
+            text = self._decoder.decode(chunk, final=not chunk)
+        self._eof = not chunk
+        start = self._pos
+        self._buffer = self._buffer[start:] + text
+        self._pos = 0
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character ("" at EOF)."""
+        while True:
+            if match := _NON_WHITESPACE.search(self._buffer, self._pos):
+                self._pos = match.start()
+                return self._buffer[self._pos]
+            self._pos = len(self._buffer)
+            if self._eof:
+                return ""
+            self._fill(self._chunk_size)
+
+    def expect(self, characters: str) -> str:
+        """Consumes and returns the next character if it is expected."""
+        character = self.peek()
+        if not character or character not in characters:
+            raise json.JSONDecodeError(
+                f"Expecting one of {characters!r}", self._buffer, self._pos
+            )
+        self._pos += 1
+        return character
+
+    def value(self) -> Any:
+        """Decodes the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                # a value running up to the end of the buffer may continue
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            # grow geometrically so large elements are decoded in O(n)
+            self._fill(max(self._chunk_size, len(self._buffer) - self._pos))
+
+
+def iter_spdx_json(
+    stream: Readable, chunk_size: int = CHUNK_SIZE
+) -> Iterator[tuple[str, Any]]:
+    """
+    Yields the top-level members of an SPDX JSON document as (key, value)
+    pairs. Members listed in STREAMED_COLLECTIONS are yielded once per array
+    element, so only one element is held in memory at a time.
+    """
+    tokens = _JsonTokens(stream, chunk_size)
+    tokens.expect("{")
+    if tokens.peek() == "}":
+        tokens.expect("}")
+    else:
+        while True:
+            key = tokens.value()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expecting property name", "", 0)
+            tokens.expect(":")
+            if key in STREAMED_COLLECTIONS and tokens.peek() == "[":
+                yield from ((key, element) for element in _iter_array(tokens))
+            else:
+                yield key, tokens.value()
+            if tokens.expect(",}") == "}":
+                break
+    if tokens.peek():
+        raise json.JSONDecodeError("Extra data", "", 0)
+
+
+def _iter_array(tokens: _JsonTokens) -> Iterator[Any]:
+    tokens.expect("[")
+    if tokens.peek() == "]":
+        tokens.expect("]")
+        return
+    while True:
+        yield tokens.value()
+        if tokens.expect(",]") == "]":
+            return
+
+
+def check_sbom_stream(
+    stream: Readable,
+    chunk_size: int = CHUNK_SIZE,
+    memo: ElementResults | None = None,
+    rules: RuleRegistry | None = None,
+) -> CheckResult:
+    """
+    Validates an SPDX JSON document read incrementally from a text or binary
+    file object (or a memory map), with the same checks as check_sbom.
+
+    Packages, files, snippets and relationships are parsed and validated one
+    at a time, so peak memory is bounded by the largest element plus the
+    SPDX ID indexes. Elements are validated against the document header seen
+    before them; this matches the key order written by spdx-tools and most
+    generators.
+
+    With a memo, packages, files and snippets identical to ones checked
+    before (up to their SPDX ID) are not parsed or validated again. Checks
+    that depend on the rest of the document are always run. Completeness is
+    checked against rules as in check_completeness; the memo only reuses
+    results of the same rule names.
+    """
+    check = _StreamingCheck(memo, rules)
+    for key, value in iter_spdx_json(stream, chunk_size):
+        check.feed(key, value)
+    return check.result()
+
+
+class _StreamingCheck:
+    """Accumulates check results while a document is streamed."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        memo: ElementResults | None = None,
+        rules: RuleRegistry | None = None,
+    ) -> None:
+        self._memo = memo
+        self._rules = rules or COMPLETENESS_RULES.copy()
+        self._memo_scope = b""
+        self._header: dict[str, Any] = {}
+        self._skeleton: Document | None = None
+        self._spdx_version = ""
+        self._index = SpdxIdIndex()
+        self._errors: list[str] = []
+
+        self._creation_info_parser = CreationInfoParser()  # type: ignore
+        self._package_parser = PackageParser()  # type: ignore
+        self._file_parser = FileParser()  # type: ignore
+        self._snippet_parser = SnippetParser()  # type: ignore
+        self._relationship_parser = RelationshipParser()  # type: ignore
+        self._annotation_parser = AnnotationParser()  # type: ignore
+
+        # spec and completeness messages by collection, in document order
+        self._messages: dict[str, list[ValidationMessage]] = {
+            collection: [] for collection in STREAMED_COLLECTIONS
+        }
+        self._completeness: dict[str, list[ValidationMessage]] = {
+            PACKAGES: [],
+            FILES: [],
+        }
+        # SPDX IDs and packed digests that duplicates are detected by
+        self._digests: dict[str, tuple[list[str], bytearray]] = {
+            PACKAGES: ([], bytearray()),
+            FILES: ([], bytearray()),
+        }
+        self._snippet_ids: list[str] = []
+        self._license_contexts: dict[int, tuple[ValidationContext, str]] = {}
+        self._annotations: list[Annotation] = []
+        self._snippet_files: list[tuple[str, str]] = []
+        self._pending_relationships: list[Relationship] = []
+
+        self._first_package_id: str | None = None
+        self._has_files = False
+        self._has_snippets = False
+        self._unanalyzed_packages: list[str] = []
+        self._describes: list[Relationship] = []
+        self._described_by: list[Relationship] = []
+        self._contains: dict[tuple[Any, Any], None] = {}
+        self._package_files: list[tuple[str, str]] = []
+        self._package_codes: list[PackageCode] = []
+        self._file_sha1s = FileSha1s()
+
+    def feed(self, key: str, value: Any) -> None:
+        """Processes one top-level member or collection element."""
+        if key not in STREAMED_COLLECTIONS or not isinstance(value, dict):
+            self._header[key] = value
+            return
+        if self._skeleton is None:
+            self._skeleton = self._build_skeleton()
+        if key == PACKAGES:
+            self._feed_package(value)
+        elif key == FILES:
+            self._feed_file(value)
+        elif key == SNIPPETS:
+            self._feed_snippet(value)
+        else:
+            self._feed_relationship(value)
+
+    def _build_skeleton(self) -> Document:
+        self._spdx_version = self._header.get("spdxVersion", SPDX_VERSIONS[0])
+        # header parsing errors are reported by _finish_header
+        try:
+            external_document_refs = (
+                self._creation_info_parser.parse_external_document_refs(
+                    self._header.get("externalDocumentRefs") or []
+                )
+            )
+        except (SPDXParsingError, TypeError, ValueError):
+            external_document_refs = []
+        extracted_licensing_info = extracted_licensing_infos(
+            self._header.get("hasExtractedLicensingInfos") or []
+        )
+        spdx_id = self._header.get("SPDXID")
+        self._memo_scope = json.dumps(
+            [
+                self._header.get(key)
+                for key in ("spdxVersion", "SPDXID", *_LATE_HEADER_MESSAGES)
+            ]
+            + [rule.name for rule in self._rules],
+            sort_keys=True,
+        ).encode("utf-8")
+        if isinstance(spdx_id, str):
+            self._index.document_id = spdx_id
+        return document_skeleton(
+            self._spdx_version,
+            spdx_id if isinstance(spdx_id, str) else None,
+            [ref for ref in external_document_refs if ref],
+            extracted_licensing_info,
+        )
+
+    def _parse(self, method: Callable[[Any], Any], element: Any) -> Any:
+        try:
+            return method(element)
+        except SPDXParsingError as error:
+            self._errors += error.get_messages()  # type: ignore
+        except (TypeError, ValueError) as error:
+            self._errors.append(error.args[0])
+        return None
+
+    def _validated(
+        self, collection: str, messages: list[ValidationMessage]
+    ) -> None:
+        late_header = {
+            message
+            for key, message in _LATE_HEADER_MESSAGES.items()
+            if key not in self._header
+        }
+        deferred = {
+            id(message.context)
+            for message in messages
+            if message.validation_message.startswith(tuple(late_header))
+        }
+        for message in messages:
+            context = message.context
+            if id(context) in deferred:
+                # revalidated once the whole header is known
+                self._license_contexts.setdefault(
+                    id(context), (context, collection)
+                )
+                continue
+            self._messages[collection].append(detach(message))
+
+    def _feed_annotations(self, element: dict[str, Any]) -> None:
+        self._annotation_parser.parse_annotations_from_object(
+            self._annotations, [element]
+        )
+
+    def _recall(
+        self, collection: str, element: dict[str, Any]
+    ) -> tuple[str | None, MemoEntry | None]:
+        spdx_id = element.get("SPDXID")
+        if self._memo is None or not isinstance(spdx_id, str):
+            return None, None
+        key = fingerprint(self._memo_scope, collection, element)
+        return key, self._memo.get(key, spdx_id)
+
+    def _remember(self, key: str | None, entry: MemoEntry) -> MemoEntry:
+        # messages that depend on header values seen later are not reused
+        if (
+            self._memo is not None
+            and key is not None
+            and not any(
+                message.validation_message.startswith(
+                    tuple(_LATE_HEADER_MESSAGES.values())
+                )
+                for message in entry.messages
+            )
+        ):
+            self._memo.put(
+                key,
+                replace(entry, messages=tuple(map(detach, entry.messages))),
+            )
+        return entry
+
+    def _feed_package(self, element: dict[str, Any]) -> None:
+        key, entry = self._recall(PACKAGES, element)
+        if entry is None:
+            package = self._parse(self._package_parser.parse_package, element)
+            if package is None:
+                self._feed_annotations(element)
+                return
+            assert self._skeleton is not None
+            entry = self._remember(
+                key,
+                MemoEntry(
+                    package.spdx_id,
+                    tuple(
+                        validate_package_within_document(
+                            package, self._spdx_version, self._skeleton
+                        )
+                    ),
+                    tuple(_check_packages([package], self._rules)),
+                    package.files_analyzed,
+                ),
+            )
+        self._feed_annotations(element)
+        self._index.add(entry.spdx_id, SpdxElementType.PACKAGE)
+        self._add_digest(
+            PACKAGES, entry.spdx_id, package_identity_dict(element)
+        )
+        if self._first_package_id is None:
+            self._first_package_id = entry.spdx_id
+        if not entry.files_analyzed:
+            self._unanalyzed_packages.append(entry.spdx_id)
+        for file_id in dict.fromkeys(element.get("hasFiles") or []):
+            self._package_files.append((entry.spdx_id, file_id))
+        if (code := _package_code_dict(element)) is not None:
+            self._package_codes.append(code)
+
+        self._validated(PACKAGES, list(entry.messages))
+        self._completeness[PACKAGES] += entry.completeness
+
+    def _feed_file(self, element: dict[str, Any]) -> None:
+        key, entry = self._recall(FILES, element)
+        if entry is None:
+            file = self._parse(self._file_parser.parse_file, element)
+            if file is None:
+                self._feed_annotations(element)
+                return
+            assert self._skeleton is not None
+            entry = self._remember(
+                key,
+                MemoEntry(
+                    file.spdx_id,
+                    tuple(
+                        validate_file_within_document(
+                            file, self._spdx_version, self._skeleton
+                        )
+                    ),
+                    tuple(_check_files([file], self._rules)),
+                ),
+            )
+        self._feed_annotations(element)
+        self._index.add(entry.spdx_id, SpdxElementType.FILE)
+        self._add_digest(FILES, entry.spdx_id, file_identity_dict(element))
+        self._file_sha1s.add_dict(element)
+        self._has_files = True
+
+        self._validated(FILES, list(entry.messages))
+        self._completeness[FILES] += entry.completeness
+
+    def _feed_snippet(self, element: dict[str, Any]) -> None:
+        key, entry = self._recall(SNIPPETS, element)
+        if entry is None:
+            snippet = self._parse(self._snippet_parser.parse_snippet, element)
+            if snippet is None:
+                self._feed_annotations(element)
+                return
+            assert self._skeleton is not None
+            entry = self._remember(
+                key,
+                MemoEntry(
+                    snippet.spdx_id,
+                    tuple(
+                        validate_snippet_element(
+                            snippet, self._spdx_version, self._skeleton
+                        )
+                    ),
+                ),
+            )
+        self._feed_annotations(element)
+        self._index.add(entry.spdx_id, SpdxElementType.SNIPPET)
+        self._snippet_ids.append(entry.spdx_id)
+        self._has_snippets = True
+
+        self._validated(SNIPPETS, list(entry.messages))
+        # the file lookup needs the complete file index
+        self._snippet_files.append((entry.spdx_id, element["snippetFromFile"]))
+
+    def _add_digest(
+        self, collection: str, spdx_id: str, digest: bytes
+    ) -> None:
+        spdx_ids, digests = self._digests[collection]
+        spdx_ids.append(spdx_id)
+        digests += digest
+
+    def _feed_relationship(self, element: dict[str, Any]) -> None:
+        relationship = self._parse(
+            self._relationship_parser.parse_relationship, element
+        )
+        if relationship is not None:
+            self._add_relationship(relationship)
+
+    def _add_relationship(self, relationship: Relationship) -> None:
+        assert self._skeleton is not None
+        source = relationship.spdx_element_id
+        target = relationship.related_spdx_element_id
+        relationship_type = relationship.relationship_type
+        if relationship_type == RelationshipType.DESCRIBES:
+            self._describes.append(relationship)
+        elif relationship_type == RelationshipType.DESCRIBED_BY:
+            self._described_by.append(relationship)
+        elif relationship_type == RelationshipType.CONTAINS:
+            self._contains[source, target] = None
+        elif relationship_type == RelationshipType.CONTAINED_BY:
+            self._contains[target, source] = None
+
+        if source in self._index and (
+            not isinstance(target, str) or target in self._index
+        ):
+            self._validated(
+                RELATIONSHIPS,
+                validate_relationship_element(
+                    relationship,
+                    self._spdx_version,
+                    self._skeleton,
+                    self._index,
+                ),
+            )
+        else:
+            # the referenced element may still be ahead in the stream
+            self._pending_relationships.append(relationship)
+
+    def _add_generated_relationships(self, document_id: str) -> None:
+        described = {
+            relationship.related_spdx_element_id
+            for relationship in self._describes
+            if relationship.spdx_element_id == document_id
+        } | {
+            relationship.spdx_element_id
+            for relationship in self._described_by
+            if relationship.related_spdx_element_id == document_id
+        }
+        for spdx_id in dict.fromkeys(
+            self._header.get("documentDescribes") or []
+        ):
+            if spdx_id not in described:
+                self._add_constructed_relationship(
+                    document_id, RelationshipType.DESCRIBES, spdx_id
+                )
+        for package_id, file_id in self._package_files:
+            if (package_id, file_id) not in self._contains:
+                self._add_constructed_relationship(
+                    package_id, RelationshipType.CONTAINS, file_id
+                )
+
+    def _add_constructed_relationship(
+        self, source: Any, relationship_type: RelationshipType, target: Any
+    ) -> None:
+        try:
+            relationship = Relationship(source, relationship_type, target)
+        except ConstructorTypeErrors as error:
+            self._errors += error.get_messages()
+            return
+        self._add_relationship(relationship)
+
+    def _finish_header(self) -> Document | None:
+        header = self._header
+        creation_info = self._parse(
+            self._creation_info_parser.parse_creation_info, header
+        )
+        extracted_licensing_info = self._parse(
+            lambda infos: parse_list_of_elements(
+                infos, _parse_extracted_licensing_info
+            ),
+            header.get("hasExtractedLicensingInfos") or [],
+        )
+        self._annotations[:0] = (
+            self._parse(
+                self._annotation_parser.parse_all_annotations,
+                {
+                    key: header[key]
+                    for key in ("SPDXID", "annotations", "revieweds")
+                    if key in header
+                },
+            )
+            or []
+        )
+        if creation_info is None:
+            return None
+        return Document(
+            creation_info,
+            extracted_licensing_info=extracted_licensing_info or [],
+        )
+
+    def result(self) -> CheckResult:
+        """Runs the document-wide checks and returns the combined result."""
+        if self._skeleton is None:
+            self._skeleton = self._build_skeleton()
+        document = self._finish_header()
+        if self._errors or document is None:
+            logger.warning("Failed to parse the provided JSON.")
+            return CheckResult([], self._errors)
+        document_id = document.creation_info.spdx_id
+        self._index.document_id = document_id
+
+        self._add_generated_relationships(document_id)
+        if self._errors:
+            return CheckResult([], self._errors)
+        logger.info("JSON streamed. Completing validation.")
+
+        messages = self._validate_document(document)
+        logger.info("Completed standard SDPX Validation.")
+        messages += self._check_completeness(document)
+        logger.info("Completed configured completeness SDPX Validation.")
+        return CheckResult(messages, [])
+
+    def _validate_document(
+        self, document: Document
+    ) -> list[ValidationMessage]:
+        creation_info = document.creation_info
+        context = ValidationContext(
+            spdx_id=creation_info.spdx_id,
+            element_type=SpdxElementType.DOCUMENT,
+        )
+        if creation_info.spdx_version not in ["SPDX-2.2", "SPDX-2.3"]:
+            return [
+                ValidationMessage(
+                    'only SPDX versions "SPDX-2.2" and "SPDX-2.3" are '
+                    "supported, but the document's spdx_version is: "
+                    f"{creation_info.spdx_version}",
+                    context,
+                ),
+                ValidationMessage(
+                    "There are issues concerning the SPDX version of the "
+                    "document. As subsequent validation relies on the "
+                    "correct version, the validation process has been "
+                    "cancelled.",
+                    context,
+                ),
+            ]
+
+        self._resolve_deferred(document)
+        messages = validate_creation_info(
+            creation_info, creation_info.spdx_version
+        )
+        if creation_info.spdx_version != self._spdx_version:
+            messages.append(
+                _create_custom_validation_message(
+                    message="spdxVersion appears after the document's "
+                    "elements, which were validated as "
+                    f"{self._spdx_version}.",
+                    element_type=SpdxElementType.DOCUMENT,
+                )
+            )
+        for collection in (PACKAGES, FILES, SNIPPETS):
+            messages += self._messages[collection]
+        for annotation in self._annotations:
+            messages += validate_annotation_element(
+                annotation, document, self._index
+            )
+        messages += self._messages[RELATIONSHIPS]
+        messages += validate_extracted_licensing_infos(
+            document.extracted_licensing_info
+        )
+
+        single_package = (
+            len(self._index.package_ids) == 1
+            and not self._has_files
+            and not self._has_snippets
+        )
+        describes_document = any(
+            relationship.spdx_element_id == creation_info.spdx_id
+            for relationship in self._describes
+        ) or any(
+            relationship.related_spdx_element_id == creation_info.spdx_id
+            for relationship in self._described_by
+        )
+        messages += document_messages(
+            creation_info.spdx_id,
+            single_package or describes_document,
+            self._index,
+        )
+        return [detach(message) for message in messages]
+
+    def _resolve_deferred(self, document: Document) -> None:
+        for context, collection in self._license_contexts.values():
+            expressions = context.full_element
+            self._messages[collection] += (
+                validate_license_expressions(
+                    expressions, document, context.parent_id or ""
+                )
+                if isinstance(expressions, list)
+                else validate_license_expression(
+                    expressions, document, context.parent_id or ""
+                )
+            )
+
+        for snippet_id, file_id in self._snippet_files:
+            if message := missing_snippet_file_message(
+                snippet_id,
+                file_id,
+                document.creation_info.spdx_id,
+                self._index.file_ids,
+            ):
+                self._messages[SNIPPETS].append(message)
+
+        for relationship in self._pending_relationships:
+            self._messages[RELATIONSHIPS] += validate_relationship_element(
+                relationship,
+                self._spdx_version,
+                document,
+                self._index,
+            )
+
+        contained: dict[str, list[Relationship]] = {
+            package_id: [] for package_id in self._unanalyzed_packages
+        }
+        for package_id, file_id in self._contains:
+            if package_id in contained and file_id in self._index.file_ids:
+                contained[package_id].append(
+                    Relationship(
+                        package_id, RelationshipType.CONTAINS, file_id
+                    )
+                )
+        for package_id, relationships in contained.items():
+            if relationships:
+                self._messages[PACKAGES].append(
+                    files_analyzed_message(
+                        package_id,
+                        document.creation_info.spdx_id,
+                        relationships,
+                    )
+                )
+
+    def _check_completeness(
+        self, document: Document
+    ) -> list[ValidationMessage]:
+        messages = _check_creation_info(document.creation_info, self._rules)
+        if self._first_package_id is None:
+            messages.append(no_packages_message())
+            return messages
+        expected_describes_relationship = Relationship(
+            document.creation_info.spdx_id,
+            RelationshipType.DESCRIBES,
+            self._first_package_id,
+        )
+        if primary_package_msg := _describes_message(
+            expected_describes_relationship, self._describes
+        ):
+            messages.append(primary_package_msg)
+        messages += self._completeness[PACKAGES]
+        contained = containment_index(
+            (source, CONTAINS, target, None)
+            for source, target in self._contains
+        )
+        messages += verification_code_messages(
+            self._package_codes,
+            lambda spdx_id: contained.get(spdx_id, []),
+            self._file_sha1s,
+        )
+        messages += duplicate_messages(
+            document.creation_info.spdx_id,
+            digest_pairs(*self._digests[PACKAGES]),
+            digest_pairs(*self._digests[FILES]),
+            self._snippet_ids,
+        )
+        if not self._has_files:
+            messages.append(no_files_message())
+            return messages
+        messages += self._completeness[FILES]
+        return messages
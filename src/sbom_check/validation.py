@@ -0,0 +1,585 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Element-level SPDX validation backed by SPDX ID indexes."""
+
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Container
+
+from spdx_tools.spdx.constants import DOCUMENT_SPDX_ID
+from spdx_tools.spdx.model.annotation import Annotation
+from spdx_tools.spdx.model.document import CreationInfo, Document
+from spdx_tools.spdx.model.external_document_ref import ExternalDocumentRef
+from spdx_tools.spdx.model.extracted_licensing_info import (
+    ExtractedLicensingInfo,
+)
+from spdx_tools.spdx.model.file import File
+from spdx_tools.spdx.model.package import Package
+from spdx_tools.spdx.model.relationship import Relationship, RelationshipType
+from spdx_tools.spdx.model.relationship_filters import (
+    filter_by_type_and_origin,
+    filter_by_type_and_target,
+)
+from spdx_tools.spdx.model.snippet import Snippet
+from spdx_tools.spdx.model.spdx_no_assertion import SpdxNoAssertion
+from spdx_tools.spdx.model.spdx_none import SpdxNone
+from spdx_tools.spdx.validation.actor_validator import validate_actor
+from spdx_tools.spdx.validation.creation_info_validator import (
+    validate_creation_info,
+)
+from spdx_tools.spdx.validation.extracted_licensing_info_validator import (
+    validate_extracted_licensing_infos,
+)
+from spdx_tools.spdx.validation.file_validator import (
+    validate_file_within_document,
+)
+from spdx_tools.spdx.validation.license_expression_validator import (
+    validate_license_expression,
+    validate_license_expressions,
+)
+from spdx_tools.spdx.validation.package_validator import (
+    validate_package_within_document,
+)
+from spdx_tools.spdx.validation.snippet_validator import validate_snippet
+from spdx_tools.spdx.validation.spdx_id_validators import validate_spdx_id
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationContext,
+    ValidationMessage,
+)
+
+SPDX_VERSIONS = ["SPDX-2.2", "SPDX-2.3"]
+# element lists of a Document, in the order validate_full_spdx_document
+# reports their messages
+ELEMENT_COLLECTIONS = (
+    "packages",
+    "files",
+    "snippets",
+    "annotations",
+    "relationships",
+)
+SPDX_2_2_ONLY_RELATIONSHIPS = [
+    RelationshipType.SPECIFICATION_FOR,
+    RelationshipType.REQUIREMENT_DESCRIPTION_FOR,
+]
+
+
+@dataclass(slots=True)
+class SpdxIdIndex:
+    """Hash-based lookup tables for the SPDX IDs declared by a document."""
+
+    document_id: str = DOCUMENT_SPDX_ID
+    package_ids: set[str] = field(default_factory=set)
+    file_ids: set[str] = field(default_factory=set)
+    snippet_ids: set[str] = field(default_factory=set)
+    duplicate_ids: set[str] = field(default_factory=set)
+
+    def add(self, spdx_id: str, element_type: SpdxElementType) -> None:
+        """Registers an element's SPDX ID, remembering any duplicates."""
+        if spdx_id in self:
+            self.duplicate_ids.add(spdx_id)
+        if element_type == SpdxElementType.PACKAGE:
+            self.package_ids.add(spdx_id)
+        elif element_type == SpdxElementType.FILE:
+            self.file_ids.add(spdx_id)
+        else:
+            self.snippet_ids.add(spdx_id)
+
+    def __contains__(self, spdx_id: object) -> bool:
+        return (
+            spdx_id == self.document_id
+            or spdx_id in self.package_ids
+            or spdx_id in self.file_ids
+            or spdx_id in self.snippet_ids
+        )
+
+    @classmethod
+    def from_document(cls, document: Document) -> "SpdxIdIndex":
+        """Builds the index from a fully parsed SPDX document."""
+        index = cls(document.creation_info.spdx_id)
+        for file in document.files:
+            index.add(file.spdx_id, SpdxElementType.FILE)
+        for package in document.packages:
+            index.add(package.spdx_id, SpdxElementType.PACKAGE)
+        for snippet in document.snippets:
+            index.add(snippet.spdx_id, SpdxElementType.SNIPPET)
+        return index
+
+
+def document_skeleton(
+    spdx_version: str,
+    spdx_id: str | None = None,
+    external_document_refs: list[ExternalDocumentRef] | None = None,
+    extracted_licensing_info: list[ExtractedLicensingInfo] | None = None,
+) -> Document:
+    """
+    Returns an element-free Document carrying only the header values that
+    element validators look up (document ID, external document references
+    and extracted licenses).
+    """
+    creation_info = CreationInfo(
+        spdx_version=spdx_version,
+        spdx_id=spdx_id or DOCUMENT_SPDX_ID,
+        name="",
+        document_namespace="",
+        creators=[],
+        created=datetime.min,
+        external_document_refs=external_document_refs or [],
+    )
+    return Document(
+        creation_info,
+        extracted_licensing_info=extracted_licensing_info or [],
+    )
+
+
+def validate_reference(
+    spdx_id: str, skeleton: Document, spdx_ids: Container[str]
+) -> list[str]:
+    """
+    Equivalent of spdx-tools' validate_spdx_id(check_document=True) that
+    looks the ID up in an index instead of scanning the document.
+    """
+    messages: list[str] = validate_spdx_id(spdx_id, skeleton)
+    if ":" not in spdx_id and spdx_id not in spdx_ids:
+        messages.append(
+            f'did not find the referenced spdx_id "{spdx_id}" in the SPDX '
+            "document"
+        )
+    return messages
+
+
+def validate_snippet_element(
+    snippet: Snippet, spdx_version: str, skeleton: Document
+) -> list[ValidationMessage]:
+    """
+    Validates a snippet like validate_snippet_within_document, except for the
+    lookup of its file reference (see missing_snippet_file_message).
+    """
+    context = ValidationContext(
+        spdx_id=snippet.spdx_id,
+        parent_id=skeleton.creation_info.spdx_id,
+        element_type=SpdxElementType.SNIPPET,
+        full_element=snippet,
+    )
+    messages = [
+        ValidationMessage(message, context)
+        for spdx_id in (snippet.spdx_id, snippet.file_spdx_id)
+        for message in validate_spdx_id(spdx_id, skeleton)
+    ]
+    messages += validate_license_expression(
+        snippet.license_concluded, skeleton, snippet.spdx_id
+    )
+    messages += validate_license_expressions(
+        snippet.license_info_in_snippet, skeleton, snippet.spdx_id
+    )
+    messages += validate_snippet(snippet, spdx_version, context)
+    return messages
+
+
+def missing_snippet_file_message(
+    snippet_id: str,
+    file_spdx_id: str,
+    parent_id: str,
+    file_ids: Container[str],
+) -> ValidationMessage | None:
+    """Returns a message if a snippet's file is not in the document."""
+    if ":" in file_spdx_id or file_spdx_id in file_ids:
+        return None
+    context = ValidationContext(
+        spdx_id=snippet_id,
+        parent_id=parent_id,
+        element_type=SpdxElementType.SNIPPET,
+    )
+    return ValidationMessage(
+        f'did not find the referenced spdx_id "{file_spdx_id}" in the SPDX '
+        "document's files",
+        context,
+    )
+
+
+def validate_relationship_element(
+    relationship: Relationship,
+    spdx_version: str,
+    skeleton: Document,
+    spdx_ids: Container[str],
+) -> list[ValidationMessage]:
+    """Index-backed equivalent of spdx-tools' validate_relationship."""
+    context = ValidationContext(
+        element_type=SpdxElementType.RELATIONSHIP, full_element=relationship
+    )
+    spdx_id_refs: list[str] = [relationship.spdx_element_id]
+    if relationship.related_spdx_element_id not in [
+        SpdxNone(),
+        SpdxNoAssertion(),
+    ]:
+        spdx_id_refs.append(str(relationship.related_spdx_element_id))
+
+    messages = [
+        ValidationMessage(message, context)
+        for spdx_id in spdx_id_refs
+        for message in validate_reference(spdx_id, skeleton, spdx_ids)
+    ]
+    if (
+        spdx_version == "SPDX-2.2"
+        and relationship.relationship_type in SPDX_2_2_ONLY_RELATIONSHIPS
+    ):
+        messages.append(
+            ValidationMessage(
+                f"{relationship.relationship_type} is not supported in "
+                "SPDX-2.2",
+                context,
+            )
+        )
+    return messages
+
+
+def validate_annotation_element(
+    annotation: Annotation, skeleton: Document, spdx_ids: Container[str]
+) -> list[ValidationMessage]:
+    """Index-backed equivalent of spdx-tools' validate_annotation."""
+    context = ValidationContext(
+        element_type=SpdxElementType.ANNOTATION, full_element=annotation
+    )
+    messages = validate_actor(annotation.annotator, "annotation")
+    messages += [
+        ValidationMessage(message, context)
+        for message in validate_reference(
+            annotation.spdx_id, skeleton, spdx_ids
+        )
+    ]
+    return messages
+
+
+def files_analyzed_message(
+    package: Package | str,
+    parent_id: str,
+    relationships: list[Relationship],
+) -> ValidationMessage:
+    """
+    Returns the message for a package that contains files even though
+    files_analyzed is False.
+    """
+    spdx_id = package if isinstance(package, str) else package.spdx_id
+    context = ValidationContext(
+        spdx_id=spdx_id,
+        parent_id=parent_id,
+        element_type=SpdxElementType.PACKAGE,
+        full_element=None if isinstance(package, str) else package,
+    )
+    return ValidationMessage(
+        "package must contain no elements if files_analyzed is False, but "
+        f"found {relationships}",
+        context,
+    )
+
+
+def document_describes_message(document_id: str) -> ValidationMessage:
+    """Returns the message for a document without DESCRIBES relationships."""
+    return ValidationMessage(
+        f'there must be at least one relationship "{document_id} DESCRIBES '
+        f'..." or "... DESCRIBED_BY {document_id}" when there is not only a '
+        "single package present",
+        ValidationContext(
+            spdx_id=document_id, element_type=SpdxElementType.DOCUMENT
+        ),
+    )
+
+
+def duplicate_ids_message(
+    document_id: str, duplicate_ids: set[str]
+) -> ValidationMessage:
+    """Returns the message listing SPDX IDs that are declared twice."""
+    return ValidationMessage(
+        "every spdx_id must be unique within the document, but found the "
+        f"following duplicates: {sorted(duplicate_ids)}",
+        ValidationContext(
+            spdx_id=document_id, element_type=SpdxElementType.DOCUMENT
+        ),
+    )
+
+
+def document_messages(
+    document_id: str, describes_something: bool, index: SpdxIdIndex
+) -> list[ValidationMessage]:
+    """
+    Returns the document-wide messages for a document that does not
+    describe anything (a lone package counts as described) and for SPDX IDs
+    declared more than once.
+    """
+    messages = []
+    if not describes_something:
+        messages.append(document_describes_message(document_id))
+    if index.duplicate_ids:
+        messages.append(
+            duplicate_ids_message(document_id, index.duplicate_ids)
+        )
+    return messages
+
+
+def detach(message: ValidationMessage) -> ValidationMessage:
+    """
+    Drops the model object referenced by a message's context so that
+    reported messages do not keep parsed elements alive.
+    """
+    if message.context.full_element is None:
+        return message
+    return ValidationMessage(
+        message.validation_message,
+        replace(message.context, full_element=None),
+    )
+
+
+@dataclass(slots=True)
+class IndexedValidation:
+    """
+    A parsed document together with the SPDX ID index and skeleton that its
+    elements are validated against. Elements validate independently of each
+    other, so any range of a collection can be validated on its own.
+    """
+
+    document: Document
+    spdx_version: str
+    index: SpdxIdIndex
+    skeleton: Document
+    contained: dict[str, list[Relationship]]
+
+    @classmethod
+    def prepare(
+        cls, document: Document, spdx_version: str | None = None
+    ) -> "IndexedValidation":
+        """Builds the SPDX ID index and skeleton of a document."""
+        creation_info = document.creation_info
+        index = SpdxIdIndex.from_document(document)
+        return cls(
+            document,
+            spdx_version or creation_info.spdx_version,
+            index,
+            document_skeleton(
+                creation_info.spdx_version,
+                creation_info.spdx_id,
+                creation_info.external_document_refs,
+                document.extracted_licensing_info,
+            ),
+            _contained_files(document, index),
+        )
+
+    def opening_messages(self) -> list[ValidationMessage]:
+        """Returns the messages preceding those of the elements."""
+        return validate_creation_info(
+            self.document.creation_info, self.spdx_version
+        )
+
+    def validate_elements(
+        self, collection: str, start: int = 0, stop: int | None = None
+    ) -> list[list[ValidationMessage]]:
+        """
+        Validates a range of one of ELEMENT_COLLECTIONS, returning the
+        messages of each element.
+        """
+        validate = getattr(self, f"_validate_{collection}")
+        return [
+            validate(element)
+            for element in getattr(self.document, collection)[start:stop]
+        ]
+
+    def closing_messages(self) -> list[ValidationMessage]:
+        """Returns the messages following those of the elements."""
+        messages = validate_extracted_licensing_infos(
+            self.document.extracted_licensing_info
+        )
+        return messages + document_messages(
+            self.document.creation_info.spdx_id,
+            _describes_something(self.document),
+            self.index,
+        )
+
+    def _validate_packages(self, package: Package) -> list[ValidationMessage]:
+        return _validate_package_element(
+            package,
+            self.spdx_version,
+            self.skeleton,
+            self.contained.get(package.spdx_id),
+        )
+
+    def _validate_files(self, file: File) -> list[ValidationMessage]:
+        return validate_file_within_document(
+            file, self.spdx_version, self.skeleton
+        )
+
+    def _validate_snippets(self, snippet: Snippet) -> list[ValidationMessage]:
+        return _validate_snippet_indexed(
+            snippet, self.spdx_version, self.skeleton, self.index
+        )
+
+    def _validate_annotations(
+        self, annotation: Annotation
+    ) -> list[ValidationMessage]:
+        return validate_annotation_element(
+            annotation, self.skeleton, self.index
+        )
+
+    def _validate_relationships(
+        self, relationship: Relationship
+    ) -> list[ValidationMessage]:
+        return validate_relationship_element(
+            relationship, self.spdx_version, self.skeleton, self.index
+        )
+
+
+def validate_document_indexed(
+    document: Document, spdx_version: str | None = None
+) -> list[ValidationMessage]:
+    """
+    Validates a parsed document like spdx-tools' validate_full_spdx_document,
+    but builds the SPDX ID index once and looks every relationship, snippet
+    file and annotation reference up in it, instead of scanning the
+    document's elements for each reference.
+    """
+    if messages := version_messages(document, spdx_version):
+        return messages
+    validation = IndexedValidation.prepare(document, spdx_version)
+    messages = validation.opening_messages()
+    for collection in ELEMENT_COLLECTIONS:
+        for element_messages in validation.validate_elements(collection):
+            messages += element_messages
+    return messages + validation.closing_messages()
+
+
+def _describes_something(document: Document) -> bool:
+    if (
+        len(document.packages) == 1
+        and not document.files
+        and not document.snippets
+    ):
+        return True
+    document_id = document.creation_info.spdx_id
+    return bool(
+        filter_by_type_and_origin(
+            document.relationships, RelationshipType.DESCRIBES, document_id
+        )
+        or filter_by_type_and_target(
+            document.relationships, RelationshipType.DESCRIBED_BY, document_id
+        )
+    )
+
+
+def version_messages(
+    document: Document, spdx_version: str | None = None
+) -> list[ValidationMessage]:
+    """
+    Returns the messages that cancel validation of a document with an
+    unsupported SPDX version, or of another version than spdx_version.
+    """
+    document_version = document.creation_info.spdx_version
+    spdx_version = spdx_version or document_version
+    context = ValidationContext(
+        spdx_id=document.creation_info.spdx_id,
+        element_type=SpdxElementType.DOCUMENT,
+    )
+    if document_version not in SPDX_VERSIONS:
+        message = (
+            'only SPDX versions "SPDX-2.2" and "SPDX-2.3" are supported, but '
+            f"the document's spdx_version is: {document_version}"
+        )
+    elif spdx_version != document_version:
+        message = (
+            f"provided SPDX version {spdx_version} does not match the "
+            f"document's SPDX version {document_version}"
+        )
+    else:
+        return []
+    return [
+        ValidationMessage(message, context),
+        ValidationMessage(
+            "There are issues concerning the SPDX version of the document. "
+            "As subsequent validation relies on the correct version, the "
+            "validation process has been cancelled.",
+            context,
+        ),
+    ]
+
+
+def _contained_files(
+    document: Document, index: SpdxIdIndex
+) -> dict[str, list[Relationship]]:
+    """
+    Returns the CONTAINS and CONTAINED_BY relationships between packages
+    with files_analyzed False and files, by package SPDX ID.
+    """
+    unanalyzed = {
+        package.spdx_id
+        for package in document.packages
+        if not package.files_analyzed
+    }
+    # elements declared both as package and file count as packages
+    file_ids = index.file_ids - index.package_ids
+    contains: dict[str, list[Relationship]] = {}
+    contained_by: dict[str, list[Relationship]] = {}
+    for relationship in document.relationships:
+        source = relationship.spdx_element_id
+        target = relationship.related_spdx_element_id
+        if not isinstance(target, str):
+            continue
+        if (
+            relationship.relationship_type == RelationshipType.CONTAINS
+            and source in unanalyzed
+            and target in file_ids
+        ):
+            contains.setdefault(source, []).append(relationship)
+        elif (
+            relationship.relationship_type == RelationshipType.CONTAINED_BY
+            and target in unanalyzed
+            and source in file_ids
+        ):
+            contained_by.setdefault(target, []).append(relationship)
+    return {
+        package_id: contains.get(package_id, [])
+        + contained_by.get(package_id, [])
+        for package_id in unanalyzed
+    }
+
+
+def _validate_package_element(
+    package: Package,
+    spdx_version: str,
+    skeleton: Document,
+    contained: list[Relationship] | None,
+) -> list[ValidationMessage]:
+    # the skeleton has no relationships, so files_analyzed is checked here
+    messages = validate_package_within_document(
+        package, spdx_version, skeleton
+    )
+    if contained:
+        messages.insert(
+            len(validate_spdx_id(package.spdx_id, skeleton)),
+            files_analyzed_message(
+                package, skeleton.creation_info.spdx_id, contained
+            ),
+        )
+    return messages
+
+
+def _validate_snippet_indexed(
+    snippet: Snippet,
+    spdx_version: str,
+    skeleton: Document,
+    index: SpdxIdIndex,
+) -> list[ValidationMessage]:
+    messages = validate_snippet_element(snippet, spdx_version, skeleton)
+    if missing := missing_snippet_file_message(
+        snippet.spdx_id,
+        snippet.file_spdx_id,
+        skeleton.creation_info.spdx_id,
+        index.file_ids,
+    ):
+        # reported right after the format checks of both SPDX IDs
+        messages.insert(
+            len(validate_spdx_id(snippet.spdx_id, skeleton))
+            + len(validate_spdx_id(snippet.file_spdx_id, skeleton)),
+            ValidationMessage(
+                missing.validation_message,
+                replace(missing.context, full_element=snippet),
+            ),
+        )
+    return messages
@@ -0,0 +1,181 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Recomputation of package verification codes from file checksums."""
+
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from spdx_tools.spdx.model.checksum import ChecksumAlgorithm
+from spdx_tools.spdx.model.file import File
+from spdx_tools.spdx.model.package import Package
+from spdx_tools.spdx.model.relationship import RelationshipType
+from spdx_tools.spdx.parser.jsonlikedict.dict_parsing_functions import (
+    json_str_to_enum_name,
+)
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationMessage,
+)
+
+from sbom_check.paths import normalized_path
+from sbom_check.rules import completeness_message
+
+CONTAINS = RelationshipType.CONTAINS.name
+CONTAINED_BY = RelationshipType.CONTAINED_BY.name
+SHA1 = ChecksumAlgorithm.SHA1.name
+
+
+@dataclass(frozen=True, slots=True)
+class PackageCode:
+    """The verification code a package with analyzed files declares."""
+
+    spdx_id: str
+    value: str
+    excluded_files: tuple[str, ...] = ()
+
+
+class FileSha1s:
+    """
+    The SHA1 of every file of a document, as raw bytes, and the hash of its
+    normalized name, by SPDX ID. Files without a valid SHA1 checksum are
+    held as None, as the code of a package with them cannot be recomputed.
+    """
+
+    def __init__(self) -> None:
+        self._files: dict[str, tuple[bytes | None, int]] = {}
+
+    def add(self, spdx_id: str, file_name: Any, sha1: Any) -> None:
+        """Adds a file by its SPDX ID, fileName and SHA1 hex digest."""
+        try:
+            digest = bytes.fromhex(sha1) if isinstance(sha1, str) else None
+        except ValueError:
+            digest = None
+        if digest is not None and len(digest) != hashlib.sha1().digest_size:
+            digest = None
+        self._files[spdx_id] = (digest, _name_hash(file_name))
+
+    def add_file(self, file: File) -> None:
+        """Adds a file of the spdx-tools model."""
+        self.add(
+            file.spdx_id,
+            file.name,
+            next(
+                (
+                    checksum.value
+                    for checksum in file.checksums
+                    if checksum.algorithm == ChecksumAlgorithm.SHA1
+                ),
+                None,
+            ),
+        )
+
+    def add_dict(self, file: dict[str, Any]) -> None:
+        """Adds a file as decoded from JSON."""
+        self.add(
+            file.get("SPDXID") or "",
+            file.get("fileName"),
+            next(
+                (
+                    checksum.get("checksumValue")
+                    for checksum in file.get("checksums") or []
+                    if isinstance(checksum, dict)
+                    and json_str_to_enum_name(checksum.get("algorithm") or "")
+                    == SHA1
+                ),
+                None,
+            ),
+        )
+
+    def verification_code(
+        self, file_ids: Iterable[str], excluded_files: Iterable[str] = ()
+    ) -> str | None:
+        """
+        The verification code of the files among file_ids whose names are
+        not excluded: the SHA1 of their SHA1 hex digests, sorted and
+        concatenated. None if any of them has no valid SHA1, or if none of
+        file_ids is a file of the document, as in package-level SBOMs whose
+        files are kept elsewhere. IDs of other elements, such as contained
+        packages, are skipped.
+        """
+        excluded = {_name_hash(file_name) for file_name in excluded_files}
+        digests = []
+        contains_files = False
+        for file_id in dict.fromkeys(file_ids):
+            file = self._files.get(file_id)
+            if file is None:
+                continue
+            contains_files = True
+            if file[1] in excluded:
+                continue
+            if file[0] is None:
+                return None
+            digests.append(file[0])
+        if not contains_files:
+            return None
+        # raw digests sort in the same order as their hex digests
+        digests.sort()
+        return hashlib.sha1(b"".join(digests).hex().encode()).hexdigest()
+
+
+def package_code(package: Package) -> PackageCode | None:
+    """The verification code of a package of the model, if it declares one."""
+    if not package.files_analyzed or package.verification_code is None:
+        return None
+    return PackageCode(
+        package.spdx_id,
+        package.verification_code.value,
+        tuple(package.verification_code.excluded_files),
+    )
+
+
+def containment_index(
+    relationships: Iterable[tuple[Any, str, Any, Any]]
+) -> dict[str, list[str]]:
+    """
+    The SPDX IDs each element CONTAINS, from (source, type, target,
+    comment) tuples, with CONTAINED_BY relationships reversed.
+    """
+    contained: defaultdict[str, list[str]] = defaultdict(list)
+    for source, relationship_type, target, _ in relationships:
+        if relationship_type == CONTAINS:
+            contained[source].append(target)
+        elif relationship_type == CONTAINED_BY:
+            contained[target].append(source)
+    return contained
+
+
+def verification_code_messages(
+    packages: Iterable[PackageCode],
+    package_files: Callable[[str], Iterable[str]],
+    files: FileSha1s,
+) -> list[ValidationMessage]:
+    """
+    Reports the packages whose verification code differs from the one
+    recomputed from the SHA1s of the files package_files gives for them.
+    Each containment is visited once, so the check is linear in the
+    relationships apart from sorting the digests of each package.
+    """
+    messages = []
+    for package in packages:
+        code = files.verification_code(
+            package_files(package.spdx_id), package.excluded_files
+        )
+        if code is not None and code != package.value.lower():
+            messages.append(
+                completeness_message(
+                    "This package's verification code does not match the "
+                    f"SHA1 checksums of its files, from which it is {code}.",
+                    SpdxElementType.PACKAGE,
+                    package.spdx_id,
+                )
+            )
+    return messages
+
+
+def _name_hash(file_name: Any) -> int:
+    if not isinstance(file_name, str):
+        return hash(None)
+    return hash(normalized_path(file_name) or file_name)
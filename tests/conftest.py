@@ -0,0 +1,29 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pytest
+
+
+@pytest.fixture
+def spdx_document_factory():
+    # builds an SPDX 2.3 JSON document of the given fields, such as its
+    # packages and files, over a header that passes the creation info checks
+    # but for the licenseListVersion, which is only set when given
+    def spdx_document(license_list_version=None, **fields):
+        creation_info = {
+            "creators": ["Organization: Qualcomm"],
+            "created": "2023-09-07T20:33:12Z",
+        }
+        if license_list_version is not None:
+            creation_info["licenseListVersion"] = license_list_version
+        return {
+            "spdxVersion": "SPDX-2.3",
+            "documentNamespace": "http://spdx.org/spdxdocs/fake",
+            "creationInfo": creation_info,
+            "dataLicense": "CC0-1.0",
+            "SPDXID": "SPDXRef-DOCUMENT",
+            "name": "Fake name",
+            **fields,
+        }
+
+    return spdx_document
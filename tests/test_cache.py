@@ -0,0 +1,120 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+from dataclasses import replace
+
+from spdx_tools.spdx.validation.validation_message import (
+    SpdxElementType,
+    ValidationContext,
+    ValidationMessage,
+)
+
+from cli.main import CheckOptions, run
+from sbom_check.cache import ResultCache, cache_key
+from sbom_check.checks import COMPLETENESS_RULES, CheckResult, ModelOptions
+from sbom_check.rules import RuleRegistry
+
+RESULT = CheckResult(
+    [
+        ValidationMessage(
+            "message",
+            ValidationContext(
+                spdx_id="SPDXRef-a",
+                parent_id="SPDXRef-DOCUMENT",
+                element_type=SpdxElementType.PACKAGE,
+            ),
+        ),
+        ValidationMessage("document message", ValidationContext()),
+    ],
+    ["error"],
+)
+
+
+def test_round_trip(tmp_path):
+    cache = ResultCache(tmp_path)
+
+    assert cache.get("key") is None
+    cache.put("key", RESULT)
+    result = cache.get("key")
+
+    assert result.errors == RESULT.errors
+    assert result.validation_messages == RESULT.validation_messages
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert ResultCache(tmp_path).get("key") is not None
+
+
+def test_malformed_entry_is_a_miss(tmp_path):
+    cache = ResultCache(tmp_path)
+    for entry in ['{"errors": []}', "[]", '{"messages": [1], "errors": []}']:
+        (tmp_path / "key.json").write_text(entry)
+        assert cache.get("key") is None
+
+    cache.put("key", RESULT)
+    assert cache.get("key") is not None
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_key_covers_content_and_config(tmp_path):
+    path = tmp_path / "sbom.spdx.json"
+    path.write_text("{}")
+    key = cache_key(path, {"completeness_only": False})
+
+    assert cache_key(path, {"completeness_only": False}) == key
+    assert cache_key(path, {"completeness_only": True}) != key
+    path.write_text("{ }")
+    assert cache_key(path, {"completeness_only": False}) != key
+
+
+def test_lru_eviction(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.put("a", RESULT)
+    cache.max_bytes = (tmp_path / "a.json").stat().st_size * 2
+    cache.put("b", RESULT)
+    cache.get("a")
+    cache.put("c", RESULT)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_run_uses_cache(tmp_path):
+    sboms = tmp_path / "sboms"
+    sboms.mkdir()
+    (sboms / "sbom.spdx.json").write_text("{}")
+    cache = ResultCache(tmp_path / "cache")
+
+    first = run(str(sboms), cache=cache)
+    second = run(str(sboms), cache=cache)
+
+    assert first["sbom.spdx.json"].errors == second["sbom.spdx.json"].errors
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_run_cache_config(tmp_path):
+    rules = COMPLETENESS_RULES.copy()
+    configs = [
+        CheckOptions().cache_config,
+        CheckOptions(model=ModelOptions(deep=True)).cache_config,
+    ]
+    rules.remove("package-supplier")
+    configs.append(CheckOptions(model=ModelOptions(rules=rules)).cache_config)
+    # a rule whose definition changes under the same name
+    rules = RuleRegistry(
+        (
+            replace(rule, predicate=lambda supplier: supplier is not None)
+            if rule.name == "package-supplier"
+            else rule
+        )
+        for rule in COMPLETENESS_RULES
+    )
+    configs.append(CheckOptions(model=ModelOptions(rules=rules)).cache_config)
+
+    assert len({json.dumps(config, sort_keys=True) for config in configs}) == 4
+    assert (
+        CheckOptions(
+            model=ModelOptions(rules=COMPLETENESS_RULES.copy(profile=True))
+        ).cache_config
+        == configs[0]
+    )
@@ -5,7 +5,14 @@ import json
 
 import pytest
 
-from sbom_check import check_sbom
+from sbom_check import ModelOptions, check_sbom
+from sbom_check.checks import COMPLETENESS_EXCEPTION, COMPLETENESS_RULES
+
+CHECKSUM_FORMAT_MESSAGE = COMPLETENESS_EXCEPTION + next(
+    rule.message
+    for rule in COMPLETENESS_RULES
+    if rule.name == "file-checksum-format"
+)
 
 
 @pytest.fixture
@@ -214,3 +221,127 @@ def test_check_files(spdx_json3):
         "\n*** completeness exception ***\n"
         "This file has a concluded license but no copyright text."
     )
+
+
+def test_check_sbom_bytes(spdx_json3):
+    expected = check_sbom(spdx_json3)
+    result = check_sbom(spdx_json3.encode("utf-8"))
+
+    assert result.errors == expected.errors
+    assert result.validation_messages == expected.validation_messages
+
+
+@pytest.mark.parametrize(
+    "spdx_json_fixture",
+    ["spdx_json_no_packages", "spdx_json1", "spdx_json2", "spdx_json3"],
+)
+def test_completeness_only_matches_model(spdx_json_fixture, request):
+    spdx_json = request.getfixturevalue(spdx_json_fixture)
+
+    expected = [
+        message
+        for message in check_sbom(spdx_json).validation_messages
+        if message["message"].startswith(COMPLETENESS_EXCEPTION)
+    ]
+    result = check_sbom(spdx_json, completeness_only=True)
+
+    assert result.errors == []
+    assert _without_checksum_format(result.validation_messages) == expected
+
+
+def test_completeness_only_document_describes(spdx_json2):
+    document = json.loads(spdx_json2)
+    document["relationships"] = [
+        {
+            "spdxElementId": "SPDXRef-test.2",
+            "relationshipType": "DESCRIBED_BY",
+            "relatedSpdxElement": "SPDXRef-DOCUMENT",
+        },
+        {
+            "spdxElementId": "SPDXRef-DOCUMENT",
+            "relationshipType": "DESCRIBES",
+            "relatedSpdxElement": "SPDXRef-fakepath",
+        },
+    ]
+    spdx_json = json.dumps(document)
+
+    expected = [
+        message
+        for message in check_sbom(spdx_json).validation_messages
+        if message["message"].startswith(COMPLETENESS_EXCEPTION)
+    ]
+
+    assert (
+        _without_checksum_format(
+            check_sbom(spdx_json, completeness_only=True).validation_messages
+        )
+        == expected
+    )
+
+
+@pytest.mark.parametrize(
+    "spdx_json_fixture",
+    ["spdx_json_no_packages", "spdx_json1", "spdx_json2", "spdx_json3"],
+)
+def test_indexed_matches_model(spdx_json_fixture, request):
+    spdx_json = request.getfixturevalue(spdx_json_fixture)
+
+    assert check_sbom(
+        spdx_json, options=ModelOptions(indexed=True)
+    ) == check_sbom(spdx_json)
+
+
+@pytest.mark.parametrize("spdx_version", ["SPDX-2.2", "SPDX-2.3", "SPDX-2.1"])
+def test_indexed_references(spdx_json3, spdx_version):
+    document = json.loads(spdx_json3)
+    document["spdxVersion"] = spdx_version
+    document["packages"][0]["filesAnalyzed"] = False
+    document["packages"][0]["hasFiles"] = ["SPDXRef-fakepath"]
+    document["files"].append(dict(document["files"][0]))
+    document["snippets"] = [
+        {
+            "SPDXID": f"SPDXRef-snippet-{index}",
+            "snippetFromFile": file_id,
+            "ranges": [
+                {
+                    "startPointer": {"offset": 1, "reference": file_id},
+                    "endPointer": {"offset": 2, "reference": file_id},
+                }
+            ],
+        }
+        for index, file_id in enumerate(
+            ["SPDXRef-fakepath", "SPDXRef-missing", "SPDXRef-test.2", "a:b:c"]
+        )
+    ]
+    document["relationships"] = [
+        {
+            "spdxElementId": "SPDXRef-fakepath",
+            "relationshipType": "CONTAINED_BY",
+            "relatedSpdxElement": "SPDXRef-test.2",
+        },
+        {
+            "spdxElementId": "SPDXRef-test.2",
+            "relationshipType": "SPECIFICATION_FOR",
+            "relatedSpdxElement": "DocumentRef-missing:SPDXRef-other",
+        },
+        {
+            "spdxElementId": "SPDXRef-missing",
+            "relationshipType": "DEPENDS_ON",
+            "relatedSpdxElement": "NOASSERTION",
+        },
+    ]
+    spdx_json = json.dumps(document)
+
+    result = check_sbom(spdx_json, options=ModelOptions(indexed=True))
+
+    assert result == check_sbom(spdx_json)
+    assert result.validation_messages
+
+
+def _without_checksum_format(messages):
+    # specification validation checks the checksum values of the model
+    return [
+        message
+        for message in messages
+        if message["message"] != CHECKSUM_FORMAT_MESSAGE
+    ]
@@ -0,0 +1,289 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import bz2
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import os
+import sys
+import tarfile
+import zipfile
+
+import pytest
+
+from cli import main as cli_main
+from cli.main import CheckOptions, _output_csv, _output_json, run
+from sbom_check import CheckResult, ModelOptions, check_sbom
+from sbom_check.flyweight import Flyweights
+from sbom_check.hash_cache import FileHashCache
+from sbom_check.license_memo import LicenseExpressionMemo
+
+
+@pytest.fixture
+def spdx_document(spdx_document_factory):
+    return spdx_document_factory(
+        packages=[
+            {
+                "SPDXID": "SPDXRef-test.2",
+                "name": "LA.VENDOR",
+                "downloadLocation": "NOASSERTION",
+                "filesAnalyzed": False,
+            }
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"stream": True},
+        {"completeness_only": True},
+        {"level": "completeness"},
+        {"model": ModelOptions(flyweights=Flyweights())},
+        {"model": ModelOptions(license_memo=LicenseExpressionMemo())},
+        {"model": ModelOptions(indexed=True)},
+        {"model": ModelOptions(workers=2, chunk_size=1)},
+    ],
+)
+def test_run_mapped_files(tmp_path, options, spdx_document):
+    spdx_json = json.dumps(spdx_document)
+    (tmp_path / "sbom.spdx.json").write_text(spdx_json, encoding="utf-8")
+
+    results = run(str(tmp_path), CheckOptions(**options))
+
+    expected = check_sbom(
+        spdx_json, CheckOptions(**options).check_level == "completeness"
+    )
+    assert results["sbom.spdx.json"] == expected
+
+
+def test_run_empty_file(tmp_path):
+    (tmp_path / "empty.spdx.json").touch()
+
+    results = run(str(tmp_path))
+
+    assert results["empty.spdx.json"].errors == [
+        f"File {tmp_path / 'empty.spdx.json'} is empty."
+    ]
+
+
+@pytest.mark.parametrize(
+    "suffix, compress",
+    [(".gz", gzip.compress), (".xz", lzma.compress), (".bz2", bz2.compress)],
+)
+@pytest.mark.parametrize("stream", [False, True])
+def test_run_compressed_files(
+    tmp_path, suffix, compress, stream, spdx_document
+):
+    spdx_json = json.dumps(spdx_document)
+    filename = f"sbom.spdx.json{suffix}"
+    (tmp_path / filename).write_bytes(compress(spdx_json.encode()))
+
+    results = run(str(tmp_path), CheckOptions(stream=stream))
+
+    assert results == {filename: check_sbom(spdx_json)}
+
+
+@pytest.mark.parametrize(
+    "suffix, compress",
+    [(".gz", gzip.compress), (".xz", lzma.compress), (".bz2", bz2.compress)],
+)
+@pytest.mark.parametrize("stream", [False, True])
+def test_run_corrupt_compressed_files(
+    tmp_path, suffix, compress, stream, spdx_document
+):
+    spdx_json = json.dumps(spdx_document)
+    (tmp_path / "sbom.spdx.json").write_text(spdx_json, encoding="utf-8")
+    (tmp_path / f"garbage.spdx.json{suffix}").write_bytes(b"not compressed")
+    (tmp_path / f"truncated.spdx.json{suffix}").write_bytes(
+        compress(spdx_json.encode())[:-8]
+    )
+
+    results = run(str(tmp_path), CheckOptions(stream=stream))
+
+    assert results["sbom.spdx.json"] == check_sbom(spdx_json)
+    for name in ("garbage", "truncated"):
+        errors = results[f"{name}.spdx.json{suffix}"].errors
+        assert len(errors) == 1 and "could not be read" in errors[0]
+
+
+def test_run_unrecognized_file(tmp_path):
+    (tmp_path / "sbom.spdx.json.lz4").touch()
+
+    results = run(str(tmp_path))
+
+    assert "not recognized" in results["sbom.spdx.json.lz4"].errors[0]
+
+
+def _write_tar(path, members):
+    with tarfile.open(path, "w:gz") as tarball:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tarball.addfile(info, io.BytesIO(data))
+
+
+def _write_zip(path, members):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+
+@pytest.mark.parametrize(
+    "archive_name, write",
+    [("sboms.tar.gz", _write_tar), ("sboms.zip", _write_zip)],
+)
+@pytest.mark.parametrize("stream", [False, True])
+def test_run_archive(tmp_path, archive_name, write, stream, spdx_document):
+    spdx_json = json.dumps(spdx_document).encode()
+    write(
+        tmp_path / archive_name,
+        {
+            "release/a.spdx.json": spdx_json,
+            "release/b.spdx.json.gz": gzip.compress(spdx_json),
+            "release/README": b"not an SBOM",
+        },
+    )
+
+    results = run(str(tmp_path / archive_name), CheckOptions(stream=stream))
+
+    assert results == {
+        "release/a.spdx.json": check_sbom(spdx_json),
+        "release/b.spdx.json.gz": check_sbom(spdx_json),
+    }
+
+
+def test_run_archive_corrupt_member(tmp_path, spdx_document):
+    spdx_json = json.dumps(spdx_document).encode()
+    _write_tar(
+        tmp_path / "sboms.tar.gz",
+        {
+            "corrupt.spdx.json.gz": b"not compressed",
+            "a.spdx.json": spdx_json,
+        },
+    )
+
+    results = run(str(tmp_path / "sboms.tar.gz"))
+
+    assert "could not be read" in results["corrupt.spdx.json.gz"].errors[0]
+    assert results["a.spdx.json"] == check_sbom(spdx_json)
+
+
+def test_run_not_an_archive(tmp_path):
+    (tmp_path / "notes.txt").write_text("not an archive")
+
+    results = run(str(tmp_path / "notes.txt"))
+
+    assert results["notes.txt"].errors != []
+
+
+def test_output_json_format(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    results = {"café.spdx.json": CheckResult([], ["File café is empty."])}
+
+    _output_json(results)
+
+    # the format json.dump wrote before the JSON backends
+    assert (tmp_path / "results.json").read_text() == json.dumps(
+        {
+            name: {"errors": result.errors, "validator_results": []}
+            for name, result in results.items()
+        },
+        indent=4,
+    )
+
+
+def test_output_csv_archive_member(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    _output_csv(
+        {
+            "release/a.spdx.json": CheckResult([], []),
+            "release_a.spdx.json": CheckResult([], []),
+            "release%2Fa.spdx.json": CheckResult([], []),
+        }
+    )
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "release%252Fa.spdx.json_exceptions.csv",
+        "release%2Fa.spdx.json_exceptions.csv",
+        "release_a.spdx.json_exceptions.csv",
+    ]
+
+
+@pytest.mark.parametrize("archived", [False, True])
+def test_run_source_root(tmp_path, archived, spdx_document):
+    (tmp_path / "tree").mkdir()
+    (tmp_path / "tree" / "a.c").write_bytes(b"changed")
+    document = dict(
+        spdx_document,
+        files=[
+            {
+                "SPDXID": "SPDXRef-a",
+                "fileName": "./a.c",
+                "checksums": [
+                    {
+                        "algorithm": "SHA1",
+                        "checksumValue": hashlib.sha1(b"a").hexdigest(),
+                    }
+                ],
+            }
+        ],
+    )
+    spdx_json = json.dumps(document).encode()
+    (tmp_path / "sboms").mkdir()
+    if archived:
+        _write_zip(tmp_path / "sboms.zip", {"a.spdx.json": spdx_json})
+        spdx_root = tmp_path / "sboms.zip"
+    else:
+        (tmp_path / "sboms" / "a.spdx.json").write_bytes(spdx_json)
+        spdx_root = tmp_path / "sboms"
+
+    results = run(str(spdx_root), CheckOptions(source_root=tmp_path / "tree"))
+
+    messages = results["a.spdx.json"].validation_messages
+    assert messages[:-1] == check_sbom(spdx_json).validation_messages
+    assert messages[-1]["spdx_id"] == "SPDXRef-a"
+    assert "SHA1 checksum does not match" in messages[-1]["message"]
+
+    (tmp_path / "tree" / "b.c").write_bytes(b"b")
+    (tmp_path / "tree" / "build").mkdir()
+    (tmp_path / "tree" / "build" / "a.o").write_bytes(b"")
+    results = run(
+        str(spdx_root),
+        CheckOptions(
+            source_root=tmp_path / "tree", coverage=True, excludes=("build",)
+        ),
+    )
+
+    covered = results["a.spdx.json"].validation_messages
+    assert covered[:-1] == messages
+    assert covered[-1]["message"].endswith(
+        "The source tree file b.c is not listed in the document."
+    )
+
+
+def test_main_closes_hash_cache(tmp_path, monkeypatch):
+    (tmp_path / "a.c").write_bytes(b"a")
+    database = tmp_path / "hashes.db"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["sbom-check", str(tmp_path), "--hash-cache", str(database)],
+    )
+
+    def failing_run(_, options, __):
+        options.hash_cache.put(os.stat(tmp_path / "a.c"), {"SHA1": "0" * 40})
+        raise RuntimeError("check failed")
+
+    monkeypatch.setattr(cli_main, "run", failing_run)
+    with pytest.raises(RuntimeError):
+        cli_main.main()
+
+    # the pending digests were written before the exception propagated
+    with FileHashCache(database) as cache:
+        assert len(cache) == 1
@@ -0,0 +1,165 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import itertools
+
+import pytest
+from spdx_tools.spdx.validation.validation_message import SpdxElementType
+
+from sbom_check.checks import (
+    COMPLETENESS_RULES,
+    _check_files,
+    _check_packages,
+    _file_flags,
+    _package_flags,
+    _parse_spdx,
+)
+from sbom_check.columnar import HAS_NUMPY, flag_messages
+from sbom_check.rules import Rule
+
+VECTORIZED = [False, True] if HAS_NUMPY else [False]
+
+
+@pytest.fixture
+def spdx_dict(spdx_document_factory):
+    packages = [
+        {
+            "SPDXID": f"SPDXRef-package-{index}",
+            "name": "package",
+            "downloadLocation": "NOASSERTION",
+            "supplier": supplier,
+            "filesAnalyzed": files_analyzed,
+            "licenseDeclared": license_declared,
+            "copyrightText": copyright_text,
+        }
+        for index, (
+            supplier,
+            files_analyzed,
+            license_declared,
+            copyright_text,
+        ) in enumerate(
+            itertools.product(
+                ["Organization: Qualcomm", "NOASSERTION"],
+                [True, False],
+                ["MIT", "NONE"],
+                ["Copyright (c) Example", ""],
+            )
+        )
+    ]
+    files = [
+        {
+            "SPDXID": f"SPDXRef-file-{index}",
+            "fileName": file_name,
+            "checksums": [{"algorithm": "SHA1", "checksumValue": "0" * 40}],
+            "licenseConcluded": license_concluded,
+            "licenseInfoInFiles": license_info,
+            "copyrightText": copyright_text,
+        }
+        for index, (
+            file_name,
+            license_concluded,
+            license_info,
+            copyright_text,
+        ) in enumerate(
+            itertools.product(
+                ["./file", ""],
+                ["MIT", "NOASSERTION"],
+                [["MIT"], []],
+                ["Copyright (c) Example", ""],
+            )
+        )
+    ]
+    return spdx_document_factory(
+        packages=packages,
+        files=files,
+    )
+
+
+@pytest.mark.parametrize("vectorized", VECTORIZED)
+def test_flag_messages(spdx_dict, vectorized):
+    document = _parse_spdx(spdx_dict)
+
+    packages = flag_messages(
+        COMPLETENESS_RULES.copy(),
+        SpdxElementType.PACKAGE,
+        [package["SPDXID"] for package in spdx_dict["packages"]],
+        bytearray(map(_package_flags, spdx_dict["packages"])),
+        vectorized,
+    )
+    files = flag_messages(
+        COMPLETENESS_RULES.copy(),
+        SpdxElementType.FILE,
+        [file["SPDXID"] for file in spdx_dict["files"]],
+        bytearray(map(_file_flags, spdx_dict["files"])),
+        vectorized,
+    )
+
+    assert packages == _check_packages(document.packages)
+    assert files == _check_files(document.files)
+    assert len(packages) == 20 and len(files) == 16
+
+
+@pytest.mark.parametrize("vectorized", VECTORIZED)
+def test_flag_messages_empty(vectorized):
+    assert (
+        flag_messages(
+            COMPLETENESS_RULES.copy(),
+            SpdxElementType.FILE,
+            [],
+            b"",
+            vectorized,
+        )
+        == []
+    )
+
+
+def test_rule_without_flag():
+    rules = COMPLETENESS_RULES.copy()
+    rules.add(
+        Rule(
+            "file-comment",
+            SpdxElementType.FILE,
+            ("comment",),
+            bool,
+            "This file has no comment.",
+        )
+    )
+
+    with pytest.raises(ValueError):
+        flag_messages(rules, SpdxElementType.FILE, ["SPDXRef-file"], b"\0")
+
+
+@pytest.mark.parametrize("vectorized", VECTORIZED)
+def test_checksum_format(spdx_dict, vectorized):
+    files = spdx_dict["files"][:4]
+    files[0]["checksums"] = [{"algorithm": "SHA1", "checksumValue": "0" * 39}]
+    files[1]["checksums"] = [{"algorithm": "SHA1", "checksumValue": "A" * 40}]
+    files[2]["checksums"].append(
+        {"algorithm": "SHA256", "checksumValue": "0" * 64}
+    )
+    files[3]["checksums"].append(
+        {"algorithm": "SHA3-256", "checksumValue": "0" * 40}
+    )
+    rules = COMPLETENESS_RULES.copy()
+
+    messages = flag_messages(
+        rules,
+        SpdxElementType.FILE,
+        [file["SPDXID"] for file in files],
+        bytearray(map(_file_flags, files)),
+        vectorized,
+    )
+
+    assert [
+        message.context.spdx_id
+        for message in messages
+        if "checksum" in message.validation_message
+    ] == ["SPDXRef-file-0", "SPDXRef-file-1", "SPDXRef-file-3"]
+    assert rules.stats["file-checksum-format"].violations == 3
+    # the model is left to specification validation
+    document = _parse_spdx(spdx_dict | {"files": files})
+    assert not [
+        message
+        for message in _check_files(document.files)
+        if "checksum" in message.validation_message
+    ]
@@ -0,0 +1,101 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import io
+import json
+
+import pytest
+
+from sbom_check import check_sbom
+from sbom_check.checks import (
+    COMPLETENESS_EXCEPTION,
+    PACKAGE_FILES_ANALYZED,
+    PACKAGE_LICENSES,
+    PACKAGE_SUPPLIER,
+)
+from sbom_check.compact import CompactDocument, check_sbom_compact
+from sbom_check.streaming import iter_spdx_json
+
+
+@pytest.fixture
+def spdx_document(spdx_document_factory):
+    return spdx_document_factory(
+        packages=[
+            {
+                "SPDXID": "SPDXRef-package",
+                "name": "package",
+                "downloadLocation": "NOASSERTION",
+                "licenseConcluded": "MIT",
+                "supplier": "Organization: Qualcomm",
+                "hasFiles": ["SPDXRef-file-0", "SPDXRef-missing"],
+            },
+            {
+                "SPDXID": "SPDXRef-file-1",
+                "name": "duplicate",
+                "downloadLocation": "NOASSERTION",
+                "filesAnalyzed": False,
+            },
+        ],
+        files=[
+            {
+                "fileName": f"./file-{index}",
+                "SPDXID": f"SPDXRef-file-{index}",
+                "checksums": [
+                    {
+                        "algorithm": "SHA1",
+                        "checksumValue": "0" * 40,
+                    }
+                ],
+                "licenseConcluded": "MIT",
+                "licenseInfoInFiles": ["MIT"] if index else [],
+            }
+            for index in range(2)
+        ],
+        relationships=[
+            {
+                "spdxElementId": "SPDXRef-package",
+                "relationshipType": "DEPENDS_ON",
+                "relatedSpdxElement": "SPDXRef-other",
+            },
+            {
+                "spdxElementId": "SPDXRef-package",
+                "relationshipType": "DEPENDS_ON",
+                "relatedSpdxElement": "NOASSERTION",
+            },
+        ],
+    )
+
+
+def test_compact_matches_check_sbom(spdx_document):
+    spdx_json = json.dumps(spdx_document)
+    expected = [
+        message
+        for message in check_sbom(spdx_json).validation_messages
+        if message["element_type"] == "SpdxElementType.RELATIONSHIP"
+        or message["message"].startswith(COMPLETENESS_EXCEPTION)
+        or message["spdx_id"] == "SPDXRef-DOCUMENT"
+    ]
+
+    result = check_sbom_compact(io.StringIO(spdx_json))
+
+    assert result.errors == []
+    assert result.validation_messages == expected
+    assert any("must be unique" in message["message"] for message in expected)
+
+
+def test_compact_document_columns(spdx_document):
+    document = CompactDocument.from_pairs(
+        iter_spdx_json(io.StringIO(json.dumps(spdx_document)))
+    )
+
+    assert document.package_ids == ["SPDXRef-package", "SPDXRef-file-1"]
+    assert list(document.package_flags) == [
+        PACKAGE_SUPPLIER | PACKAGE_FILES_ANALYZED | PACKAGE_LICENSES,
+        0,
+    ]
+    assert document.file_ids == ["SPDXRef-file-0", "SPDXRef-file-1"]
+    assert list(document.relationships())[-2:] == [
+        ("SPDXRef-package", "CONTAINS", "SPDXRef-file-0", None),
+        ("SPDXRef-package", "CONTAINS", "SPDXRef-missing", None),
+    ]
+    assert "packages" not in document.header
@@ -0,0 +1,130 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import io
+import json
+
+import pytest
+
+from sbom_check import check_sbom, check_sbom_stream
+from sbom_check.checks import COMPLETENESS_EXCEPTION, COMPLETENESS_RULES
+from sbom_check.compact import check_sbom_compact
+
+CHECKSUM_FORMAT_MESSAGE = COMPLETENESS_EXCEPTION + next(
+    rule.message
+    for rule in COMPLETENESS_RULES
+    if rule.name == "file-checksum-format"
+)
+
+
+@pytest.fixture
+def spdx_json(spdx_document_factory):
+    def package(spdx_id, version, purl):
+        return {
+            "SPDXID": spdx_id,
+            "name": "package",
+            "versionInfo": version,
+            "downloadLocation": "NOASSERTION",
+            "externalRefs": [
+                {
+                    "referenceCategory": "PACKAGE-MANAGER",
+                    "referenceType": "purl",
+                    "referenceLocator": purl,
+                }
+            ],
+        }
+
+    def file(spdx_id, sha1, sha256=None, file_name="./file"):
+        checksums = [{"algorithm": "SHA1", "checksumValue": sha1}]
+        if sha256:
+            checksums.append({"algorithm": "SHA256", "checksumValue": sha256})
+        return {
+            "fileName": file_name,
+            "SPDXID": spdx_id,
+            "checksums": checksums,
+        }
+
+    document = spdx_document_factory(
+        documentDescribes=["SPDXRef-a"],
+        packages=[
+            package("SPDXRef-a", "1.0", "pkg:pypi/a@1.0"),
+            package("SPDXRef-b", "1.0", "pkg:pypi/b@1.0"),
+            package("SPDXRef-c", "1.0", "pkg:pypi/a@1.0"),
+            package("SPDXRef-d", "2.0", "pkg:pypi/a@1.0"),
+        ],
+        files=[
+            file("SPDXRef-f0", "a" * 40),
+            file("SPDXRef-f1", "A" * 40, file_name="file"),
+            file("SPDXRef-f2", "a" * 40, "b" * 64),
+            # equal contents under another name, such as empty files
+            file("SPDXRef-f3", "a" * 40, file_name="./other/file"),
+            file("SPDXRef-a", "c" * 40),
+        ],
+    )
+    return json.dumps(document)
+
+
+def test_duplicates(spdx_json):
+    messages = [
+        (message["spdx_id"], message["message"])
+        for message in check_sbom(spdx_json).validation_messages
+        if message["message"].startswith(COMPLETENESS_EXCEPTION)
+        and ("same" in message["message"] or "already" in message["message"])
+    ]
+
+    assert messages == [
+        (
+            "SPDXRef-c",
+            COMPLETENESS_EXCEPTION
+            + "This package has the same name, version and purl as SPDXRef-a.",
+        ),
+        (
+            "SPDXRef-f1",
+            COMPLETENESS_EXCEPTION
+            + "This file has the same name and checksums as SPDXRef-f0.",
+        ),
+        (
+            "SPDXRef-a",
+            COMPLETENESS_EXCEPTION
+            + "This SPDX ID is already used by another element.",
+        ),
+    ]
+
+
+def test_duplicates_without_model(spdx_json):
+    expected = [
+        message
+        for message in check_sbom(spdx_json).validation_messages
+        if message["message"].startswith(COMPLETENESS_EXCEPTION)
+    ]
+
+    assert (
+        _without_checksum_format(
+            check_sbom(spdx_json, completeness_only=True).validation_messages
+        )
+        == expected
+    )
+    assert [
+        message
+        for message in _without_checksum_format(
+            check_sbom_compact(io.StringIO(spdx_json)).validation_messages
+        )
+        if message["message"].startswith(COMPLETENESS_EXCEPTION)
+    ] == expected
+
+
+def test_duplicates_streamed(spdx_json):
+    result = check_sbom_stream(io.StringIO(spdx_json))
+
+    assert (
+        result.validation_messages == check_sbom(spdx_json).validation_messages
+    )
+
+
+def _without_checksum_format(messages):
+    # specification validation checks the checksum values of the model
+    return [
+        message
+        for message in messages
+        if message["message"] != CHECKSUM_FORMAT_MESSAGE
+    ]
@@ -0,0 +1,90 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+
+import pytest
+
+from sbom_check import ModelOptions, check_sbom
+from sbom_check.flyweight import (
+    ACTORS,
+    LICENSE_EXPRESSIONS,
+    STRINGS,
+    Flyweights,
+)
+
+
+@pytest.fixture
+def spdx_document(spdx_document_factory):
+    return spdx_document_factory(
+        documentDescribes=["SPDXRef-package-0"],
+        packages=[
+            {
+                "SPDXID": f"SPDXRef-package-{index}",
+                "name": "package",
+                "downloadLocation": "NOASSERTION",
+                "licenseConcluded": "MIT OR Apache-2.0",
+                "supplier": "Organization: Qualcomm",
+                "filesAnalyzed": False,
+            }
+            for index in range(3)
+        ],
+        files=[
+            {
+                "fileName": f"./file-{index}",
+                "SPDXID": f"SPDXRef-file-{index}",
+                "checksums": [
+                    {"algorithm": "SHA1", "checksumValue": f"{index:040}"}
+                ],
+                "licenseConcluded": "MIT OR Apache-2.0",
+                "licenseInfoInFiles": ["MIT", "NOASSERTION"],
+            }
+            for index in range(3)
+        ],
+    )
+
+
+def test_flyweights_match_check_sbom(spdx_document):
+    spdx_json = json.dumps(spdx_document)
+    flyweights = Flyweights()
+
+    assert check_sbom(
+        spdx_json, options=ModelOptions(flyweights=flyweights)
+    ) == check_sbom(spdx_json)
+    assert flyweights.saved[STRINGS] > 0
+    # the creator and the three suppliers are the same organization
+    assert flyweights.saved[ACTORS] == 3
+    assert flyweights.saved[LICENSE_EXPRESSIONS] > 0
+
+
+def test_flyweights_share_instances(spdx_document):
+    document = Flyweights().parse(spdx_document)
+
+    first, *others = document.packages
+    for package in others:
+        assert package.name is first.name
+        assert package.supplier is first.supplier
+        assert package.license_concluded is first.license_concluded
+    assert document.files[1].license_concluded is first.license_concluded
+
+
+def test_flyweights_accumulate_across_documents(spdx_document):
+    flyweights = Flyweights()
+    flyweights.parse(spdx_document)
+    saved = flyweights.saved.copy()
+
+    flyweights.parse(spdx_document)
+
+    assert flyweights.saved == saved + saved
+
+
+def test_intern_in_place(spdx_document):
+    packages = spdx_document["packages"]
+    for package in packages:
+        # equal names that are not yet the same instance
+        package["name"] = "".join(["pack", "age"])
+    first = packages[0]["name"]
+
+    assert Flyweights().intern(spdx_document) is spdx_document
+    assert spdx_document["packages"] is packages
+    assert all(package["name"] is first for package in packages)
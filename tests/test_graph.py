@@ -0,0 +1,119 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+from spdx_tools.spdx.model.relationship import Relationship, RelationshipType
+from spdx_tools.spdx.model.spdx_no_assertion import SpdxNoAssertion
+
+from sbom_check.checks import COMPLETENESS_EXCEPTION, _parse_spdx
+from sbom_check.deep import check_deep
+from sbom_check.graph import RelationshipGraph
+
+DEPENDS_ON = RelationshipType.DEPENDS_ON
+DEPENDENCY_OF = RelationshipType.DEPENDENCY_OF
+CONTAINS = RelationshipType.CONTAINS
+
+
+def test_adjacency():
+    relationships = [
+        Relationship("SPDXRef-a", DEPENDS_ON, "SPDXRef-b"),
+        Relationship("SPDXRef-c", DEPENDENCY_OF, "SPDXRef-a"),
+        Relationship("SPDXRef-a", DEPENDS_ON, SpdxNoAssertion()),
+        Relationship("SPDXRef-d", CONTAINS, "SPDXRef-e"),
+    ]
+    graph = RelationshipGraph(relationships)
+
+    assert graph.relationships(DEPENDS_ON) == [
+        relationships[0],
+        relationships[2],
+    ]
+    assert graph.relationships(RelationshipType.DESCRIBES) == []
+    assert graph.successors(DEPENDS_ON, "SPDXRef-a") == [
+        "SPDXRef-b",
+        "SPDXRef-c",
+    ]
+    assert graph.connected(["SPDXRef-b"]) == {
+        "SPDXRef-a",
+        "SPDXRef-b",
+        "SPDXRef-c",
+    }
+    assert relationships[1] in graph
+    assert Relationship("SPDXRef-a", DEPENDENCY_OF, "SPDXRef-c") not in graph
+    assert (
+        Relationship("SPDXRef-e", RelationshipType.CONTAINED_BY, "SPDXRef-d")
+        in graph
+    )
+    assert relationships[2] not in graph
+
+
+def test_cycles():
+    graph = RelationshipGraph(
+        [
+            Relationship("SPDXRef-a", DEPENDS_ON, "SPDXRef-b"),
+            Relationship("SPDXRef-b", DEPENDS_ON, "SPDXRef-c"),
+            Relationship("SPDXRef-a", DEPENDENCY_OF, "SPDXRef-c"),
+            Relationship("SPDXRef-c", DEPENDS_ON, "SPDXRef-d"),
+            Relationship("SPDXRef-d", DEPENDS_ON, "SPDXRef-d"),
+            Relationship("SPDXRef-e", DEPENDS_ON, "SPDXRef-a"),
+        ]
+    )
+
+    assert graph.cycles(DEPENDS_ON) == [
+        ["SPDXRef-d"],
+        ["SPDXRef-a", "SPDXRef-b", "SPDXRef-c"],
+    ]
+
+
+def test_long_cycle():
+    length = 10_000
+    graph = RelationshipGraph(
+        Relationship(f"SPDXRef-{index}", DEPENDS_ON, f"SPDXRef-{index + 1}")
+        for index in range(length)
+    )
+    assert graph.cycles(DEPENDS_ON) == []
+
+    graph.add(Relationship(f"SPDXRef-{length}", DEPENDS_ON, "SPDXRef-0"))
+    (cycle,) = graph.cycles(DEPENDS_ON)
+    assert len(cycle) == length + 1
+
+
+def test_deep_checks(spdx_document_factory):
+    document = _parse_spdx(
+        spdx_document_factory(
+            packages=[
+                {
+                    "SPDXID": f"SPDXRef-package-{index}",
+                    "name": "package",
+                    "downloadLocation": "NOASSERTION",
+                }
+                for index in range(2)
+            ],
+            relationships=[
+                {
+                    "spdxElementId": f"SPDXRef-package-{source}",
+                    "relationshipType": "DEPENDS_ON",
+                    "relatedSpdxElement": f"SPDXRef-package-{1 - source}",
+                }
+                for source in range(2)
+            ]
+            + [
+                {
+                    "spdxElementId": "SPDXRef-missing",
+                    "relationshipType": "CONTAINED_BY",
+                    "relatedSpdxElement": "SPDXRef-package-0",
+                }
+            ],
+        )
+    )
+    graph = RelationshipGraph(document.relationships)
+
+    # the reference to SPDXRef-missing is left to specification validation
+    assert [
+        (message.context.spdx_id, message.validation_message)
+        for message in check_deep(document, graph)
+    ] == [
+        (
+            "SPDXRef-package-0",
+            COMPLETENESS_EXCEPTION + "These elements depend on each other in "
+            "a cycle: SPDXRef-package-0, SPDXRef-package-1.",
+        ),
+    ]
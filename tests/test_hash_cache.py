@@ -0,0 +1,105 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import hashlib
+import io
+import json
+import os
+
+from sbom_check import source_tree, verify_source_tree
+from sbom_check.hash_cache import FileHashCache
+
+DIGESTS = {"SHA1": "0" * 40, "SHA256": "1" * 64}
+
+
+def test_round_trip(tmp_path):
+    (tmp_path / "a").write_bytes(b"a")
+    stat = os.stat(tmp_path / "a")
+
+    with FileHashCache(tmp_path / "cache.db") as cache:
+        assert cache.get(stat, ["SHA1"]) is None
+        cache.put(stat, DIGESTS)
+        assert cache.get(stat, ["SHA1", "SHA256"]) == DIGESTS
+        assert cache.get(stat, ["SHA1", "MD5"]) is None
+        assert (cache.hits, cache.misses, cache.hit_rate) == (1, 2, 1 / 3)
+
+    with FileHashCache(tmp_path / "cache.db") as cache:
+        assert cache.get(stat, ["SHA256"]) == DIGESTS
+        # a changed file has a new modification time or size
+        os.utime(tmp_path / "a", ns=(0, stat.st_mtime_ns + 1))
+        assert cache.get(os.stat(tmp_path / "a"), ["SHA256"]) is None
+        (tmp_path / "a").write_bytes(b"ab")
+        assert cache.get(os.stat(tmp_path / "a"), ["SHA256"]) is None
+
+
+def test_digests_merged(tmp_path):
+    (tmp_path / "a").write_bytes(b"a")
+    stat = os.stat(tmp_path / "a")
+
+    with FileHashCache(tmp_path / "cache.db") as cache:
+        cache.put(stat, {"SHA1": DIGESTS["SHA1"]})
+    with FileHashCache(tmp_path / "cache.db") as cache:
+        cache.put(stat, {"SHA256": DIGESTS["SHA256"]})
+        assert cache.get(stat, ["SHA1", "SHA256"]) == DIGESTS
+        # digests of an older version of the file are not kept
+        os.utime(tmp_path / "a", ns=(0, stat.st_mtime_ns + 1))
+        changed = os.stat(tmp_path / "a")
+        cache.put(changed, {"SHA256": DIGESTS["SHA256"]})
+        assert cache.get(changed, ["SHA1"]) is None
+
+
+def test_eviction(tmp_path):
+    stats = {}
+    for name in "abc":
+        (tmp_path / name).write_bytes(name.encode())
+        stats[name] = os.stat(tmp_path / name)
+    with FileHashCache(tmp_path / "cache.db") as cache:
+        cache.put(stats["a"], DIGESTS)
+        cache.put(stats["b"], DIGESTS)
+
+    with FileHashCache(tmp_path / "cache.db", max_entries=2) as cache:
+        assert cache.get(stats["a"], ["SHA1"]) == DIGESTS
+        cache.put(stats["c"], DIGESTS)
+        assert len(cache) == 3
+
+    with FileHashCache(tmp_path / "cache.db") as cache:
+        assert len(cache) == 2
+        assert cache.get(stats["b"], ["SHA1"]) is None
+        assert cache.get(stats["a"], ["SHA1"]) == DIGESTS
+        assert cache.get(stats["c"], ["SHA1"]) == DIGESTS
+
+
+def test_verify_source_tree_cached(tmp_path, monkeypatch):
+    files = []
+    for index in range(10):
+        content = str(index).encode()
+        (tmp_path / f"{index}.c").write_bytes(content)
+        files.append(
+            {
+                "SPDXID": f"SPDXRef-{index}",
+                "fileName": f"./{index}.c",
+                "checksums": [
+                    {
+                        "algorithm": "SHA1",
+                        "checksumValue": hashlib.sha1(content).hexdigest(),
+                    }
+                ],
+            }
+        )
+    spdx_json = json.dumps({"files": files})
+    with FileHashCache(tmp_path / "cache.db") as cache:
+        assert (
+            verify_source_tree(io.StringIO(spdx_json), tmp_path, 2, cache)
+            == []
+        )
+
+    def not_hashed(*_):
+        raise AssertionError("an unchanged file was hashed again")
+
+    monkeypatch.setattr(source_tree, "_hash", not_hashed)
+    with FileHashCache(tmp_path / "cache.db") as cache:
+        assert (
+            verify_source_tree(io.StringIO(spdx_json), tmp_path, 2, cache)
+            == []
+        )
+        assert (cache.hits, cache.misses) == (10, 0)
@@ -0,0 +1,100 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import copy
+import io
+import json
+
+import pytest
+
+from cli.main import CheckOptions, run
+from sbom_check import Snapshot, check_sbom_incremental, check_sbom_stream
+
+
+@pytest.fixture
+def spdx_document(spdx_document_factory):
+    return spdx_document_factory(
+        documentDescribes=["SPDXRef-package"],
+        packages=[
+            {
+                "SPDXID": "SPDXRef-package",
+                "name": "package",
+                "downloadLocation": "NOASSERTION",
+                "licenseConcluded": "MIT",
+            }
+        ],
+        files=[
+            {
+                "fileName": f"./file-{index}",
+                "SPDXID": f"SPDXRef-file-{index}",
+                "checksums": [{"algorithm": "SHA1", "checksumValue": "bad"}],
+                "licenseConcluded": "MIT",
+            }
+            for index in range(3)
+        ],
+        relationships=[
+            {
+                "spdxElementId": "SPDXRef-package",
+                "relationshipType": "CONTAINS",
+                "relatedSpdxElement": f"SPDXRef-file-{index}",
+            }
+            for index in range(3)
+        ],
+    )
+
+
+def _stream(document):
+    return io.BytesIO(json.dumps(document).encode())
+
+
+def test_incremental_matches_full_check(spdx_document):
+    _, snapshot = check_sbom_incremental(_stream(spdx_document))
+    changed = copy.deepcopy(spdx_document)
+    changed["files"][0]["fileName"] = "/absolute"
+    del changed["files"][1]
+    changed["files"].append(dict(changed["files"][1], SPDXID="SPDXRef-new"))
+    changed["packages"][0]["supplier"] = "NOASSERTION"
+
+    result, new_snapshot = check_sbom_incremental(_stream(changed), snapshot)
+
+    assert result == check_sbom_stream(_stream(changed))
+    assert set(new_snapshot.entries) == {
+        "SPDXRef-package",
+        "SPDXRef-file-0",
+        "SPDXRef-file-2",
+        "SPDXRef-new",
+    }
+    assert new_snapshot.entries["SPDXRef-file-2"] == (
+        snapshot.entries["SPDXRef-file-2"]
+    )
+    assert new_snapshot.entries["SPDXRef-file-0"] != (
+        snapshot.entries["SPDXRef-file-0"]
+    )
+
+
+def test_snapshot_save_and_load(tmp_path, spdx_document):
+    _, snapshot = check_sbom_incremental(_stream(spdx_document))
+    snapshot.save(tmp_path / "sbom.snapshot.json")
+
+    loaded = Snapshot.load(tmp_path / "sbom.snapshot.json")
+
+    assert loaded == snapshot
+    assert Snapshot.load(tmp_path / "missing.json") == Snapshot()
+
+
+def test_run_with_snapshot_dir(tmp_path, spdx_document):
+    sboms = tmp_path / "sboms"
+    sboms.mkdir()
+    options = CheckOptions(snapshot_dir=tmp_path / "snapshots")
+    (sboms / "sbom.spdx.json").write_text(json.dumps(spdx_document))
+    first = run(str(sboms), options)
+    spdx_document["files"][0]["fileName"] = "/absolute"
+    (sboms / "sbom.spdx.json").write_text(json.dumps(spdx_document))
+
+    second = run(str(sboms), options)
+
+    assert (tmp_path / "snapshots" / "sbom.spdx.json.snapshot.json").is_file()
+    assert first != second
+    assert second["sbom.spdx.json"] == check_sbom_stream(
+        _stream(spdx_document)
+    )
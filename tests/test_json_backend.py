@@ -0,0 +1,45 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+
+import pytest
+
+from sbom_check.json_backend import BACKENDS, STDLIB, get_backend
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_backend_round_trip(name):
+    backend = get_backend(name)
+    document = {"name": "café", "packages": [{"SPDXID": "a"}]}
+    encoded = backend.dumps(document)
+
+    assert isinstance(encoded, bytes)
+    assert backend.loads(encoded) == document
+    assert backend.loads(memoryview(encoded)) == document
+    assert backend.loads(encoded.decode("utf-8")) == document
+
+
+def test_backends_encode_alike():
+    document = {
+        "name": "café",
+        "packages": [{"SPDXID": "a", "files": [], "rate": 0.1}],
+        "annotations": {},
+        "valid": None,
+    }
+
+    for indent in (2, 4):
+        encoded = {
+            backend.dumps(document, indent) for backend in BACKENDS.values()
+        }
+        assert encoded == {json.dumps(document, indent=indent).encode()}
+
+
+def test_default_backend_is_installed():
+    assert get_backend().name in BACKENDS
+    assert STDLIB in BACKENDS
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend("simdjson")
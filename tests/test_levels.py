@@ -0,0 +1,95 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+
+import pytest
+
+from sbom_check import check_sbom, check_sbom_level
+from sbom_check.checks import COMPLETENESS_EXCEPTION
+from sbom_check.levels import COMPLETENESS, DEEP, FULL, STRUCTURAL
+
+
+@pytest.fixture
+def spdx_json(spdx_document_factory):
+    document = spdx_document_factory(
+        license_list_version="3.20",
+        documentDescribes=["SPDXRef-package"],
+        packages=[
+            {
+                "SPDXID": "SPDXRef-package",
+                "name": "package",
+                "downloadLocation": "NOASSERTION",
+                "supplier": "Organization: Qualcomm",
+                "hasFiles": ["SPDXRef-file-0"],
+            }
+        ],
+        files=[
+            {
+                "fileName": f"./file-{index}",
+                "SPDXID": f"SPDXRef-file-{index}",
+                "checksums": [
+                    {"algorithm": "SHA1", "checksumValue": "0" * 40}
+                ],
+            }
+            for index in range(3)
+        ],
+        relationships=[
+            {
+                "spdxElementId": "SPDXRef-file-1",
+                "relationshipType": "CONTAINED_BY",
+                "relatedSpdxElement": "SPDXRef-package",
+            },
+            {
+                "spdxElementId": "SPDXRef-package",
+                "relationshipType": "DEPENDS_ON",
+                "relatedSpdxElement": "SPDXRef-missing",
+            },
+        ],
+    )
+    return json.dumps(document)
+
+
+def test_structural(spdx_json):
+    result = check_sbom_level(spdx_json, STRUCTURAL)
+
+    assert result.validation_messages == [
+        message
+        for message in check_sbom(spdx_json).validation_messages
+        if message["element_type"] == "SpdxElementType.RELATIONSHIP"
+    ]
+    assert len(result.validation_messages) == 1
+
+
+def test_completeness(spdx_json):
+    result = check_sbom_level(spdx_json, COMPLETENESS)
+
+    assert result == check_sbom(spdx_json, completeness_only=True)
+
+
+def test_deep(spdx_json):
+    full = check_sbom_level(spdx_json, FULL).validation_messages
+    deep = check_sbom_level(spdx_json, DEEP).validation_messages
+
+    assert full == check_sbom(spdx_json).validation_messages
+    assert deep[: len(full)] == full
+    assert [
+        (message["spdx_id"], message["message"])
+        for message in deep[len(full) :]
+    ] == [
+        (
+            "SPDXRef-file-2",
+            COMPLETENESS_EXCEPTION
+            + "This file is not contained in any package.",
+        ),
+        (
+            "SPDXRef-file-2",
+            COMPLETENESS_EXCEPTION + "This file is not connected to the "
+            "described elements by any relationship.",
+        ),
+    ]
+
+
+def test_unknown_level(spdx_json):
+    with pytest.raises(ValueError):
+        check_sbom_level(spdx_json, "quick")
@@ -0,0 +1,187 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+
+import pytest
+
+from sbom_check import license_list
+from sbom_check.checks import COMPLETENESS_EXCEPTION
+from sbom_check.levels import DEEP, check_sbom_level
+
+
+@pytest.fixture
+def data_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(license_list, "DATA_DIRECTORY", tmp_path)
+    _clear_caches()
+    license_list.compile_license_list(
+        "3.20", ["MIT", "GPL-2.0-only", "0BSD"], ["LLVM-exception"], tmp_path
+    )
+    license_list.compile_license_list(
+        "3.21",
+        ["MIT", "GPL-2.0-only", "Apache-2.0", "X11"],
+        ["LLVM-exception", "Classpath-exception-2.0"],
+        tmp_path,
+    )
+    license_list.compile_license_list(
+        "3.23",
+        ["MIT", "GPL-2.0-only", "Apache-2.0", "X11", "BSD-2-Clause"],
+        ["LLVM-exception", "Classpath-exception-2.0"],
+        tmp_path,
+    )
+    yield tmp_path
+    _clear_caches()
+
+
+def _clear_caches():
+    license_list.versions.cache_clear()
+    license_list.license_list.cache_clear()
+    license_list.listed_versions.cache_clear()
+
+
+def test_license_list(data_directory):
+    table = license_list.license_list("3.20")
+
+    assert table.version == "3.20"
+    assert len(table) == 4
+    assert table.is_license("MIT") and table.is_license("gpl-2.0-ONLY")
+    assert table.is_license("0BSD") and not table.is_license("Apache-2.0")
+    assert table.is_exception("LLVM-exception")
+    assert not table.is_license("LLVM-exception")
+    assert not table.is_exception("MIT")
+    assert license_list.license_list("3.22") is None
+    assert license_list.license_list("../3.20") is None
+    assert license_list.listed_versions("x11") == ["3.21", "3.23"]
+    assert license_list.listed_versions("MIT") == ["3.20", "3.21", "3.23"]
+    assert license_list.listed_versions("LLVM-exception") == []
+    assert license_list.listed_versions("LLVM-exception", True) == [
+        "3.20",
+        "3.21",
+        "3.23",
+    ]
+    assert license_list.nearest_license_list("3.21").version == "3.21"
+    assert license_list.nearest_license_list("3.22").version == "3.21"
+    assert license_list.nearest_license_list("4.0").version == "3.23"
+    assert license_list.nearest_license_list("3.19") is None
+
+
+def test_bundled_license_lists():
+    assert {"3.20", "3.23", "3.27"} <= license_list.versions()
+    # IDs added to, and deprecated IDs kept in, later versions
+    assert license_list.listed_versions("any-OSI")[0] == "3.25"
+    assert license_list.listed_versions("GPL-2.0")[0] == "3.20"
+    assert "3.20" not in license_list.listed_versions(
+        "asterisk-linking-protocols-exception", True
+    )
+    assert license_list.version_key("3.9") < license_list.version_key("3.10")
+
+
+@pytest.fixture
+def license_list_messages(data_directory, spdx_document_factory):
+    def messages(license_list_version):
+        document = spdx_document_factory(
+            license_list_version=license_list_version,
+            documentDescribes=["SPDXRef-package"],
+            packages=[
+                {
+                    "SPDXID": "SPDXRef-package",
+                    "name": "package",
+                    "downloadLocation": "NOASSERTION",
+                    "supplier": "Organization: Qualcomm",
+                    "licenseConcluded": "MIT AND Apache-2.0",
+                    "licenseDeclared": "Apache-2.0 OR Unknown-1.0",
+                    "copyrightText": "Copyright (c) Example",
+                    "hasFiles": ["SPDXRef-file"],
+                }
+            ],
+            files=[
+                {
+                    "fileName": "./file",
+                    "SPDXID": "SPDXRef-file",
+                    "checksums": [
+                        {"algorithm": "SHA1", "checksumValue": "0" * 40}
+                    ],
+                    "licenseConcluded": "GPL-2.0-only WITH "
+                    "Classpath-exception-2.0",
+                    "licenseInfoInFiles": [
+                        "mit",
+                        "0BSD",
+                        "LicenseRef-x",
+                        "X11",
+                        "BSD-2-Clause",
+                    ],
+                    "copyrightText": "Copyright (c) Example",
+                }
+            ],
+        )
+        return [
+            (message["spdx_id"], message["message"])
+            for message in check_sbom_level(
+                json.dumps(document), DEEP
+            ).validation_messages
+            if "SPDX license list" in message["message"]
+        ]
+
+    return messages
+
+
+def test_check_license_list(license_list_messages):
+    # each ID is reported with the first version that has it
+    assert license_list_messages("3.20") == [
+        (
+            "SPDXRef-package",
+            COMPLETENESS_EXCEPTION + "Apache-2.0 is not in version 3.20 of "
+            "the SPDX license list that the document declares, but was added "
+            "in version 3.21.",
+        ),
+        (
+            "SPDXRef-package",
+            COMPLETENESS_EXCEPTION + "Apache-2.0 is not in version 3.20 of "
+            "the SPDX license list that the document declares, but was added "
+            "in version 3.21.",
+        ),
+        (
+            "SPDXRef-file",
+            COMPLETENESS_EXCEPTION + "Classpath-exception-2.0 is not in "
+            "version 3.20 of the SPDX license list that the document "
+            "declares, but was added in version 3.21.",
+        ),
+        (
+            "SPDXRef-file",
+            COMPLETENESS_EXCEPTION + "X11 is not in version 3.20 of the SPDX "
+            "license list that the document declares, but was added in "
+            "version 3.21.",
+        ),
+        (
+            "SPDXRef-file",
+            COMPLETENESS_EXCEPTION + "BSD-2-Clause is not in version 3.20 of "
+            "the SPDX license list that the document declares, but was added "
+            "in version 3.23.",
+        ),
+    ]
+
+
+def test_check_license_list_not_bundled(license_list_messages):
+    # 3.22 is checked against 3.21, for IDs added after 3.22
+    assert license_list_messages("3.22") == [
+        (
+            "SPDXRef-file",
+            COMPLETENESS_EXCEPTION + "0BSD is not in version 3.22 of the SPDX "
+            "license list that the document declares, but was last in "
+            "version 3.20.",
+        ),
+        (
+            "SPDXRef-file",
+            COMPLETENESS_EXCEPTION + "BSD-2-Clause is not in version 3.22 of "
+            "the SPDX license list that the document declares, but was added "
+            "in version 3.23.",
+        ),
+    ]
+    assert license_list_messages("3.19") == [
+        (
+            "SPDXRef-DOCUMENT",
+            COMPLETENESS_EXCEPTION + "The document declares version 3.19 of "
+            "the SPDX license list, which is older than every bundled "
+            "version, so its license IDs are not checked against it.",
+        ),
+    ]
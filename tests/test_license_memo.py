@@ -0,0 +1,132 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+import threading
+
+import pytest
+from spdx_tools.spdx.validation import package_validator
+
+from sbom_check import ModelOptions, check_sbom
+from sbom_check.checks import _parse_spdx
+from sbom_check.license_memo import LicenseExpressionMemo
+
+LICENSES = [
+    "MIT",
+    "MIT OR Apache-2.0",
+    "LicenseRef-extracted AND LicenseRef-unknown",
+    "DocumentRef-missing:LicenseRef-x OR DocumentRef-ext:Foo",
+    "a:b:c",
+    "Classpath-exception-2.0",
+]
+
+
+@pytest.fixture
+def spdx_document(spdx_document_factory):
+    return spdx_document_factory(
+        externalDocumentRefs=[
+            {
+                "externalDocumentId": "DocumentRef-ext",
+                "spdxDocument": "http://spdx.org/spdxdocs/ext",
+                "checksum": {"algorithm": "SHA1", "checksumValue": "0" * 40},
+            }
+        ],
+        hasExtractedLicensingInfos=[
+            {"licenseId": "LicenseRef-extracted", "extractedText": "text"}
+        ],
+        documentDescribes=["SPDXRef-package-0"],
+        packages=[
+            {
+                "SPDXID": f"SPDXRef-package-{index}",
+                "name": "package",
+                "downloadLocation": "NOASSERTION",
+                "licenseConcluded": license,
+                "licenseDeclared": license,
+                "filesAnalyzed": False,
+            }
+            for index, license in enumerate(LICENSES)
+        ],
+        files=[
+            {
+                "fileName": f"./file-{index}",
+                "SPDXID": f"SPDXRef-file-{index}",
+                "checksums": [
+                    {"algorithm": "SHA1", "checksumValue": f"{index:040}"}
+                ],
+                "licenseConcluded": license,
+                "licenseInfoInFiles": [license, "NOASSERTION"],
+            }
+            for index, license in enumerate(LICENSES)
+        ],
+    )
+
+
+def test_license_memo_matches_check_sbom(spdx_document):
+    spdx_json = json.dumps(spdx_document)
+    memo = LicenseExpressionMemo()
+
+    expected = check_sbom(spdx_json)
+    assert (
+        check_sbom(spdx_json, options=ModelOptions(license_memo=memo))
+        == expected
+    )
+    assert any(
+        "Unrecognized license reference" in message["message"]
+        for message in expected.validation_messages
+    )
+    misses = memo.misses
+
+    assert (
+        check_sbom(spdx_json, options=ModelOptions(license_memo=memo))
+        == expected
+    )
+    assert memo.misses == misses
+    assert memo.hit_rate > 0.5
+
+
+def test_license_memo_validates_per_document(spdx_document):
+    memo = LicenseExpressionMemo()
+    check_sbom(
+        json.dumps(spdx_document), options=ModelOptions(license_memo=memo)
+    )
+    spdx_document["hasExtractedLicensingInfos"][0][
+        "licenseId"
+    ] = "LicenseRef-unknown"
+    spdx_json = json.dumps(spdx_document)
+
+    assert check_sbom(
+        spdx_json, options=ModelOptions(license_memo=memo)
+    ) == check_sbom(spdx_json)
+
+
+def test_license_memo_bounded():
+    memo = LicenseExpressionMemo(max_entries=2)
+    for license in LICENSES:
+        memo.parse(license)
+
+    assert len(memo) == 2
+    assert memo.parse(LICENSES[-1]) is memo.parse(LICENSES[-1])
+    assert memo.hits == 2
+
+
+def test_license_memo_installed_per_thread(spdx_document):
+    document = _parse_spdx(spdx_document)
+    memo = LicenseExpressionMemo()
+
+    def validate():
+        package_validator.validate_license_expression(
+            document.packages[0].license_concluded,
+            document,
+            document.packages[0].spdx_id,
+        )
+
+    with memo.installed():
+        thread = threading.Thread(target=validate)
+        thread.start()
+        thread.join()
+        assert memo.misses == 0
+        validate()
+        assert memo.misses == 1
+
+    validate()
+    assert memo.misses == 1
@@ -0,0 +1,115 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import io
+import json
+
+import pytest
+
+from sbom_check import check_sbom_stream
+from sbom_check.memo import ElementMemo, MemoEntry
+
+
+@pytest.fixture
+def spdx_document(spdx_document_factory):
+    return spdx_document_factory(
+        documentDescribes=["SPDXRef-package"],
+        packages=[
+            {
+                "SPDXID": "SPDXRef-package",
+                "name": "package",
+                "downloadLocation": "NOASSERTION",
+                "filesAnalyzed": False,
+                "licenseConcluded": "MIT",
+                "hasFiles": ["SPDXRef-file-1"],
+            }
+        ],
+        files=[
+            {
+                "fileName": f"/file-{index % 2}",
+                "SPDXID": f"SPDXRef-file-{index}",
+                "checksums": [{"algorithm": "SHA1", "checksumValue": "bad"}],
+                "licenseConcluded": "MIT",
+            }
+            for index in range(4)
+        ],
+        snippets=[
+            {
+                "SPDXID": "SPDXRef-snippet",
+                "snippetFromFile": "SPDXRef-missing",
+                "ranges": [
+                    {
+                        "startPointer": {
+                            "offset": 1,
+                            "reference": "SPDXRef-missing",
+                        },
+                        "endPointer": {
+                            "offset": 2,
+                            "reference": "SPDXRef-missing",
+                        },
+                    }
+                ],
+            }
+        ],
+    )
+
+
+def _check(document, memo=None):
+    return check_sbom_stream(
+        io.BytesIO(json.dumps(document).encode()), memo=memo
+    )
+
+
+def test_memo_matches_uncached(spdx_document):
+    memo = ElementMemo()
+    expected = _check(spdx_document)
+
+    first = _check(spdx_document, memo)
+    second = _check(spdx_document, memo)
+
+    assert first == second == expected
+    assert first.validation_messages != []
+    assert (memo.hits, memo.misses) == (8, 4)
+
+
+def test_memo_rebinds_spdx_ids(spdx_document):
+    memo = ElementMemo()
+    _check(spdx_document, memo)
+    renamed = json.loads(
+        json.dumps(spdx_document).replace("SPDXRef-file", "SPDXRef-other")
+    )
+
+    assert _check(renamed, memo) == _check(renamed)
+    assert memo.hits > 0
+
+
+def test_memo_scope(spdx_document):
+    memo = ElementMemo()
+    _check(spdx_document, memo)
+    spdx_document["SPDXID"] = "SPDXRef-DOCUMENT-2"
+    spdx_document["documentDescribes"] = []
+
+    assert _check(spdx_document, memo) == _check(spdx_document)
+    assert memo.misses == 8
+
+
+def test_memo_save_and_load(tmp_path, spdx_document):
+    memo = ElementMemo()
+    _check(spdx_document, memo)
+    memo.save(tmp_path / "memo.json")
+
+    loaded = ElementMemo.load(tmp_path / "memo.json")
+
+    assert len(loaded) == len(memo)
+    assert _check(spdx_document, loaded) == _check(spdx_document)
+    assert loaded.misses == 0
+
+
+def test_memo_lru_bound():
+    memo = ElementMemo(max_entries=1)
+    memo.put("a", MemoEntry("SPDXRef-a", ()))
+    memo.put("b", MemoEntry("SPDXRef-b", ()))
+
+    assert memo.get("a", "SPDXRef-c") is None
+    assert memo.get("b", "SPDXRef-c") == MemoEntry("SPDXRef-c", ())
+    assert len(ElementMemo.load("missing.json")) == 0
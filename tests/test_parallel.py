@@ -0,0 +1,84 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+
+import pytest
+
+from sbom_check import ModelOptions, check_sbom
+from sbom_check.checks import _parse_spdx
+from sbom_check.parallel import validate_document_parallel
+from sbom_check.validation import validate_document_indexed
+
+
+@pytest.fixture
+def spdx_document(spdx_document_factory):
+    return spdx_document_factory(
+        documentDescribes=["SPDXRef-package"],
+        packages=[
+            {
+                "SPDXID": "SPDXRef-package",
+                "name": "package",
+                "downloadLocation": "NOASSERTION",
+                "filesAnalyzed": False,
+                "hasFiles": ["SPDXRef-file-1"],
+            }
+        ],
+        files=[
+            {
+                "fileName": f"./file-{index}",
+                "SPDXID": f"SPDXRef-file-{index}",
+                "checksums": [
+                    {
+                        "algorithm": "SHA1",
+                        "checksumValue": f"{index:040}" if index % 3 else "",
+                    }
+                ],
+                "licenseConcluded": "MIT" if index % 4 else "Unknown",
+            }
+            for index in range(20)
+        ],
+        relationships=[
+            {
+                "spdxElementId": "SPDXRef-package",
+                "relationshipType": "DEPENDS_ON",
+                "relatedSpdxElement": f"SPDXRef-missing-{index}",
+            }
+            for index in range(5)
+        ],
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+@pytest.mark.parametrize("chunk_size", [1, 4, 100])
+def test_parallel_matches_check_sbom(spdx_document, workers, chunk_size):
+    spdx_json = json.dumps(spdx_document)
+
+    result = check_sbom(
+        spdx_json,
+        options=ModelOptions(workers=workers, chunk_size=chunk_size),
+    )
+
+    assert result == check_sbom(spdx_json)
+    assert len(result.validation_messages) > 10
+
+
+def test_parallel_keeps_elements(spdx_document):
+    document = _parse_spdx(spdx_document)
+
+    messages = validate_document_parallel(document, workers=2, chunk_size=3)
+
+    assert messages == validate_document_indexed(document)
+    assert any(
+        message.context.full_element is document.packages[0]
+        for message in messages
+    )
+
+
+def test_parallel_unsupported_version(spdx_document):
+    spdx_document["spdxVersion"] = "SPDX-2.1"
+    document = _parse_spdx(spdx_document)
+
+    assert validate_document_parallel(
+        document, workers=2
+    ) == validate_document_indexed(document)
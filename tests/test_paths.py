@@ -0,0 +1,21 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pytest
+
+from sbom_check.paths import normalized_path
+
+
+@pytest.mark.parametrize(
+    "file_name, expected",
+    [
+        ("./src/a.c", "src/a.c"),
+        ("/src//a.c", "src/a.c"),
+        ("src\\a.c", "src/a.c"),
+        ("src/../a.c", "a.c"),
+        ("../a.c", None),
+        ("./..", None),
+    ],
+)
+def test_normalized_path(file_name, expected):
+    assert normalized_path(file_name) == expected
@@ -0,0 +1,185 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import io
+import json
+from dataclasses import replace
+
+import pytest
+from spdx_tools.spdx.validation.validation_message import SpdxElementType
+
+from sbom_check import (
+    ModelOptions,
+    check_sbom,
+    check_sbom_sample,
+    check_sbom_stream,
+)
+from sbom_check.checks import COMPLETENESS_EXCEPTION, COMPLETENESS_RULES
+from sbom_check.compact import check_sbom_compact
+from sbom_check.rules import Rule, RuleRegistry
+from sbom_check.sampling import SamplingOptions
+
+VERSION_RULE = Rule(
+    "package-version",
+    SpdxElementType.PACKAGE,
+    ("version",),
+    bool,
+    "This package has no version.",
+)
+
+
+@pytest.fixture
+def spdx_json(spdx_document_factory):
+    document = spdx_document_factory(
+        license_list_version="3.20",
+        documentDescribes=["SPDXRef-package-0"],
+        packages=[
+            {
+                "SPDXID": f"SPDXRef-package-{index}",
+                "name": "package",
+                "downloadLocation": "NOASSERTION",
+                "filesAnalyzed": False,
+                "supplier": "Organization: Qualcomm",
+                **({"versionInfo": "1.0"} if index % 2 else {}),
+            }
+            for index in range(4)
+        ],
+    )
+    return json.dumps(document)
+
+
+def _completeness_messages(result):
+    return [
+        (message["spdx_id"], message["message"])
+        for message in result.validation_messages
+        if message["message"].startswith(COMPLETENESS_EXCEPTION)
+    ]
+
+
+def test_in_house_rule(spdx_json):
+    rules = COMPLETENESS_RULES.copy()
+    rules.add(VERSION_RULE)
+    default = _completeness_messages(check_sbom(spdx_json))
+    with_rule = _completeness_messages(
+        check_sbom(spdx_json, options=ModelOptions(rules=rules))
+    )
+
+    version_messages = [
+        message for message in with_rule if message not in default
+    ]
+    assert version_messages == [
+        (
+            f"SPDXRef-package-{index}",
+            COMPLETENESS_EXCEPTION + "This package has no version.",
+        )
+        for index in (0, 2)
+    ]
+    # the package's messages stay together, in registration order
+    assert with_rule.index(version_messages[0]) == 1
+    assert rules.stats["package-version"].evaluations == 4
+    assert rules.stats["package-version"].violations == 2
+    assert "package-version" not in COMPLETENESS_RULES.stats
+
+
+def test_fields_read_once():
+    reads = []
+
+    class Element:
+        spdx_id = "SPDXRef-element"
+
+        def __getattr__(self, name):
+            reads.append(name)
+            return ""
+
+    rules = RuleRegistry(
+        [
+            Rule("a", SpdxElementType.FILE, ("name",), bool, "a"),
+            Rule("b", SpdxElementType.FILE, ("name", "comment"), max, "b"),
+            Rule("c", SpdxElementType.PACKAGE, ("supplier",), bool, "c"),
+        ]
+    )
+    messages = rules.check(SpdxElementType.FILE, [Element(), Element()])
+
+    assert [message.validation_message for message in messages] == [
+        COMPLETENESS_EXCEPTION + "a",
+        COMPLETENESS_EXCEPTION + "b",
+    ] * 2
+    assert reads == ["name", "comment"] * 2
+
+
+def test_profile(spdx_json):
+    rules = COMPLETENESS_RULES.copy(profile=True)
+    check_sbom(spdx_json, options=ModelOptions(rules=rules))
+
+    assert rules.stats["package-files-analyzed"].evaluations == 4
+    assert rules.stats["package-files-analyzed"].violations == 4
+    assert rules.stats["package-supplier"].violations == 0
+    # the document has no files, so the file rules are not evaluated
+    assert rules.stats["file-name"].evaluations == 0
+    assert rules.stats["package-supplier"].seconds > 0
+
+
+def test_register_and_remove():
+    rules = RuleRegistry([VERSION_RULE])
+    with pytest.raises(ValueError):
+        rules.add(VERSION_RULE)
+    rules.remove(VERSION_RULE.name)
+    assert not list(rules)
+    with pytest.raises(KeyError):
+        rules.remove(VERSION_RULE.name)
+
+
+def test_digest_follows_definition():
+    def short_version(version):
+        return bool(version) and len(version) < 10
+
+    def long_version(version):
+        return bool(version) and len(version) < 20
+
+    rule = replace(VERSION_RULE, predicate=short_version)
+
+    assert rule.digest == replace(VERSION_RULE, predicate=short_version).digest
+    assert rule.digest != VERSION_RULE.digest
+    assert rule.digest != replace(rule, predicate=long_version).digest
+    assert rule.digest != replace(rule, message="No version.").digest
+
+
+def test_rules_on_every_path(spdx_json):
+    rules = COMPLETENESS_RULES.copy()
+    rules.remove("package-files-analyzed")
+    results = [
+        check_sbom(spdx_json, options=ModelOptions(rules=rules)),
+        check_sbom(
+            spdx_json,
+            completeness_only=True,
+            options=ModelOptions(rules=rules),
+        ),
+        check_sbom_compact(io.StringIO(spdx_json), rules=rules),
+        check_sbom_stream(io.StringIO(spdx_json), rules=rules),
+        check_sbom_sample(spdx_json, SamplingOptions(rate=1.0), rules),
+    ]
+
+    for result in results:
+        assert not [
+            message
+            for message in result.validation_messages
+            if "analyzed" in message["message"]
+        ]
+    assert rules.stats["package-supplier"].evaluations == 4 * len(results)
+    assert not any(
+        stats.evaluations for stats in COMPLETENESS_RULES.stats.values()
+    )
+
+
+def test_model_only_rule_rejected(spdx_json):
+    rules = COMPLETENESS_RULES.copy()
+    rules.add(VERSION_RULE)
+
+    with pytest.raises(ValueError):
+        check_sbom(
+            spdx_json,
+            completeness_only=True,
+            options=ModelOptions(rules=rules),
+        )
+    with pytest.raises(ValueError):
+        check_sbom_compact(io.StringIO(spdx_json), rules=rules)
@@ -0,0 +1,131 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+
+import pytest
+
+from cli.main import CheckOptions, _argument_parser, run
+from sbom_check import check_sbom, check_sbom_sample
+from sbom_check.checks import COMPLETENESS_EXCEPTION
+from sbom_check.sampling import (
+    FILE_SPECIFICATION,
+    SampledCheckResult,
+    SamplingOptions,
+)
+
+
+@pytest.fixture
+def spdx_json(spdx_document_factory):
+    document = spdx_document_factory(
+        documentDescribes=["SPDXRef-package-0"],
+        packages=[
+            {
+                "SPDXID": f"SPDXRef-package-{index}",
+                "name": "package",
+                "downloadLocation": "NOASSERTION",
+                "filesAnalyzed": False,
+                **({"supplier": "Organization: Qualcomm"} if index else {}),
+            }
+            for index in range(10)
+        ],
+        files=[
+            {
+                "fileName": f"./file-{index}",
+                "SPDXID": f"SPDXRef-file-{index}",
+                "checksums": [
+                    {
+                        "algorithm": "SHA1",
+                        "checksumValue": "0" * (40 if index % 4 else 39),
+                    }
+                ],
+                "licenseConcluded": "MIT",
+                "licenseInfoInFiles": ["MIT"],
+                "copyrightText": "NOASSERTION",
+            }
+            for index in range(200)
+        ],
+    )
+    return json.dumps(document)
+
+
+def _completeness(messages):
+    return [
+        message
+        for message in messages
+        if message["message"].startswith(COMPLETENESS_EXCEPTION)
+    ]
+
+
+def test_whole_document(spdx_json):
+    result = check_sbom_sample(spdx_json, SamplingOptions(rate=1.0))
+    estimates = {estimate.rule: estimate for estimate in result.estimates}
+
+    assert _completeness(result.validation_messages) == _completeness(
+        check_sbom(spdx_json).validation_messages
+    )
+    assert estimates[FILE_SPECIFICATION].failures == 50
+    assert estimates[FILE_SPECIFICATION].low == 0.25
+    assert estimates[FILE_SPECIFICATION].high == 0.25
+    assert estimates["package-supplier"].failures == 1
+
+
+def test_sample(spdx_json):
+    sampling = SamplingOptions(rate=0.5, seed=7)
+    result = check_sbom_sample(spdx_json, sampling)
+    estimates = {estimate.rule: estimate for estimate in result.estimates}
+
+    assert check_sbom_sample(spdx_json, sampling) == result
+    assert check_sbom_sample(spdx_json, SamplingOptions(rate=0.5)) != result
+    estimate = estimates[FILE_SPECIFICATION]
+    assert (estimate.population, estimate.sampled) == (200, 100)
+    assert estimate.low < 0.25 < estimate.high
+    assert estimate.low < estimate.rate < estimate.high
+    assert estimates["file-name"].failures == 0
+    assert estimates["file-name"].low == 0.0
+
+
+def test_sample_size():
+    assert SamplingOptions().sample_size(5_000_000) == 9586
+    assert SamplingOptions(margin=0.05).sample_size(100) == 80
+    assert SamplingOptions(rate=0.001).sample_size(10) == 1
+    assert SamplingOptions(rate=1.0).sample_size(10) == 10
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"rate": 0.0},
+        {"rate": -0.5},
+        {"rate": 2.0},
+        {"confidence": 1.0},
+        {"confidence": 0.0},
+        {"margin": 0.0},
+    ],
+)
+def test_invalid_options(options):
+    with pytest.raises(ValueError):
+        SamplingOptions(**options)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--sample-rate", "-0.5"],
+        ["--sample-confidence", "1"],
+        ["--sample-margin", "0"],
+    ],
+)
+def test_invalid_arguments(args):
+    with pytest.raises(SystemExit):
+        _argument_parser().parse_args(["sboms", *args])
+
+
+def test_run_sampled(tmp_path, spdx_json):
+    (tmp_path / "sbom.spdx.json").write_text(spdx_json, encoding="utf-8")
+    sampling = SamplingOptions(rate=0.1)
+
+    results = run(str(tmp_path), CheckOptions(sampling=sampling))
+
+    assert isinstance(results["sbom.spdx.json"], SampledCheckResult)
+    assert results["sbom.spdx.json"] == check_sbom_sample(spdx_json, sampling)
@@ -0,0 +1,130 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import hashlib
+import io
+import json
+
+import pytest
+
+from sbom_check import source_tree, verify_source_tree
+from sbom_check.checks import COMPLETENESS_EXCEPTION
+
+
+def _file(spdx_id, file_name, content, algorithms=("SHA1", "SHA256")):
+    return {
+        "SPDXID": spdx_id,
+        "fileName": file_name,
+        "checksums": [
+            {
+                "algorithm": algorithm,
+                "checksumValue": hashlib.new(
+                    algorithm.replace("-", "_").lower(), content
+                ).hexdigest(),
+            }
+            for algorithm in algorithms
+        ],
+    }
+
+
+@pytest.fixture
+def spdx_json(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.c").write_bytes(b"a")
+    (tmp_path / "src" / "b.c").write_bytes(b"changed")
+    (tmp_path / "empty").write_bytes(b"")
+    (tmp_path / "large").write_bytes(bytes(range(256)) * 10_000)
+    files = [
+        _file("SPDXRef-a", "./src/a.c", b"a", ["SHA1", "SHA3-256", "MD5"]),
+        _file("SPDXRef-b", "./src/b.c", b"b"),
+        _file("SPDXRef-empty", "empty", b""),
+        _file("SPDXRef-large", "/large", bytes(range(256)) * 10_000),
+        _file("SPDXRef-missing", "./src/missing.c", b""),
+        _file("SPDXRef-directory", "./src", b""),
+        _file("SPDXRef-outside", "../outside", b""),
+        # only checksums of algorithms hashlib provides are verified
+        _file("SPDXRef-md4", "./src/missing.c", b"", []),
+    ]
+    files[-1]["checksums"] = [{"algorithm": "MD4", "checksumValue": "0"}]
+    return json.dumps({"SPDXID": "SPDXRef-DOCUMENT", "files": files})
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_verify_source_tree(tmp_path, spdx_json, workers, monkeypatch):
+    monkeypatch.setattr(source_tree, "HASH_CHUNK_SIZE", 4096)
+    monkeypatch.setattr(source_tree, "QUEUED_PER_WORKER", 1)
+
+    messages = verify_source_tree(io.StringIO(spdx_json), tmp_path, workers)
+
+    assert [
+        (
+            message.context.spdx_id,
+            message.validation_message.removeprefix(COMPLETENESS_EXCEPTION),
+        )
+        for message in messages
+    ] == [
+        (
+            "SPDXRef-b",
+            "This file's SHA1 checksum does not match the source tree, where "
+            f"it is {hashlib.sha1(b'changed').hexdigest()}.",
+        ),
+        (
+            "SPDXRef-b",
+            "This file's SHA256 checksum does not match the source tree, "
+            f"where it is {hashlib.sha256(b'changed').hexdigest()}.",
+        ),
+        ("SPDXRef-missing", "This file is not in the source tree."),
+        (
+            "SPDXRef-directory",
+            "This file could not be read from the source tree: Is a "
+            "directory.",
+        ),
+        (
+            "SPDXRef-outside",
+            "This file's name points outside the source tree.",
+        ),
+    ]
+
+
+def test_check_tree_coverage(tmp_path):
+    for path in ["a.c", "src/b.c", "src/c.c", "build/d.o", "src/e.pyc"]:
+        (tmp_path / path).parent.mkdir(exist_ok=True)
+        (tmp_path / path).write_bytes(b"")
+    files = [
+        {"SPDXID": "SPDXRef-a", "fileName": "./a.c"},
+        {"SPDXID": "SPDXRef-b", "fileName": "/src//b.c"},
+        {"SPDXID": "SPDXRef-missing", "fileName": "./src/missing.c"},
+        {"SPDXID": "SPDXRef-d", "fileName": "./build/d.o"},
+        {"SPDXID": "SPDXRef-outside", "fileName": "../outside"},
+    ]
+    spdx_json = json.dumps({"SPDXID": "SPDXRef-DOCUMENT", "files": files})
+
+    coverage = source_tree.check_tree_coverage(
+        io.StringIO(spdx_json), tmp_path, ["build", "*.pyc"], workers=2
+    )
+
+    assert coverage == source_tree.TreeCoverage(
+        tree_files=3,
+        listed_files=3,
+        unlisted=["src/c.c"],
+        extra={"src/missing.c": "SPDXRef-missing"},
+    )
+    assert [
+        message.validation_message.removeprefix(COMPLETENESS_EXCEPTION)
+        for message in coverage.messages()
+    ] == ["The source tree file src/c.c is not listed in the document."]
+
+
+def test_walk_tree(tmp_path):
+    for index in range(20):
+        (tmp_path / str(index) / "sub").mkdir(parents=True)
+        (tmp_path / str(index) / "sub" / "file").write_bytes(b"")
+    (tmp_path / "file").write_bytes(b"")
+
+    assert sorted(source_tree.walk_tree(tmp_path, workers=4)) == sorted(
+        [f"{index}/sub/file" for index in range(20)] + ["file"]
+    )
+    matcher = source_tree.compile_excludes(["1*/sub", "file"])
+    assert sorted(source_tree.walk_tree(tmp_path, matcher)) == sorted(
+        f"{index}/sub/file" for index in range(20) if index != 1 and index < 10
+    )
@@ -0,0 +1,104 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import io
+import json
+
+import pytest
+
+from sbom_check import check_sbom, check_sbom_stream
+from sbom_check.streaming import iter_spdx_json
+
+
+@pytest.fixture
+def spdx_document(spdx_document_factory):
+    return spdx_document_factory(
+        license_list_version="3.20",
+        documentDescribes=["SPDXRef-test.2"],
+        packages=[
+            {
+                "SPDXID": "SPDXRef-test.2",
+                "name": "LA.VENDOR",
+                "downloadLocation": "NOASSERTION",
+                "filesAnalyzed": False,
+                "licenseConcluded": "MIT",
+                "supplier": "NOASSERTION",
+                "hasFiles": ["SPDXRef-fakepath"],
+            }
+        ],
+        files=[
+            {
+                "fileName": "/fakepath",
+                "SPDXID": "SPDXRef-fakepath",
+                "checksums": [
+                    {"algorithm": "SHA1", "checksumValue": "NOASSERTION"}
+                ],
+                "licenseConcluded": "LicenseRef-fake",
+            }
+        ],
+        relationships=[
+            {
+                "spdxElementId": "SPDXRef-test.2",
+                "relationshipType": "DEPENDS_ON",
+                "relatedSpdxElement": "SPDXRef-missing",
+            }
+        ],
+        hasExtractedLicensingInfos=[
+            {"licenseId": "LicenseRef-fake", "extractedText": "fake"}
+        ],
+    )
+
+
+def _messages(result):
+    return sorted(
+        (message["spdx_id"], message["message"])
+        for message in result.validation_messages
+    )
+
+
+def test_iter_spdx_json_yields_elements():
+    stream = io.StringIO(
+        '{"name": "doc", "packages": [{"SPDXID": "a"}, {"SPDXID": "b"}],'
+        ' "files": []}'
+    )
+
+    assert list(iter_spdx_json(stream, chunk_size=4)) == [
+        ("name", "doc"),
+        ("packages", {"SPDXID": "a"}),
+        ("packages", {"SPDXID": "b"}),
+    ]
+
+
+@pytest.mark.parametrize("sort_keys", [False, True])
+def test_stream_matches_check_sbom(spdx_document, sort_keys):
+    spdx_json = json.dumps(spdx_document, sort_keys=sort_keys)
+
+    expected = check_sbom(spdx_json)
+    result = check_sbom_stream(io.BytesIO(spdx_json.encode()), chunk_size=16)
+
+    assert result.errors == expected.errors == []
+    assert _messages(result) == _messages(expected)
+
+
+def test_stream_empty_document():
+    result = check_sbom_stream(io.BytesIO(b"{}"))
+
+    assert result.errors == [
+        "Error while parsing document None: ['CreationInfo does not exist.']"
+    ]
+
+
+def test_stream_parsing_errors(spdx_document):
+    spdx_document["packages"][0]["filesAnalyzed"] = "maybe"
+    spdx_json = json.dumps(spdx_document)
+
+    result = check_sbom_stream(io.StringIO(spdx_json))
+
+    assert result.errors == check_sbom(spdx_json).errors != []
+
+
+def test_stream_rejects_truncated_json(spdx_document):
+    spdx_json = json.dumps(spdx_document)[:-40]
+
+    with pytest.raises(json.JSONDecodeError):
+        check_sbom_stream(io.StringIO(spdx_json))
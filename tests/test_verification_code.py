@@ -0,0 +1,155 @@
+# Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import hashlib
+import io
+import json
+
+import pytest
+
+from sbom_check import check_sbom, check_sbom_sample, check_sbom_stream
+from sbom_check.checks import COMPLETENESS_EXCEPTION
+from sbom_check.compact import check_sbom_compact
+from sbom_check.sampling import SamplingOptions
+
+
+def _sha1(content):
+    return hashlib.sha1(content).hexdigest()
+
+
+def _code(*contents):
+    return _sha1("".join(sorted(map(_sha1, contents))).encode())
+
+
+@pytest.fixture
+def spdx_json(spdx_document_factory):
+    def package(spdx_id, code, has_files, excluded_files=()):
+        return {
+            "SPDXID": spdx_id,
+            "name": spdx_id,
+            "downloadLocation": "NOASSERTION",
+            "packageVerificationCode": {
+                "packageVerificationCodeValue": code,
+                "packageVerificationCodeExcludedFiles": list(excluded_files),
+            },
+            "hasFiles": has_files,
+        }
+
+    def file(spdx_id, file_name, content, algorithm="SHA1"):
+        return {
+            "fileName": file_name,
+            "SPDXID": spdx_id,
+            "checksums": [
+                {
+                    "algorithm": algorithm,
+                    "checksumValue": hashlib.new(
+                        algorithm.lower(), content
+                    ).hexdigest(),
+                }
+            ],
+        }
+
+    document = spdx_document_factory(
+        documentDescribes=["SPDXRef-a"],
+        packages=[
+            package(
+                "SPDXRef-a",
+                _code(b"a", b"b").upper(),
+                ["SPDXRef-a.c", "SPDXRef-b.c", "SPDXRef-spdx"],
+                ["package.spdx"],
+            ),
+            # contains c.c through CONTAINED_BY and another package
+            package("SPDXRef-bad", _code(b"c"), ["SPDXRef-a.c"]),
+            # a file without a SHA1 leaves the code unknown
+            package("SPDXRef-unknown", "0" * 40, ["SPDXRef-sha256"]),
+            # a package whose files are not in the document is not checked
+            package("SPDXRef-elsewhere", "0" * 40, []),
+        ],
+        files=[
+            file("SPDXRef-a.c", "./a.c", b"a"),
+            file("SPDXRef-b.c", "./b.c", b"b"),
+            file("SPDXRef-spdx", "./package.spdx", b"spdx"),
+            file("SPDXRef-c.c", "./c.c", b"c"),
+            file("SPDXRef-sha256", "./d.c", b"d", "SHA256"),
+        ],
+        relationships=[
+            {
+                "spdxElementId": "SPDXRef-c.c",
+                "relationshipType": "CONTAINED_BY",
+                "relatedSpdxElement": "SPDXRef-bad",
+            },
+            {
+                "spdxElementId": "SPDXRef-bad",
+                "relationshipType": "CONTAINS",
+                "relatedSpdxElement": "SPDXRef-unknown",
+            },
+        ],
+    )
+    return json.dumps(document)
+
+
+def _completeness(messages):
+    return [
+        message
+        for message in messages
+        if message["message"].startswith(COMPLETENESS_EXCEPTION)
+    ]
+
+
+def test_verification_codes(spdx_json):
+    messages = [
+        (message["spdx_id"], message["message"])
+        for message in check_sbom(spdx_json).validation_messages
+        if "verification code" in message["message"]
+    ]
+
+    assert messages == [
+        (
+            "SPDXRef-bad",
+            COMPLETENESS_EXCEPTION + "This package's verification code does "
+            "not match the SHA1 checksums of its files, from which it is "
+            f"{_code(b'a', b'c')}.",
+        )
+    ]
+
+
+def test_verification_codes_without_model(spdx_json):
+    expected = _completeness(check_sbom(spdx_json).validation_messages)
+
+    assert (
+        check_sbom(spdx_json, completeness_only=True).validation_messages
+        == expected
+    )
+    assert (
+        _completeness(
+            check_sbom_compact(io.StringIO(spdx_json)).validation_messages
+        )
+        == expected
+    )
+    assert (
+        _completeness(
+            check_sbom_stream(io.StringIO(spdx_json)).validation_messages
+        )
+        == expected
+    )
+    assert (
+        _completeness(
+            check_sbom_sample(
+                spdx_json, SamplingOptions(rate=1.0)
+            ).validation_messages
+        )
+        == expected
+    )
+
+
+def test_package_without_files(spdx_json):
+    document = json.loads(spdx_json)
+    del document["files"], document["relationships"]
+    for package in document["packages"]:
+        del package["hasFiles"]
+
+    assert not [
+        message
+        for message in check_sbom(json.dumps(document)).validation_messages
+        if "verification code" in message["message"]
+    ]